@@ -0,0 +1,3 @@
+"""
+offline benchmarks of notionizer. See 'benchmarks/run.py'.
+"""
@@ -0,0 +1,112 @@
+"""
+synthetic records for 'ReplayTransport'. Shapes follow the responses of the Notion API.
+"""
+
+from typing import Any
+from typing import Dict
+from typing import List
+
+DATABASE_ID = 'benchdatabase'
+USER = {'object': 'user', 'id': 'bench-user'}
+TIME = '2022-01-01T00:00:00.000Z'
+
+
+def rich_text(content: str) -> List[Dict[str, Any]]:
+    return [{'type': 'text', 'plain_text': content, 'href': None,
+             'annotations': {'bold': False, 'italic': False, 'strikethrough': False, 'underline': False,
+                             'code': False, 'color': 'default'},
+             'text': {'content': content, 'link': None}}]
+
+
+def database_object(database_id: str = DATABASE_ID) -> Dict[str, Any]:
+    return {
+        'object': 'database', 'id': database_id, 'created_time': TIME, 'last_edited_time': TIME,
+        'created_by': dict(USER), 'last_edited_by': dict(USER), 'title': rich_text('Benchmark'),
+        'icon': None, 'cover': None, 'parent': {'type': 'page_id', 'page_id': 'bench-parent'},
+        'url': 'https://www.notion.so/' + database_id, 'archived': False,
+        'properties': {
+            'Name': {'id': 'title', 'name': 'Name', 'type': 'title', 'title': {}},
+            'Note': {'id': 'n0te', 'name': 'Note', 'type': 'rich_text', 'rich_text': {}},
+            'Count': {'id': 'c0nt', 'name': 'Count', 'type': 'number', 'number': {'format': 'number'}},
+            'Done': {'id': 'd0ne', 'name': 'Done', 'type': 'checkbox', 'checkbox': {}},
+            'Status': {'id': 'st4t', 'name': 'Status', 'type': 'select', 'select': {'options': []}},
+            'Tags': {'id': 't4gs', 'name': 'Tags', 'type': 'multi_select', 'multi_select': {'options': []}},
+            'Due': {'id': 'du3d', 'name': 'Due', 'type': 'date', 'date': {}},
+        },
+    }
+
+
+def page_object(index: int, database_id: str = DATABASE_ID) -> Dict[str, Any]:
+    status = ('Todo', 'Doing', 'Done')[index % 3]
+    return {
+        'object': 'page', 'id': f'bench-page-{index}', 'created_time': TIME, 'last_edited_time': TIME,
+        'created_by': dict(USER), 'last_edited_by': dict(USER), 'cover': None, 'icon': None,
+        'parent': {'type': 'database_id', 'database_id': database_id}, 'archived': False,
+        'url': f'https://www.notion.so/bench-page-{index}',
+        'properties': {
+            'Name': {'id': 'title', 'type': 'title', 'title': rich_text(f'row {index}')},
+            'Note': {'id': 'n0te', 'type': 'rich_text', 'rich_text': rich_text('note ' * 8)},
+            'Count': {'id': 'c0nt', 'type': 'number', 'number': index},
+            'Done': {'id': 'd0ne', 'type': 'checkbox', 'checkbox': index % 2 == 0},
+            'Status': {'id': 'st4t', 'type': 'select', 'select': {'id': status, 'name': status, 'color': 'red'}},
+            'Tags': {'id': 't4gs', 'type': 'multi_select',
+                     'multi_select': [{'id': 'a', 'name': 'a', 'color': 'red'},
+                                      {'id': 'b', 'name': 'b', 'color': 'blue'}]},
+            'Due': {'id': 'du3d', 'type': 'date', 'date': {'start': '2022-01-01', 'end': None, 'time_zone': None}},
+        },
+    }
+
+
+def block_object(block_id: str, has_children: bool) -> Dict[str, Any]:
+    return {
+        'object': 'block', 'id': block_id, 'created_time': TIME, 'last_edited_time': TIME,
+        'created_by': dict(USER), 'last_edited_by': dict(USER), 'has_children': has_children,
+        'archived': False, 'type': 'paragraph',
+        'paragraph': {'rich_text': rich_text('block ' + block_id), 'color': 'default'},
+    }
+
+
+def query_records(rows: int, page_size: int = 100, database_id: str = DATABASE_ID) -> List[Dict[str, Any]]:
+    """
+    records of 'GET database' and paginated 'POST query'. Replay them with 'match_payload=False'.
+    """
+    records = [{'method': 'GET', 'url': f'v1/databases/{database_id}', 'payload': None, 'status_code': 200,
+                'body': database_object(database_id)}]
+    for start in range(0, rows, page_size):
+        end = min(rows, start + page_size)
+        next_cursor = f'cursor-{end}' if end < rows else None
+        body = {'object': 'list', 'results': [page_object(i, database_id) for i in range(start, end)],
+                'next_cursor': next_cursor, 'has_more': next_cursor is not None}
+        records.append({'method': 'POST', 'url': f'v1/databases/{database_id}/query', 'payload': None,
+                        'status_code': 200, 'body': body})
+    return records
+
+
+def create_page_records(database_id: str = DATABASE_ID) -> List[Dict[str, Any]]:
+    """
+    records of 'GET database' and 'POST pages'. Replay them with 'match_payload=False'.
+    """
+    return [
+        {'method': 'GET', 'url': f'v1/databases/{database_id}', 'payload': None, 'status_code': 200,
+         'body': database_object(database_id)},
+        {'method': 'POST', 'url': 'v1/pages/', 'payload': None, 'status_code': 200,
+         'body': page_object(0, database_id)},
+    ]
+
+
+def block_tree_records(depth: int, breadth: int, root_id: str = 'bench-root') -> List[Dict[str, Any]]:
+    """
+    records of 'GET block children' for a tree of 'breadth' children on each level under 'root_id'.
+    """
+    records = list()
+    parents = [root_id]
+    for level in range(depth):
+        children_of_level = list()
+        for parent_id in parents:
+            children = [block_object(f'{parent_id}.{i}', level + 1 < depth) for i in range(breadth)]
+            body = {'object': 'list', 'results': children, 'next_cursor': None, 'has_more': False}
+            records.append({'method': 'GET', 'url': f'v1/blocks/{parent_id}/children', 'payload': None,
+                            'status_code': 200, 'body': body})
+            children_of_level.extend(child['id'] for child in children)
+        parents = children_of_level
+    return records
@@ -0,0 +1,194 @@
+"""
+Offline benchmarks
+
+Every request is served by 'ReplayTransport' from synthetic records, so no token or network is needed.
+'--latency' adds a simulated round-trip to each response. 'server_query' scans a database of the local fake
+server over HTTP instead.
+
+[Usage]
+
+python -m benchmarks.run
+python -m benchmarks.run --rows 5000 --latency 0.05 query_scan
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import TextIO
+
+from notionizer import Notion
+from notionizer import settings
+from notionizer.fake_server import FakeNotionServer
+from notionizer.fake_server import FakeNotionStore
+from notionizer.http_request import RequestScheduler
+from notionizer.object_block import Block
+from notionizer.object_page import Page
+from notionizer.transport import ReplayTransport
+
+from benchmarks import records
+
+
+class Result:
+    """
+    latencies(seconds) of each operation in a benchmark.
+    """
+
+    def __init__(self, name: str, latencies: List[float], elapsed: float):
+        self.name = name
+        self.latencies = latencies
+        self.elapsed = elapsed
+
+    def percentile(self, p: float) -> float:
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def __str__(self) -> str:
+        ops = len(self.latencies)
+        throughput = ops / self.elapsed if self.elapsed else float('inf')
+        return (f"{self.name:<14} {ops:>8} ops {throughput:>12.1f} ops/s  "
+                f"p50 {self.percentile(50) * 1000:8.3f}ms  p90 {self.percentile(90) * 1000:8.3f}ms  "
+                f"p99 {self.percentile(99) * 1000:8.3f}ms  mean {statistics.mean(self.latencies) * 1000:8.3f}ms")
+
+
+def new_notion(records_: Iterable[Dict[str, Any]], latency: float, match_payload: bool = False) -> Notion:
+    # the rate limiter is not measured.
+    scheduler = RequestScheduler(rate=1e9, burst=1e9)
+    return Notion('', scheduler=scheduler,
+                  transport=ReplayTransport(records_, match_payload=match_payload, latency=latency))
+
+
+def measure(name: str, operations: Iterable[Any]) -> Result:
+    """
+    measure time between items of 'operations'.
+    """
+    latencies = list()
+    started = last = time.perf_counter()
+    for _ in operations:
+        now = time.perf_counter()
+        latencies.append(now - last)
+        last = now
+    return Result(name, latencies, time.perf_counter() - started)
+
+
+def bench_query_scan(args: argparse.Namespace) -> List[Result]:
+    query_records = records.query_records(args.rows)
+    results = list()
+    for name, raw in (('query_scan', False), ('query_scan_raw', True)):
+        with new_notion(query_records, args.latency) as notion:
+            db = notion.get_database(records.DATABASE_ID)
+            results.append(measure(name, db.query('Name', raw=raw, prefetch=args.prefetch)))
+    return results
+
+
+def bench_page_decode(args: argparse.Namespace) -> List[Result]:
+    query_records = records.query_records(args.rows)
+    with new_notion(query_records, 0) as notion:
+        db = notion.get_database(records.DATABASE_ID)
+        pages = list(db.query('Name', raw=True))
+        request = notion._request
+
+        def decode_pages() -> Iterable[Any]:
+            for data in pages:
+                yield Page(request, data).get_properties()
+
+        decoder = db.compile_decoder()
+        return [measure('page_decode', decode_pages()), measure('row_decoder', (decoder(p) for p in pages))]
+
+
+def bench_create_page(args: argparse.Namespace) -> List[Result]:
+    results = list()
+    with new_notion(records.create_page_records(), args.latency) as notion:
+        db = notion.get_database(records.DATABASE_ID)
+
+        def create_pages() -> Iterable[Any]:
+            for i in range(args.batch):
+                yield db.create_page({'Name': f'row {i}', 'Count': i, 'Done': bool(i % 2)})
+
+        results.append(measure('create_page', create_pages()))
+
+        rows = [{'Name': f'row {i}', 'Count': i, 'Done': bool(i % 2)} for i in range(args.batch)]
+        results.append(measure('create_pages', db.create_pages(rows, concurrency=args.concurrency)))
+    return results
+
+
+def bench_block_walk(args: argparse.Namespace) -> List[Result]:
+    root_id = 'bench-root'
+    with new_notion(records.block_tree_records(args.depth, args.breadth, root_id), args.latency) as notion:
+        request = notion._request
+
+        def walk(block_id: str) -> Iterable[Block]:
+            _, result = request.get(f'v1/blocks/{block_id}/children')
+            for data in result['results']:
+                block = Block(request, data)
+                yield block
+                if data['has_children']:
+                    yield from walk(data['id'])
+
+        return [measure('block_walk', walk(root_id))]
+
+
+def bench_server_query(args: argparse.Namespace) -> List[Result]:
+    store = FakeNotionStore(rows=args.rows, block_depth=0)
+    with FakeNotionServer(store, latency=args.latency) as server:
+        base_url = settings.BASE_URL
+        settings.BASE_URL = server.base_url
+        try:
+            with Notion('benchmark', scheduler=RequestScheduler(rate=1e9, burst=1e9)) as notion:
+                db = notion.get_database(store.database_ids[0])
+                return [measure('server_query', db.query('Name', prefetch=args.prefetch))]
+        finally:
+            settings.BASE_URL = base_url
+
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], List[Result]]] = {
+    'query_scan': bench_query_scan,
+    'page_decode': bench_page_decode,
+    'create_page': bench_create_page,
+    'block_walk': bench_block_walk,
+    'server_query': bench_server_query,
+}
+
+
+def main(argv: List[str] = None, output: Optional[TextIO] = None) -> List[Result]:
+    """
+    run benchmarks and write a line of each result.
+
+    :param argv: command line arguments (default: sys.argv)
+    :param output: text stream of results (default: sys.stdout)
+    :return: List[Result]
+    """
+    output = output if output is not None else sys.stdout
+    parser = argparse.ArgumentParser(description='offline benchmarks of notionizer')
+    parser.add_argument('benchmarks', nargs='*', metavar='benchmark',
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument('--rows', type=int, default=2000, help='rows of the queried database')
+    parser.add_argument('--prefetch', type=int, default=0, help='prefetch of query')
+    parser.add_argument('--batch', type=int, default=200, help='number of created pages')
+    parser.add_argument('--concurrency', type=int, default=4, help='concurrency of create_pages')
+    parser.add_argument('--depth', type=int, default=3, help='depth of the block tree')
+    parser.add_argument('--breadth', type=int, default=8, help='children of each block')
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated seconds of each response')
+    args = parser.parse_args(argv)
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: '{name}'")
+
+    results = list()
+    for name in args.benchmarks or BENCHMARKS:
+        for result in BENCHMARKS[name](args):
+            print(result, file=output)
+            results.append(result)
+    return results
+
+
+if __name__ == '__main__':
+    main()
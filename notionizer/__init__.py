@@ -2,12 +2,19 @@
 # __all__ = ["query", "notion", "objects", "exception"]
 
 from .notion import Notion
+from .notion_async import AsyncNotion
 
 from .object_user import UserProperty, User
 from .objects import Database
 from .object_page import Page
 from .objects import Property
 from .enum import OptionColor, NumberFormat, RollupFunction
+from .instance_cache import WeakInstanceCache, LRUInstanceCache
+from .transport import SessionTransport, RecordingTransport, ReplayTransport
+from .mirror import DatabaseMirror
+from .evaluator import FilterEvaluator
+from .markdown import MarkdownExporter, MarkdownParser
+from .object_basic import set_instance_cache, get_instance_cache_stats
 
 from .exception import NotionApiException
 from .exception import NotionApiPropertyException
@@ -0,0 +1,364 @@
+"""
+Block Diff
+
+'BlockDiff' compares the block tree of a page with a desired tree of block objects (ex: 'markdown_to_blocks')
+and emits the least 'append', 'update' and 'delete' operations, so re-publishing a document changes only the
+blocks which differ.
+
+Each block is hashed by its type and normalized content. Ids, timestamps, default values ('color': 'default')
+and the way rich text is split are ignored. The hash of a subtree includes the hashes of its children, so
+unchanged subtrees are skipped without comparing their children.
+
+Siblings are aligned by subtree hash. Blocks in between are paired by type and updated in place; the others are
+deleted or inserted with 'after'. The api could not insert before the first child, so when blocks are inserted
+at the start, the first kept block is created again after them.
+
+[Usage]
+
+operations = page.update_blocks(markdown_to_blocks(text))
+
+diff = BlockDiff(notion._request)
+operations = diff.diff(page.id, blocks)
+diff.apply(operations)
+"""
+
+import concurrent.futures
+import difflib
+import hashlib
+import json
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from notionizer import settings
+from notionizer.block_writer import BlockAppender
+from notionizer.block_writer import get_block_type
+from notionizer.block_writer import get_nested_children
+from notionizer.http_request import HttpRequest
+from notionizer.traversal import BlockWalker
+from notionizer.traversal import CHILD_PAGE_TYPES
+
+_log = __import__('logging').getLogger(__name__)
+
+# blocks of which contents could be changed by 'PATCH v1/blocks/{id}'. Others are deleted and created again.
+UPDATABLE_TYPES = (
+    'paragraph', 'heading_1', 'heading_2', 'heading_3', 'bulleted_list_item', 'numbered_list_item', 'to_do',
+    'toggle', 'quote', 'callout', 'code', 'equation', 'divider', 'bookmark', 'embed', 'image', 'video', 'pdf',
+    'file', 'audio', 'table', 'table_row',
+)
+
+# values of block which are same as not given
+_default_values = (None, False, 'default', [], {})
+
+
+def normalize_rich_text(array: List[Dict[str, Any]]) -> List[List[Any]]:
+    """
+    rich text array to comparable '[type, content, annotations, link]' segments. Adjacent segments with same
+    format are merged, so that the split of text does not matter.
+
+    :param array: rich text array of request body or returned block
+    :return: [[type, content, [annotation, ...], link], ...]
+    """
+    segments: List[List[Any]] = list()
+    for e in array:
+        element_type = e.get('type') or ('text' if 'text' in e else '')
+        if element_type == 'text':
+            content = e['text'].get('content', '')
+            link = (e['text'].get('link') or {}).get('url')
+        elif element_type == 'equation':
+            content = e['equation'].get('expression', '')
+            link = None
+        else:
+            content = e.get('plain_text', '')
+            link = e.get('href')
+        annotations = sorted(k if v is True else f'{k}={v}' for k, v in (e.get('annotations') or {}).items()
+                             if v not in _default_values)
+        if segments and segments[-1][0] == element_type == 'text' and segments[-1][2:] == [annotations, link]:
+            segments[-1][1] += content
+        elif content:
+            segments.append([element_type, content, annotations, link])
+    return segments
+
+
+def normalize_block(block: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    comparable content of block without id, timestamps, 'children' and default values.
+
+    :param block: block object of request body or returned block
+    :return: {'type': ..., type: {...}}
+    """
+    block_type = get_block_type(block)
+    normalized: Dict[str, Any] = dict()
+    for key, value in (block.get(block_type) or {}).items():
+        if key == 'children':
+            continue
+        if key in ('rich_text', 'caption'):
+            value = normalize_rich_text(value)
+        elif key == 'cells':
+            value = [normalize_rich_text(cell) for cell in value]
+        elif key == 'file' and isinstance(value, dict):
+            # url of uploaded file is signed and expires.
+            value = {}
+        if value in _default_values:
+            continue
+        normalized[key] = value
+    return {'type': block_type, block_type: normalized}
+
+
+def get_content_hash(block: Dict[str, Any]) -> str:
+    """
+    hash of block type and normalized content.
+
+    :param block: block object
+    :return: hex digest
+    """
+    data = json.dumps(normalize_block(block), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class BlockNode:
+    """
+    block in a tree with hashes of content and subtree.
+    """
+    __slots__ = ('id', 'type', 'block', 'children', 'content_hash', 'tree_hash')
+
+    def __init__(self, block: Dict[str, Any], children: List['BlockNode']):
+        """
+
+        :param block: returned block (with 'id') or block object of request body
+        :param children: child nodes
+        """
+        self.id: Optional[str] = block.get('id')
+        self.type: str = get_block_type(block)
+        self.block = block
+        self.children = children
+        self.content_hash = get_content_hash(block)
+        tree = self.content_hash + ''.join(child.tree_hash for child in children)
+        self.tree_hash = hashlib.sha1(tree.encode('ascii')).hexdigest() if children else self.content_hash
+
+    def __repr__(self) -> str:
+        return f"<BlockNode '{self.type}' at '{self.id}'>"
+
+
+def build_tree(blocks: List[Dict[str, Any]]) -> List[BlockNode]:
+    """
+    nodes of block objects of request body. Nested blocks are in 'children' of the type object.
+
+    :param blocks: block objects
+    :return: List[BlockNode]
+    """
+    return [BlockNode(block, build_tree(get_nested_children(block))) for block in blocks]
+
+
+class BlockOperation:
+    """
+    an operation of 'BlockDiff'.
+        append: 'blocks' are appended to children of 'block_id' after 'after'. (None: the end)
+        update: 'payload' is sent to block of 'block_id'
+        delete: block of 'block_id' is deleted(archived)
+    """
+    APPEND = 'append'
+    UPDATE = 'update'
+    DELETE = 'delete'
+
+    def __init__(self, kind: str, block_id: str, blocks: Optional[List[Dict[str, Any]]] = None,
+                 after: Optional[str] = None, payload: Optional[Dict[str, Any]] = None):
+        self.kind = kind
+        self.block_id = block_id
+        self.blocks = blocks
+        self.after = after
+        self.payload = payload
+
+    def __repr__(self) -> str:
+        if self.kind == self.APPEND:
+            return f"<BlockOperation append {len(self.blocks or [])} blocks to '{self.block_id}' " \
+                   f"after '{self.after}'>"
+        return f"<BlockOperation {self.kind} '{self.block_id}'>"
+
+
+class _Siblings:
+    """
+    state of aligning children of a block.
+    """
+    __slots__ = ('parent_id', 'after', 'pending')
+
+    def __init__(self, parent_id: str):
+        self.parent_id = parent_id
+        # the last kept block. blocks in 'pending' are inserted after it.
+        self.after: Optional[str] = None
+        self.pending: List[Dict[str, Any]] = list()
+
+
+class BlockDiff:
+    """
+    diff of block trees by content hash. See module document.
+    """
+
+    def __init__(self, request: HttpRequest, concurrency: int = settings.BLOCK_CONCURRENCY):
+        """
+
+        :param request: HttpRequest
+        :param concurrency: maximum number of concurrent requests
+        """
+        assert 0 < concurrency, "'concurrency' should be positive"
+        self._request = request
+        self.concurrency = concurrency
+        # number of requests sent by 'apply'
+        self.requests = 0
+
+    def fetch_tree(self, block_id: str) -> List[BlockNode]:
+        """
+        fetch the block tree under the block or page. Child pages are not walked into.
+
+        :param block_id: id of block or page
+        :return: List[BlockNode]
+        """
+        walker = BlockWalker(self._request, concurrency=self.concurrency)
+        # (block, children) of the last block at each depth. nodes are built after the children are known.
+        roots: List[Any] = list()
+        stack: List[List[Any]] = [roots]
+        for depth, block in walker.walk(block_id):
+            del stack[depth:]
+            entry = (block, list())
+            stack[-1].append(entry)
+            stack.append(entry[1])
+
+        def to_nodes(entries: List[Any]) -> List[BlockNode]:
+            return [BlockNode(block, to_nodes(children)) for block, children in entries]
+
+        return to_nodes(roots)
+
+    def compare(self, block_id: str, current: List[BlockNode], desired: List[BlockNode]) -> List[BlockOperation]:
+        """
+        operations which change children of the block from 'current' to 'desired'.
+        'child_page' and 'child_database' blocks are kept as they are.
+
+        :param block_id: id of block or page
+        :param current: fetched nodes. (see 'fetch_tree')
+        :param desired: nodes of block objects. (see 'build_tree')
+        :return: List[BlockOperation]
+        """
+        operations: List[BlockOperation] = list()
+        self._compare(block_id, current, desired, operations)
+        return operations
+
+    def diff(self, block_id: str, blocks: List[Dict[str, Any]]) -> List[BlockOperation]:
+        """
+        fetch the block tree and compare it with block objects.
+
+        :param block_id: id of block or page
+        :param blocks: block objects. Nested blocks are in 'children' of the type object.
+        :return: List[BlockOperation]
+        """
+        return self.compare(block_id, self.fetch_tree(block_id), build_tree(blocks))
+
+    def _compare(self, parent_id: str, current: List[BlockNode], desired: List[BlockNode],
+                 operations: List[BlockOperation]) -> None:
+        current = [node for node in current if node.type not in CHILD_PAGE_TYPES]
+        siblings = _Siblings(parent_id)
+        matcher = difflib.SequenceMatcher(None, [node.tree_hash for node in current],
+                                          [node.tree_hash for node in desired], autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                for old, new in zip(current[i1:i2], desired[j1:j2]):
+                    self._keep(siblings, old, new, operations)
+                continue
+
+            # blocks between unchanged subtrees are paired by type.
+            olds, news = current[i1:i2], desired[j1:j2]
+            types = difflib.SequenceMatcher(None, [node.type for node in olds], [node.type for node in news],
+                                            autojunk=False)
+            for kind, a1, a2, b1, b2 in types.get_opcodes():
+                if kind != 'equal':
+                    operations.extend(BlockOperation(BlockOperation.DELETE, str(old.id)) for old in olds[a1:a2])
+                    siblings.pending.extend(new.block for new in news[b1:b2])
+                    continue
+                for old, new in zip(olds[a1:a2], news[b1:b2]):
+                    if not self._updatable(old, new):
+                        operations.append(BlockOperation(BlockOperation.DELETE, str(old.id)))
+                        siblings.pending.append(new.block)
+                    elif self._keep(siblings, old, new, operations):
+                        if old.content_hash != new.content_hash:
+                            block_type = new.type
+                            value = {k: v for k, v in new.block[block_type].items() if k != 'children'}
+                            operations.append(BlockOperation(BlockOperation.UPDATE, str(old.id),
+                                                             payload={block_type: value}))
+                        self._compare(str(old.id), old.children, new.children, operations)
+        self._flush(siblings, operations)
+
+    @staticmethod
+    def _updatable(old: BlockNode, new: BlockNode) -> bool:
+        if old.type not in UPDATABLE_TYPES:
+            return False
+        if old.type == 'table':
+            # width of table could not be changed.
+            return bool(old.block['table'].get('table_width') == new.block['table'].get('table_width'))
+        return True
+
+    def _keep(self, siblings: _Siblings, old: BlockNode, new: BlockNode, operations: List[BlockOperation]) -> bool:
+        """
+        keep the old block in place of the new one.
+
+        :return: False if the block is created again. (blocks are inserted before the first child)
+        """
+        if siblings.pending and siblings.after is None:
+            operations.append(BlockOperation(BlockOperation.DELETE, str(old.id)))
+            siblings.pending.append(new.block)
+            siblings.after = old.id
+            return False
+        self._flush(siblings, operations)
+        siblings.after = old.id
+        return True
+
+    @staticmethod
+    def _flush(siblings: _Siblings, operations: List[BlockOperation]) -> None:
+        if siblings.pending:
+            operations.append(BlockOperation(BlockOperation.APPEND, siblings.parent_id, blocks=siblings.pending,
+                                             after=siblings.after))
+            siblings.pending = list()
+
+    def _run(self, operation: BlockOperation) -> int:
+        """
+        run an operation on a worker thread.
+
+        :return: number of requests
+        """
+        if operation.kind == BlockOperation.APPEND:
+            appender = BlockAppender(self._request, concurrency=self.concurrency)
+            appender.append(operation.block_id, operation.blocks or [], after=operation.after)
+            return appender.requests
+        if operation.kind == BlockOperation.UPDATE:
+            self._request.patch(f'v1/blocks/{operation.block_id}', operation.payload or {})
+        else:
+            self._request.delete(f'v1/blocks/{operation.block_id}')
+        return 1
+
+    def apply(self, operations: List[BlockOperation]) -> None:
+        """
+        run operations concurrently. Blocks are deleted after blocks are appended and updated, because appended
+        blocks could follow a deleted block.
+
+        :param operations: returned from 'diff' or 'compare'
+        """
+        deletes = [operation for operation in operations if operation.kind == BlockOperation.DELETE]
+        others = [operation for operation in operations if operation.kind != BlockOperation.DELETE]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency,
+                                                   thread_name_prefix='notionizer-diff') as executor:
+            for phase in (others, deletes):
+                for requests in executor.map(self._run, phase):
+                    self.requests += requests
+        _log.debug(f"{len(operations)} block operations are applied with {self.requests} requests")
+
+    def update(self, block_id: str, blocks: List[Dict[str, Any]]) -> List[BlockOperation]:
+        """
+        change children of the block or page to block objects with the least operations.
+
+        :param block_id: id of block or page
+        :param blocks: block objects. Nested blocks are in 'children' of the type object.
+        :return: applied operations
+        """
+        operations = self.diff(block_id, blocks)
+        self.apply(operations)
+        return operations
@@ -0,0 +1,218 @@
+"""
+Block Writer
+
+'BlockAppender' appends any number of blocks, nested ones included, to a block or page through
+'PATCH v1/blocks/{id}/children', which accepts 100 children per request, 1000 blocks in total and two levels
+of nested 'children'.
+
+Blocks are packed into as few requests as possible: nested children are sent inline with their parent when the
+subtree fits the limits. Otherwise the parent is created with the leading children which fit and the rest are
+appended to the returned block id. Chunks of one parent are sent in order, while appends to different parents run
+concurrently, so the chunks of the top level and the nested children are pipelined.
+
+[Usage]
+
+page.append_blocks([
+    {'type': 'heading_1', 'heading_1': {'rich_text': [{'type': 'text', 'text': {'content': 'Title'}}]}},
+    {'type': 'bulleted_list_item', 'bulleted_list_item': {
+        'rich_text': [{'type': 'text', 'text': {'content': 'item'}}],
+        'children': [...]}},
+    ...
+])
+"""
+
+import collections
+import concurrent.futures
+
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from notionizer import settings
+from notionizer.http_request import HttpRequest
+
+_log = __import__('logging').getLogger(__name__)
+
+# (parent id, remaining children, list collecting created blocks or None, id of block to append after or None)
+T_AppendJob = Tuple[str, Deque[Dict[str, Any]], Optional[List[Dict[str, Any]]], Optional[str]]
+
+
+def get_block_type(block: Dict[str, Any]) -> str:
+    """
+    type of block object. 'type' key could be omitted in request body.
+
+    :param block: block object
+    :return: ex: 'paragraph'
+    """
+    return block.get('type') or next(k for k in block if k != 'object')
+
+
+def get_nested_children(block: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    nested 'children' of block object in request body.
+
+    :param block: ex: {'type': 'toggle', 'toggle': {'rich_text': [...], 'children': [...]}}
+    :return: List[block object]
+    """
+    value = block.get(get_block_type(block))
+    return (value.get('children') if isinstance(value, dict) else None) or []
+
+
+def replace_nested_children(block: Dict[str, Any], children: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    copy of block object with other nested 'children'. The argument is not changed.
+
+    :param block: block object
+    :param children: block objects. If empty, 'children' is removed.
+    :return: block object
+    """
+    block_type = get_block_type(block)
+    value = {k: v for k, v in block[block_type].items() if k != 'children'}
+    if children:
+        value['children'] = children
+    return dict(block, **{block_type: value})
+
+
+class BlockAppender:
+    """
+    append blocks with the least requests. See module document.
+    """
+
+    def __init__(self, request: HttpRequest, concurrency: int = settings.BLOCK_CONCURRENCY,
+                 chunk_size: int = settings.BLOCK_APPEND_SIZE, max_blocks: int = settings.BLOCK_APPEND_MAX_BLOCKS,
+                 nesting: int = settings.BLOCK_APPEND_NESTING):
+        """
+
+        :param request: HttpRequest
+        :param concurrency: maximum number of concurrent append requests
+        :param chunk_size: maximum children of a request and of each nested 'children'
+        :param max_blocks: maximum blocks of a request including nested children
+        :param nesting: levels of nested 'children' allowed in a request
+        """
+        assert 0 < concurrency, "'concurrency' should be positive"
+        assert 0 < chunk_size <= max_blocks, "'chunk_size' should be positive and not over 'max_blocks'"
+        self._request = request
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.max_blocks = max_blocks
+        self.nesting = nesting
+        # number of sent requests
+        self.requests = 0
+
+    def _inline_size(self, block: Dict[str, Any], levels: int) -> Optional[int]:
+        """
+        number of blocks of the subtree if it could be sent inline with 'levels' of nesting, else None.
+        """
+        children = get_nested_children(block)
+        if not children:
+            return 1
+        if levels <= 0 or self.chunk_size < len(children):
+            return None
+        size = 1
+        for child in children:
+            child_size = self._inline_size(child, levels - 1)
+            if child_size is None:
+                return None
+            size += child_size
+        return size
+
+    def _take_chunk(self, children: Deque[Dict[str, Any]]
+                    ) -> Tuple[List[Dict[str, Any]], List[Tuple[int, List[Dict[str, Any]]]]]:
+        """
+        take children of the next request from the head of 'children'.
+
+        :return: (request children, [(index in request children, deferred nested children), ...])
+        """
+        chunk: List[Dict[str, Any]] = list()
+        deferred: List[Tuple[int, List[Dict[str, Any]]]] = list()
+        total = 0
+        while children and len(chunk) < self.chunk_size:
+            block = children[0]
+            size = self._inline_size(block, self.nesting)
+            nested = None
+            if size is None or self.max_blocks < size:
+                # leading children which fit are kept inline. (ex: rows of 'table' which requires children)
+                children_of_block = get_nested_children(block)
+                kept: List[Dict[str, Any]] = list()
+                size = 1
+                for child in children_of_block[:self.chunk_size]:
+                    child_size = self._inline_size(child, self.nesting - 1)
+                    if child_size is None or self.max_blocks < size + child_size:
+                        break
+                    kept.append(child)
+                    size += child_size
+                nested = children_of_block[len(kept):]
+                block = replace_nested_children(block, kept)
+            if chunk and self.max_blocks < total + size:
+                break
+            children.popleft()
+            if nested:
+                deferred.append((len(chunk), nested))
+            chunk.append(block)
+            total += size
+        return chunk, deferred
+
+    def _send(self, parent_id: str, children: Deque[Dict[str, Any]], collect: Optional[List[Dict[str, Any]]],
+              after: Optional[str]) -> List[T_AppendJob]:
+        """
+        send a chunk on a worker thread.
+
+        :return: following jobs. (the rest of 'children' and deferred nested children)
+        """
+        chunk, deferred = self._take_chunk(children)
+        payload: Dict[str, Any] = {'children': chunk}
+        if after:
+            payload['after'] = after
+        _, result = self._request.patch(f'v1/blocks/{parent_id}/children', payload)
+        created: List[Dict[str, Any]] = result['results']
+        assert len(created) == len(chunk), f"{len(chunk)} blocks are sent but {len(created)} blocks are returned."
+        if collect is not None:
+            collect.extend(created)
+
+        jobs: List[T_AppendJob] = list()
+        if children:
+            # the next chunk follows the last block of this chunk.
+            jobs.append((parent_id, children, collect, created[-1]['id'] if after else None))
+        for index, nested in deferred:
+            jobs.append((created[index]['id'], collections.deque(nested), None, None))
+        return jobs
+
+    def append(self, block_id: str, blocks: Iterable[Dict[str, Any]], after: Optional[str] = None
+               ) -> List[Dict[str, Any]]:
+        """
+        append blocks to the end of the block or page. If a request fails, the error is raised after running
+        requests are finished; blocks which are already sent remain.
+
+        :param block_id: id of block or page
+        :param blocks: block objects. Nested blocks are in 'children' of the type object.
+        :param after: id of child block which blocks are inserted after (default: the end)
+        :return: created top level block objects
+        """
+        created: List[Dict[str, Any]] = list()
+        children = collections.deque(blocks)
+        if not children:
+            return created
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency,
+                                                         thread_name_prefix='notionizer-append')
+        futures: Set['concurrent.futures.Future[List[T_AppendJob]]'] = {
+            executor.submit(self._send, block_id, children, created, after)}
+        try:
+            while futures:
+                done, futures = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    jobs = future.result()
+                    self.requests += 1
+                    for job in jobs:
+                        futures.add(executor.submit(self._send, *job))
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+        _log.debug(f"{len(created)} blocks appended to '{block_id}' with {self.requests} requests")
+        return created
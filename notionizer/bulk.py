@@ -0,0 +1,210 @@
+"""
+Bulk Operation
+
+'BulkOperation' sends many requests through the rate limited 'HttpRequest' on a thread pool and yields
+'BulkResult' in input order. Failures do not stop the operation; they are collected in 'BulkReport' with the
+offending payloads so that they could be retried.
+
+Requests are sent while the operation is consumed: iterate it or call 'wait()'. An operation which is dropped
+without being consumed sends nothing and warns with 'RuntimeWarning'.
+
+[Usage]
+
+operation = database.create_pages(rows, concurrency=4)
+for result in operation:
+    if result.ok:
+        print(result.page)
+
+report = operation.report
+retry = database.create_pages(report.failed_rows())
+
+operation = database.update_pages([(page_id, {'Status': {'name': 'Done'}}), ...], concurrency=4)
+print(operation.wait())
+"""
+
+import collections
+import concurrent.futures
+import time
+import warnings
+
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+_log = __import__('logging').getLogger(__name__)
+
+
+class BulkResult:
+    """
+    result of a row.
+
+    index: position in input rows
+    row: input row
+    payload: converted request body (None if conversion failed or nothing to send)
+    page: created/updated object (None if failed)
+    error: exception (None if succeeded)
+    unchanged: True if the row did not change anything and no request was sent
+    """
+
+    def __init__(self, index: int, row: Any, payload: Optional[Dict[str, Any]] = None,
+                 error: Optional[BaseException] = None):
+        self.index = index
+        self.row = row
+        self.payload = payload
+        self.page: Any = None
+        self.error: Optional[BaseException] = error
+        self.unchanged = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        state = ('unchanged' if self.unchanged else 'ok') if self.ok else f'error: {self.error!r}'
+        return f"<'{self.__class__.__name__}[{self.index}]: {state}' at {hex(id(self))}>"
+
+
+class BulkReport:
+    """
+    summary of 'BulkOperation'.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.succeeded = 0
+        self.unchanged = 0
+        self.skipped = 0
+        self.failures: List[BulkResult] = list()
+        self.elapsed = 0.0
+
+    @property
+    def failed(self) -> int:
+        return len(self.failures)
+
+    @property
+    def throughput(self) -> float:
+        """
+        rows per second.
+        """
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def add(self, result: BulkResult) -> None:
+        self.total += 1
+        if not result.ok:
+            self.failures.append(result)
+        elif result.unchanged:
+            self.unchanged += 1
+        else:
+            self.succeeded += 1
+
+    def failed_rows(self) -> List[Any]:
+        """
+        input rows of failures, for retrying.
+        :return: list
+        """
+        return [result.row for result in self.failures]
+
+    def failed_payloads(self) -> List[Optional[Dict[str, Any]]]:
+        """
+        request bodies of failures. 'None' for rows which failed conversion.
+        :return: list
+        """
+        return [result.payload for result in self.failures]
+
+    def __str__(self) -> str:
+        return f"<'{self.__class__.__name__}: {self.succeeded}/{self.total} succeeded, " \
+               f"{self.unchanged} unchanged, {self.failed} failed, {self.skipped} skipped, " \
+               f"{self.elapsed:.2f}s ({self.throughput:.1f} rows/s)'>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class BulkOperation:
+    """
+    iterator over 'BulkResult' in input order. Requests are sent concurrently on a thread pool, bounded to
+    'concurrency' running requests and '2 * concurrency' buffered results.
+
+    Nothing is sent until the operation is iterated or 'wait()' is called.
+    """
+
+    def __init__(self, results: Iterable[BulkResult], send: Callable[[BulkResult], Any],
+                 wrap: Callable[[Any], Any], concurrency: int):
+        """
+
+        :param results: 'BulkResult' with converted 'payload', conversion 'error' or 'unchanged'
+        :param send: function which sends 'BulkResult.payload' on a worker thread. (ex: returns raw page object)
+        :param wrap: function which creates the result object from returned value on the consuming thread
+        :param concurrency: maximum number of concurrent requests
+        """
+        assert 0 < concurrency, "'concurrency' should be positive"
+        self._results = results
+        self._send = send
+        self._wrap = wrap
+        self.concurrency = concurrency
+        self.report = BulkReport()
+        # created on first 'next'. (generator refers to the operation)
+        self._iterator: Optional[Iterator[BulkResult]] = None
+
+    def __iter__(self) -> 'BulkOperation':
+        return self
+
+    def __next__(self) -> BulkResult:
+        if self._iterator is None:
+            self._iterator = self._run()
+        return next(self._iterator)
+
+    def __del__(self) -> None:
+        results = getattr(self, '_results', None)
+        if getattr(self, '_iterator', True) is None and isinstance(results, list) and \
+                any(result.ok and not result.unchanged for result in results):
+            warnings.warn(f"'{self.__class__.__name__}' was never consumed and no request was sent. "
+                          f"Iterate it or call 'wait()'.", RuntimeWarning)
+
+    def wait(self) -> BulkReport:
+        """
+        consume remaining results and return report.
+        :return: BulkReport
+        """
+        for _ in self:
+            pass
+        return self.report
+
+    def _resolve(self, result: BulkResult, future: Optional['concurrent.futures.Future[Any]']) -> BulkResult:
+        if future is not None:
+            try:
+                result.page = self._wrap(future.result())
+            except Exception as e:
+                _log.info(f"bulk row {result.index} failed: {e}")
+                result.error = e
+        self.report.add(result)
+        return result
+
+    def _run(self) -> Iterator[BulkResult]:
+        started = time.monotonic()
+        pending: Deque[Tuple[BulkResult, Optional['concurrent.futures.Future[Any]']]] = collections.deque()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency,
+                                                         thread_name_prefix='notionizer-bulk')
+        try:
+            for result in self._results:
+                future = None
+                if result.ok and not result.unchanged:
+                    future = executor.submit(self._send, result)
+                pending.append((result, future))
+                while 2 * self.concurrency <= len(pending):
+                    yield self._resolve(*pending.popleft())
+            while pending:
+                yield self._resolve(*pending.popleft())
+        finally:
+            # stopped early: requests which are not started yet are cancelled.
+            for result, future in pending:
+                if future is not None and future.cancel():
+                    self.report.skipped += 1
+            executor.shutdown(wait=True)
+            self.report.elapsed = time.monotonic() - started
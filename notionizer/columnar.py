@@ -0,0 +1,372 @@
+"""
+Columnar Store
+
+'ColumnarStore' keeps cached pages as NumPy arrays per property and evaluates filter bodies (the same json sent to
+the api) with vectorized operations. The result is a boolean row mask. Use it when many rows are filtered
+repeatedly (ex: dashboards); 'FilterEvaluator' is simpler for a few rows.
+
+NumPy is an optional dependency: pip install notionizer[columnar]
+
+Columns by property type:
+- number: float64 (NaN for empty)
+- checkbox: bool
+- date, created_time, last_edited_time: datetime64[ms] in UTC (NaT for empty, 'start' of date range)
+- select, status: categorical codes (int32, -1 for empty) and 'categories'
+- multi_select, people, relation, files: categorical codes of elements with row offsets
+- title, rich_text, url, email, phone_number: str
+
+Values and operators follow 'FilterEvaluator' (see 'notionizer.evaluator'). Other types are kept as object arrays.
+Filters on them, 'formula', 'rollup' and relative date filters raise 'NotionApiQueoryException'.
+
+[Usage]
+
+store = database.get_as_columns(database.query('Name', columns=['Name', 'Count', 'Status']))
+mask = store.mask(filter().add(filter_number('Count').greater_than(3)))
+ids = store.ids[mask]
+"""
+
+from notionizer.evaluator import get_filter_value
+from notionizer.exception import NotionApiQueoryException
+from notionizer.functions import normalize_iso_time
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+_log = __import__('logging').getLogger(__name__)
+
+T_Mask = Any  # numpy.ndarray of bool
+
+TEXT_TYPES = ('title', 'rich_text', 'text', 'url', 'email', 'phone_number')
+OPTION_TYPES = ('select', 'status')
+ARRAY_TYPES = ('multi_select', 'people', 'relation', 'files')
+TIME_TYPES = ('date', 'created_time', 'last_edited_time')
+
+
+def _import_numpy() -> Any:
+    """
+    numpy is imported on first use, so that 'notionizer' works without it.
+    """
+    try:
+        import numpy  # type: ignore
+    except ImportError:
+        raise ImportError("'ColumnarStore' requires numpy. Install it with 'pip install notionizer[columnar]'.")
+    return numpy
+
+
+def _to_datetime64(value: Optional[str]) -> str:
+    # normalized values: '2021-05-10', '2021-10-15T19:00:00.000Z' or without timezone.
+    if not value:
+        return 'NaT'
+    return value[:-1] if value.endswith('Z') else value
+
+
+class Column:
+    """
+    a property of 'ColumnarStore'.
+
+    kind: 'text', 'number', 'checkbox', 'time', 'option', 'array' or 'object' (other types, not filterable)
+    values: array of values (option: codes, array: codes of elements)
+    categories: names of codes ('option' and 'array')
+    offsets: elements of row 'i' are 'values[offsets[i]:offsets[i + 1]]' ('array')
+    """
+
+    def __init__(self, name: str, property_type: str, property_id: str, values: List[Any]):
+        """
+
+        :param name: property name
+        :param property_type: type in schema ('title', 'rich_text', 'number'...)
+        :param property_id: property id
+        :param values: filter values of rows (see 'get_filter_value')
+        """
+        np = _import_numpy()
+        self.name = name
+        self.property_type = property_type
+        self.property_id = property_id
+        self.categories: List[Any] = list()
+        self.offsets: Any = None
+        self._codes: Dict[Any, int] = dict()
+        self._days: Any = None
+        self._lowered: Any = None
+
+        if property_type in TEXT_TYPES:
+            self.kind = 'text'
+            self.values = np.array([value or '' for value in values], dtype=str)
+        elif property_type == 'number':
+            self.kind = 'number'
+            self.values = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        elif property_type == 'checkbox':
+            self.kind = 'checkbox'
+            self.values = np.array([bool(value) for value in values], dtype=bool)
+        elif property_type in TIME_TYPES:
+            self.kind = 'time'
+            self.values = np.array([_to_datetime64(value) for value in values], dtype='datetime64[ms]')
+        elif property_type in OPTION_TYPES:
+            self.kind = 'option'
+            self.values = np.array([-1 if value is None else self._get_code(value) for value in values],
+                                   dtype=np.int32)
+        elif property_type in ARRAY_TYPES:
+            self.kind = 'array'
+            lengths = [len(value or ()) for value in values]
+            self.offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+            self.values = np.array([self._get_code(e) for value in values for e in value or ()], dtype=np.int32)
+        else:
+            # kept for 'get_values', but filters are not supported.
+            self.kind = 'object'
+            self.values = np.empty(len(values), dtype=object)
+            self.values[:] = values
+
+    def __repr__(self) -> str:
+        return f"<'{self.__class__.__name__}: {self.name}({self.kind})' at {hex(id(self))}>"
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1 if self.kind == 'array' else len(self.values)
+
+    def _get_code(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+    @property
+    def days(self) -> Any:
+        """
+        'datetime64[D]' values for 'date' only filter values.
+        """
+        if self._days is None:
+            self._days = self.values.astype('datetime64[D]')
+        return self._days
+
+    @property
+    def lowered(self) -> Any:
+        """
+        lower case text values for the operators which ignore case.
+        """
+        if self._lowered is None:
+            self._lowered = _import_numpy().char.lower(self.values)
+        return self._lowered
+
+    def get_values(self) -> List[Any]:
+        """
+        filter values of rows. (option: name, array: list of names or ids, time: numpy.datetime64)
+        :return: list
+        """
+        if self.kind == 'option':
+            return [self.categories[code] if 0 <= code else None for code in self.values.tolist()]
+        if self.kind == 'array':
+            offsets = self.offsets.tolist()
+            codes = self.values.tolist()
+            return [[self.categories[code] for code in codes[offsets[i]:offsets[i + 1]]] for i in range(len(self))]
+        return list(self.values)
+
+    def evaluate(self, operator: str, target: Any) -> T_Mask:
+        """
+        mask of rows which match 'operator'.
+
+        :param operator: 'equals', 'contains', 'is_empty'...
+        :param target: value of operator
+        :return: numpy.ndarray of bool
+        """
+        np = _import_numpy()
+        values = self.values
+        kind = self.kind
+
+        if kind == 'text':
+            text_operators: Dict[str, Callable[[], T_Mask]] = {
+                'equals': lambda: values == target,
+                'does_not_equal': lambda: values != target,
+                'contains': lambda: 0 <= np.char.find(self.lowered, target.lower()),
+                'does_not_contain': lambda: np.char.find(self.lowered, target.lower()) < 0,
+                'starts_with': lambda: np.char.startswith(self.lowered, target.lower()),
+                'ends_with': lambda: np.char.endswith(self.lowered, target.lower()),
+                'is_empty': lambda: values == '',
+                'is_not_empty': lambda: values != '',
+            }
+            if operator in text_operators:
+                return np.asarray(text_operators[operator](), dtype=bool)
+
+        elif kind == 'number':
+            number_operators: Dict[str, Callable[[], T_Mask]] = {
+                'equals': lambda: values == target,
+                'does_not_equal': lambda: ~(values == target),
+                'greater_than': lambda: values > target,
+                'less_than': lambda: values < target,
+                'greater_than_or_equal_to': lambda: values >= target,
+                'less_than_or_equal_to': lambda: values <= target,
+                'is_empty': lambda: np.isnan(values),
+                'is_not_empty': lambda: ~np.isnan(values),
+            }
+            if operator in number_operators:
+                return number_operators[operator]()
+
+        elif kind == 'checkbox':
+            if operator == 'equals':
+                return values == bool(target)
+            if operator == 'does_not_equal':
+                return values != bool(target)
+
+        elif kind == 'option':
+            if operator == 'is_empty':
+                return values < 0
+            if operator == 'is_not_empty':
+                return 0 <= values
+            code = self._codes.get(target, -2)
+            if operator == 'equals':
+                return values == code
+            if operator == 'does_not_equal':
+                return values != code
+
+        elif kind == 'array':
+            lengths = np.diff(self.offsets)
+            if operator == 'is_empty':
+                return lengths == 0
+            if operator == 'is_not_empty':
+                return 0 < lengths
+            if operator in ('contains', 'does_not_contain'):
+                mask = np.zeros(len(lengths), dtype=bool)
+                code = self._codes.get(target)
+                if code is not None:
+                    rows = np.repeat(np.arange(len(lengths)), lengths)
+                    mask[rows[values == code]] = True
+                return mask if operator == 'contains' else ~mask
+
+        elif kind == 'time':
+            if operator == 'is_empty':
+                return np.isnat(values)
+            if operator == 'is_not_empty':
+                return ~np.isnat(values)
+            time_operators: Dict[str, Callable[[Any, Any], T_Mask]] = {
+                'equals': lambda column, time: column == time,
+                'before': lambda column, time: column < time,
+                'after': lambda column, time: column > time,
+                'on_or_before': lambda column, time: column <= time,
+                'on_or_after': lambda column, time: column >= time,
+            }
+            if operator in time_operators:
+                time = normalize_iso_time(str(target))
+                # 'date' only value compares the day.
+                if len(time) == 10:
+                    return time_operators[operator](self.days, np.datetime64(time, 'D'))
+                return time_operators[operator](values, np.datetime64(_to_datetime64(time), 'ms'))
+
+        raise NotionApiQueoryException(f"'{self.property_type}' property('{self.name}') with '{operator}' is not "
+                                       f"supported by 'ColumnarStore'.")
+
+
+class ColumnarStore:
+    """
+    NumPy arrays of cached pages.
+    """
+
+    def __init__(self, schema: Iterable[Tuple[str, str, str]], pages: Iterable[Any]):
+        """
+
+        :param schema: ((property_name, property_type, property_id), ...)
+        :param pages: raw page objects or 'Page'
+        """
+        np = _import_numpy()
+        schema = tuple(schema)
+        rows = [page if type(page) is dict else page._raw_data for page in pages]
+        self.columns: Dict[str, Column] = dict()
+        self._property_ids: Dict[str, str] = dict()
+        for name, property_type, property_id in schema:
+            values = [self._get_value(row['properties'], name) for row in rows]
+            self.columns[name] = Column(name, property_type, property_id, values)
+            self._property_ids[property_id] = name
+
+        self.ids = np.array([str(row['id']) for row in rows], dtype=object)
+        self.created_time = Column('created_time', 'created_time', 'created_time',
+                                   [normalize_iso_time(row['created_time']) for row in rows])
+        self.last_edited_time = Column('last_edited_time', 'last_edited_time', 'last_edited_time',
+                                       [normalize_iso_time(row['last_edited_time']) for row in rows])
+
+    def __repr__(self) -> str:
+        return f"<'{self.__class__.__name__}: {len(self)} rows, columns: {', '.join(self.columns)}' " \
+               f"at {hex(id(self))}>"
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def _get_value(properties: Dict[str, Any], name: str) -> Any:
+        data = properties.get(name)
+        return None if data is None else get_filter_value(data)
+
+    @classmethod
+    def from_database(cls, database: Any, pages: Iterable[Any],
+                      columns: Optional[Iterable[str]] = None) -> 'ColumnarStore':
+        """
+        store of 'pages' with the schema of 'database'.
+
+        :param database: Database
+        :param pages: raw page objects or 'Page'
+        :param columns: ('column_name1', 'column_name2'...) (default: all)
+        :return: ColumnarStore
+        """
+        names = list(columns) if columns else list(database.properties.keys())
+        schema = list()
+        for name in names:
+            assert name in database.properties, f"'{name}' property not in the database '{database.title}'."
+            prop = database.properties[name]
+            schema.append((name, str(prop.type), str(prop.id)))
+        return cls(schema, pages)
+
+    def get_column(self, name: str) -> Column:
+        """
+        column by property name or id.
+
+        :param name: property name or id
+        :return: Column
+        """
+        if name not in self.columns and name in self._property_ids:
+            name = self._property_ids[name]
+        if name not in self.columns:
+            raise NotionApiQueoryException(f"'{name}' property is not in the 'ColumnarStore'.")
+        return self.columns[name]
+
+    def mask(self, notion_filter: Any) -> T_Mask:
+        """
+        rows which match the filter.
+
+        :param notion_filter: 'filter' instance, filter condition instance, body (dict) or None (all rows)
+        :return: numpy.ndarray of bool
+        """
+        np = _import_numpy()
+        if notion_filter is None:
+            return np.ones(len(self), dtype=bool)
+        body = notion_filter if isinstance(notion_filter, dict) else notion_filter.get_body()
+        return self._evaluate(body)
+
+    def _evaluate(self, body: Dict[str, Any]) -> T_Mask:
+        np = _import_numpy()
+        for bool_op in ('or', 'and'):
+            if bool_op in body:
+                masks = [self._evaluate(condition) for condition in body[bool_op]]
+                if not masks:
+                    return np.ones(len(self), dtype=bool)
+                reduce = np.logical_or if bool_op == 'or' else np.logical_and
+                return reduce.reduce(masks)
+
+        if 'timestamp' in body:
+            filter_type = str(body['timestamp'])
+            assert filter_type in ('created_time', 'last_edited_time'), f"invalid timestamp filter: {body}"
+            column: Column = getattr(self, filter_type)
+        else:
+            assert 'property' in body, f"invalid filter condition: {body}"
+            filter_types = [key for key in body if key != 'property']
+            assert len(filter_types) == 1, f"invalid filter condition: {body}"
+            filter_type = filter_types[0]
+            if filter_type in ('formula', 'rollup'):
+                raise NotionApiQueoryException(f"'{filter_type}' filter is not supported by 'ColumnarStore'.")
+            column = self.get_column(str(body['property']))
+
+        operators: Dict[str, Any] = body[filter_type]
+        if not operators:
+            raise NotionApiQueoryException(f"'{filter_type}' filter condition has no operator.")
+        masks = [column.evaluate(operator, target) for operator, target in operators.items()]
+        return np.logical_and.reduce(masks)
@@ -0,0 +1,106 @@
+"""
+Page Converter
+
+'PageConverter' validates simple values of a row and converts them to the payload of 'create page'. Converters are
+compiled once from the database schema, so converting many rows does not look up property objects again.
+'get_page_property_converter' returns the same kind of converter for a property of 'Page'.
+
+[Usage]
+
+converter = database.compile_converter()
+payload = converter({'Name': 'new page', 'Count': 3})
+"""
+
+import functools
+
+import notionizer.properties_property
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+
+T_Converter = Callable[[Any], Dict[str, Any]]
+
+
+def compile_converter(name: str, db_property: Any) -> T_Converter:
+    """
+    create function which validates 'value' and returns the update object of 'name' property.
+
+    :param name: property name
+    :param db_property: 'DbPropertyObject' or its class
+    :return: function
+    """
+    mutable: bool = db_property._mutable
+    input_validation = db_property._input_validation
+    convert = db_property._convert_to_update
+    label = f"<'{db_property.__name__}'>" if isinstance(db_property, type) else str(db_property)
+
+    def converter(value: Any) -> Dict[str, Any]:
+        assert mutable is True, f"{label}('{name}') property is 'Immutable Property'"
+        assert type(value) in input_validation, f"type of '{value}' is '{type(value)}'. " \
+            f"{label}('{name}') property has type {input_validation}"
+        return convert(value)
+
+    return converter
+
+
+@functools.lru_cache(maxsize=None)
+def get_page_property_converter(name: str, property_type: str) -> T_Converter:
+    """
+    converter of page property. Values are validated and converted with the class of database property of
+    'property_type'.
+
+    :param name: property name
+    :param property_type: type of page property ('title', 'rich_text', 'number'...)
+    :return: function
+    """
+    db_property_type = 'text' if property_type == 'rich_text' else property_type
+    db_property_cls = notionizer.properties_property.database_properties_mapper.get(db_property_type)
+    assert db_property_cls is not None, f"'{name}' property(type: '{property_type}') is not supported."
+    return compile_converter(name, db_property_cls)
+
+
+class PageConverter:
+    """
+    Precompiled converter of rows to 'create page' payloads of a database.
+    """
+
+    def __init__(self, database_id: str, properties: Dict[str, Any], database_title: str = ''):
+        """
+
+        :param database_id: parent database
+        :param properties: {'property_name': DbPropertyObject, ...}
+        :param database_title: for error message
+        """
+        self.database_id = database_id
+        self.database_title = database_title
+        self._converters: Dict[str, T_Converter] = {name: compile_converter(name, db_property)
+                                                    for name, db_property in properties.items()}
+
+    def __repr__(self) -> str:
+        return f"<'{self.__class__.__name__}(database: {self.database_title})' at {hex(id(self))}>"
+
+    def __call__(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        return self.convert(row)
+
+    def convert_properties(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        validate and convert values of a row. Raises 'AssertionError' for invalid value.
+
+        :param row: {'property_name': value, ...}
+        :return: {'property_name': update object, ...}
+        """
+        properties = dict()
+        for key, value in row.items():
+            assert key in self._converters, f"'{key}' property not in the database '{self.database_title}'."
+            properties[key] = self._converters[key](value)
+        return properties
+
+    def convert(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        payload of 'create page'.
+
+        :param row: {'property_name': value, ...}
+        :return: {'parent': {'database_id': ...}, 'properties': {...}}
+        """
+        return {'parent': {'database_id': self.database_id}, 'properties': self.convert_properties(row)}
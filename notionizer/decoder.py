@@ -0,0 +1,88 @@
+"""
+Row Decoder
+
+'RowDecoder' decodes raw page objects of a database into simple values. Column extractors are compiled once from
+the database schema, so decoding a row does not look up property classes or create 'PagePropertyObject'.
+
+[Usage]
+
+decoder = database.compile_decoder(columns=['Name', 'Status'])
+for data in database.query('Status', raw=True):
+    name, status = decoder(data)
+"""
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Tuple
+
+from notionizer.properties_page import page_property_value_parsers
+from notionizer.properties_page import parse_plain_value
+from notionizer.properties_page import parse_page_property
+
+T_Extractor = Callable[[Dict[str, Any]], Any]
+
+
+def compile_extractor(name: str, property_type: str) -> T_Extractor:
+    """
+    create function which returns simple value of 'name' property from 'properties' of raw page object.
+
+    :param name: property name
+    :param property_type: type in schema ('title', 'rich_text', 'number'...)
+    :return: function
+    """
+    parser: Callable[[Any], Any] = page_property_value_parsers.get(property_type, parse_plain_value)
+
+    def extract(properties: Dict[str, Any]) -> Any:
+        data: Dict[str, Any] = properties[name]
+        if data['type'] == property_type:
+            return parser(data[property_type])
+        # schema changed after compiling.
+        return parse_page_property(data)
+
+    return extract
+
+
+class RowDecoder:
+    """
+    Precompiled decoder of database rows. Accepts raw page object(dict) or 'Page'.
+    """
+
+    def __init__(self, schema: Iterable[Tuple[str, str]]):
+        """
+
+        :param schema: ((property_name, property_type), ...) in column order
+        """
+        schema = tuple(schema)
+        self.columns: Tuple[str, ...] = tuple(name for name, _ in schema)
+        self._extractors: Tuple[T_Extractor, ...] = tuple(compile_extractor(name, property_type)
+                                                          for name, property_type in schema)
+
+    def __repr__(self) -> str:
+        return f"<'{self.__class__.__name__}(columns: {', '.join(self.columns)})' at {hex(id(self))}>"
+
+    def __call__(self, page: Any) -> Tuple[Any, ...]:
+        return self.decode(page)
+
+    def decode(self, page: Any) -> Tuple[Any, ...]:
+        """
+        decode a row as tuple of values in 'columns' order.
+
+        :param page: raw page object or 'Page'
+        :return: tuple
+        """
+        if type(page) is not dict:
+            values = page.get_properties(self.columns)
+            return tuple(values[k] for k in self.columns)
+        properties: Dict[str, Any] = page['properties']
+        return tuple(extract(properties) for extract in self._extractors)
+
+    def decode_dict(self, page: Any) -> Dict[str, Any]:
+        """
+        decode a row as {'column': value, ...}.
+
+        :param page: raw page object or 'Page'
+        :return: dict
+        """
+        return dict(zip(self.columns, self.decode(page)))
@@ -0,0 +1,343 @@
+"""
+Filter Evaluator
+
+'FilterEvaluator' applies the body of 'filter' (the same json sent to the api) to raw page objects or 'Page'
+in-process, so that cached or mirrored pages could be filtered without requests. Nested 'and'/'or' compounds,
+timestamp filters, 'formula' and 'rollup' filters are supported.
+
+Semantics follow the api for the supported operators:
+- text values are the concatenated 'plain_text'. empty text equals ''. 'contains', 'does_not_contain',
+  'starts_with' and 'ends_with' ignore case; 'equals' and 'does_not_equal' are case sensitive.
+- 'does_not_equal' and 'does_not_contain' match empty values. comparisons ('greater_than', 'before'...) do not.
+- 'people', 'relation', 'created_by' and 'last_edited_by' compare ids. 'multi_select' and 'files' compare names.
+- times are compared after normalizing to UTC. A 'date' only value ('2021-05-10') compares the day.
+
+Relative date operators ('past_week', 'next_month'...) depend on the clock and timezone of the server, so they
+raise 'NotionApiQueoryException' like other unsupported operators.
+
+[Usage]
+
+evaluator = FilterEvaluator(database._query_helper.query_by_expression('not Done'))
+for page in evaluator.filter(cached_pages):
+    ...
+"""
+
+from notionizer.exception import NotionApiQueoryException
+from notionizer.functions import normalize_iso_time
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Union
+
+T_Value = Callable[[Dict[str, Any]], Any]
+T_Predicate = Callable[[Dict[str, Any]], bool]
+T_Operator = Callable[[Any, Any], bool]
+
+_log = __import__('logging').getLogger(__name__)
+
+
+def _get_time(value: Any) -> Optional[str]:
+    if not value:
+        return None
+    return normalize_iso_time(str(value))
+
+
+def _get_names(array: Any) -> List[Any]:
+    return [e.get('name') for e in array or ()]
+
+
+def _get_ids(array: Any) -> List[Any]:
+    return [str(e.get('id')) for e in array or ()]
+
+
+def _get_formula_value(value: Dict[str, Any]) -> Any:
+    value_type = value['type']
+    if value_type == 'date':
+        return _get_time((value[value_type] or {}).get('start'))
+    return value[value_type]
+
+
+def _get_rollup_value(value: Dict[str, Any]) -> Any:
+    value_type = value['type']
+    if value_type == 'date':
+        return _get_time((value[value_type] or {}).get('start'))
+    if value_type == 'array':
+        return [get_filter_value(e) for e in value[value_type]]
+    return value[value_type]
+
+
+"""
+value getters of raw 'page property object' by type. Types not in the mapper use the raw value.
+"""
+filter_value_getters: Dict[str, Callable[[Any], Any]] = {
+    'title': lambda value: ''.join(e['plain_text'] for e in value or ()),
+    'rich_text': lambda value: ''.join(e['plain_text'] for e in value or ()),
+    'select': lambda value: value['name'] if value else None,
+    'status': lambda value: value['name'] if value else None,
+    'multi_select': _get_names,
+    'files': _get_names,
+    'people': _get_ids,
+    'relation': _get_ids,
+    'created_by': lambda value: _get_ids([value] if value else ()),
+    'last_edited_by': lambda value: _get_ids([value] if value else ()),
+    'date': lambda value: _get_time(value['start']) if value else None,
+    'created_time': _get_time,
+    'last_edited_time': _get_time,
+    'formula': _get_formula_value,
+    'rollup': _get_rollup_value,
+}
+
+
+def get_filter_value(data: Dict[str, Any]) -> Any:
+    """
+    value of raw 'page property object' which filters compare.
+
+    :param data: {'id': ..., 'type': 'number', 'number': 3}
+    :return: value (text: str, date: normalized 'start', select: name, multi_select: [name, ...], people: [id, ...])
+    """
+    property_type: str = data['type']
+    getter = filter_value_getters.get(property_type)
+    value = data.get(property_type)
+    return getter(value) if getter else value
+
+
+def _compare_time(compare: Callable[[str, str], bool]) -> T_Operator:
+    def operator(value: Any, target: Any) -> bool:
+        if value is None:
+            return False
+        target = normalize_iso_time(str(target))
+        # 'date' only value compares the day.
+        return compare(value[:10] if len(target) == 10 else value, target)
+
+    return operator
+
+
+TEXT_OPERATORS: Dict[str, T_Operator] = {
+    'equals': lambda value, target: (value or '') == target,
+    'does_not_equal': lambda value, target: (value or '') != target,
+    'contains': lambda value, target: target.lower() in (value or '').lower(),
+    'does_not_contain': lambda value, target: target.lower() not in (value or '').lower(),
+    'starts_with': lambda value, target: (value or '').lower().startswith(target.lower()),
+    'ends_with': lambda value, target: (value or '').lower().endswith(target.lower()),
+    'is_empty': lambda value, target: not value,
+    'is_not_empty': lambda value, target: bool(value),
+}
+
+NUMBER_OPERATORS: Dict[str, T_Operator] = {
+    'equals': lambda value, target: value is not None and value == target,
+    'does_not_equal': lambda value, target: value is None or value != target,
+    'greater_than': lambda value, target: value is not None and target < value,
+    'less_than': lambda value, target: value is not None and value < target,
+    'greater_than_or_equal_to': lambda value, target: value is not None and target <= value,
+    'less_than_or_equal_to': lambda value, target: value is not None and value <= target,
+    'is_empty': lambda value, target: value is None,
+    'is_not_empty': lambda value, target: value is not None,
+}
+
+CHECKBOX_OPERATORS: Dict[str, T_Operator] = {
+    'equals': lambda value, target: bool(value) == bool(target),
+    'does_not_equal': lambda value, target: bool(value) != bool(target),
+}
+
+SELECT_OPERATORS: Dict[str, T_Operator] = {
+    'equals': lambda value, target: value is not None and value == target,
+    'does_not_equal': lambda value, target: value is None or value != target,
+    'is_empty': lambda value, target: value is None,
+    'is_not_empty': lambda value, target: value is not None,
+}
+
+ARRAY_OPERATORS: Dict[str, T_Operator] = {
+    'contains': lambda value, target: target in (value or ()),
+    'does_not_contain': lambda value, target: target not in (value or ()),
+    'is_empty': lambda value, target: not value,
+    'is_not_empty': lambda value, target: bool(value),
+}
+
+DATE_OPERATORS: Dict[str, T_Operator] = {
+    'equals': _compare_time(lambda value, target: value == target),
+    'before': _compare_time(lambda value, target: value < target),
+    'after': _compare_time(lambda value, target: target < value),
+    'on_or_before': _compare_time(lambda value, target: value <= target),
+    'on_or_after': _compare_time(lambda value, target: target <= value),
+    'is_empty': lambda value, target: value is None,
+    'is_not_empty': lambda value, target: value is not None,
+}
+
+"""
+operators by filter type. 'string' is the text result of 'formula'.
+"""
+filter_operators: Dict[str, Dict[str, T_Operator]] = {
+    'title': TEXT_OPERATORS,
+    'rich_text': TEXT_OPERATORS,
+    'text': TEXT_OPERATORS,
+    'url': TEXT_OPERATORS,
+    'email': TEXT_OPERATORS,
+    'phone_number': TEXT_OPERATORS,
+    'string': TEXT_OPERATORS,
+    'number': NUMBER_OPERATORS,
+    'checkbox': CHECKBOX_OPERATORS,
+    'select': SELECT_OPERATORS,
+    'status': SELECT_OPERATORS,
+    'multi_select': ARRAY_OPERATORS,
+    'people': ARRAY_OPERATORS,
+    'relation': ARRAY_OPERATORS,
+    'files': ARRAY_OPERATORS,
+    'created_by': ARRAY_OPERATORS,
+    'last_edited_by': ARRAY_OPERATORS,
+    'date': DATE_OPERATORS,
+    'created_time': DATE_OPERATORS,
+    'last_edited_time': DATE_OPERATORS,
+}
+
+
+def compile_operators(filter_type: str, operators: Dict[str, Any]) -> Callable[[Any], bool]:
+    """
+    create function which tests a value with all 'operators' of a condition.
+
+    :param filter_type: 'rich_text', 'number', 'date'...
+    :param operators: {'equals': 3, ...}
+    :return: function
+    """
+    if filter_type not in filter_operators:
+        raise NotionApiQueoryException(f"'{filter_type}' filter is not supported.")
+    if not operators:
+        raise NotionApiQueoryException(f"'{filter_type}' filter condition has no operator.")
+    tests = list()
+    for operator, target in operators.items():
+        if operator not in filter_operators[filter_type]:
+            raise NotionApiQueoryException(f"'{filter_type}' filter with '{operator}' is not supported.")
+        tests.append((filter_operators[filter_type][operator], target))
+
+    def test(value: Any) -> bool:
+        return all(function(value, target) for function, target in tests)
+
+    return test
+
+
+def _compile_rollup(condition: Dict[str, Any]) -> Callable[[Any], bool]:
+    """
+    {'any': {'rich_text': {'contains': 'a'}}}, {'number': {'number': {'equals': 3}}}...
+    """
+    assert len(condition) == 1, f"invalid rollup filter condition: {condition}"
+    (aggregate, inner), = condition.items()
+    assert len(inner) == 1, f"invalid rollup filter condition: {condition}"
+    (filter_type, operators), = inner.items()
+    test = compile_operators(filter_type, operators)
+    if aggregate == 'any':
+        return lambda values: any(test(value) for value in values or ())
+    if aggregate == 'every':
+        return lambda values: all(test(value) for value in values or ())
+    if aggregate == 'none':
+        return lambda values: not any(test(value) for value in values or ())
+    if aggregate in ('number', 'date'):
+        return test
+    raise NotionApiQueoryException(f"rollup filter with '{aggregate}' is not supported.")
+
+
+def _compile_property_getter(property_name: str) -> T_Value:
+    """
+    getter of a property value from raw page object. 'property_name' could be the id of property.
+    """
+    def get_value(page: Dict[str, Any]) -> Any:
+        properties: Dict[str, Any] = page['properties']
+        data = properties.get(property_name)
+        if data is None:
+            # 'property' of filter accepts the id as well.
+            for name, e in properties.items():
+                if str(e.get('id')) == property_name:
+                    data = e
+                    break
+            else:
+                raise NotionApiQueoryException(f"'{property_name}' property is not in the page '{page.get('id')}'.")
+        return get_filter_value(data)
+
+    return get_value
+
+
+def compile_predicate(body: Dict[str, Any]) -> T_Predicate:
+    """
+    create function which tests raw page object with filter 'body'.
+
+    :param body: {'or': [condition, ...]}, {'and': [...]} or condition
+    :return: function
+    """
+    for bool_op in ('or', 'and'):
+        if bool_op in body:
+            predicates = [compile_predicate(condition) for condition in body[bool_op]]
+            if not predicates:
+                return lambda page: True
+            if bool_op == 'or':
+                return lambda page: any(predicate(page) for predicate in predicates)
+            return lambda page: all(predicate(page) for predicate in predicates)
+
+    get_value: T_Value
+    if 'timestamp' in body:
+        filter_type = str(body['timestamp'])
+        get_value = lambda page: _get_time(page[filter_type])  # noqa: E731
+    else:
+        assert 'property' in body, f"invalid filter condition: {body}"
+        filter_types = [key for key in body if key != 'property']
+        assert len(filter_types) == 1, f"invalid filter condition: {body}"
+        filter_type = filter_types[0]
+        get_value = _compile_property_getter(str(body['property']))
+
+    operators: Dict[str, Any] = body[filter_type]
+    if filter_type == 'formula':
+        assert len(operators) == 1, f"invalid formula filter condition: {body}"
+        (formula_type, operators), = operators.items()
+        test = compile_operators(formula_type, operators)
+    elif filter_type == 'rollup':
+        test = _compile_rollup(operators)
+    else:
+        test = compile_operators(filter_type, operators)
+    return lambda page: test(get_value(page))
+
+
+class FilterEvaluator:
+    """
+    Precompiled filter. Accepts raw page object(dict) or 'Page'.
+    """
+
+    def __init__(self, notion_filter: Union[Dict[str, Any], Any, None]):
+        """
+
+        :param notion_filter: 'filter' instance, filter condition instance or body (dict). 'None' matches all.
+        """
+        body: Dict[str, Any] = dict()
+        if notion_filter is not None:
+            body = notion_filter if isinstance(notion_filter, dict) else notion_filter.get_body()
+        self.body = body
+        self._predicate: T_Predicate = compile_predicate(body) if body else lambda page: True
+
+    def __repr__(self) -> str:
+        return f"<'{self.__class__.__name__}: {self.body}' at {hex(id(self))}>"
+
+    def __call__(self, page: Any) -> bool:
+        return self.match(page)
+
+    def match(self, page: Any) -> bool:
+        """
+        test a page.
+
+        :param page: raw page object or 'Page'
+        :return: bool
+        """
+        if type(page) is not dict:
+            page = page._raw_data
+        return self._predicate(page)
+
+    def filter(self, pages: Iterable[Any]) -> Iterator[Any]:
+        """
+        pages which match the filter, in the same order.
+
+        :param pages: raw page objects or 'Page'
+        :return: iterator
+        """
+        for page in pages:
+            if self.match(page):
+                yield page
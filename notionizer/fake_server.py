@@ -0,0 +1,712 @@
+"""
+FAKE SERVER
+
+Local stand-in of the Notion API for load tests. It serves seeded fixtures over HTTP on localhost, paginates with
+'next_cursor', answers '429' with 'Retry-After' over its rate limit and adds configurable latency.
+
+Endpoints:
+    GET    v1/databases/{id}
+    POST   v1/databases/{id}/query      (filters are evaluated with 'FilterEvaluator', sorts are not)
+    GET    v1/pages/{id}
+    POST   v1/pages
+    PATCH  v1/pages/{id}
+    GET    v1/blocks/{id}
+    PATCH  v1/blocks/{id}
+    DELETE v1/blocks/{id}
+    GET    v1/blocks/{id}/children
+    PATCH  v1/blocks/{id}/children      (limits of children count and nesting are checked, 'after' is supported)
+    GET    v1/users, v1/users/me, v1/users/{id}
+
+[Usage]
+
+from notionizer import settings
+from notionizer.fake_server import FakeNotionServer
+
+with FakeNotionServer(latency=0.05, rate_limit=3) as server:
+    settings.BASE_URL = server.base_url
+    notion = Notion('any_key')
+    db = notion.get_database(server.store.database_ids[0])
+
+[Command line]
+
+python -m notionizer.fake_server --port 8080 --rows 1000 --latency 0.05 --rate-limit 3
+"""
+
+import argparse
+import copy
+import datetime
+import http.server
+import json
+import random
+import re
+import threading
+import time
+import uuid
+
+from urllib import parse
+
+from notionizer.evaluator import FilterEvaluator
+from notionizer.exception import NotionApiQueoryException
+from notionizer.http_request import TokenBucket
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+_log = __import__('logging').getLogger(__name__)
+
+T_Response = Tuple[int, Dict[str, Any]]
+
+MAX_PAGE_SIZE = 100
+# limits of 'PATCH v1/blocks/{id}/children': blocks in a request and levels of nested 'children'
+MAX_APPEND_BLOCKS = 1000
+MAX_APPEND_NESTING = 2
+
+STATUS_OPTIONS = ('Todo', 'Doing', 'Done')
+TAG_OPTIONS = ('red', 'green', 'blue', 'yellow')
+
+"""
+value of page property which is not assigned.
+"""
+empty_property_values: Dict[str, Any] = {
+    'title': [], 'rich_text': [], 'number': None, 'checkbox': False, 'select': None, 'multi_select': [],
+    'date': None, 'people': [], 'files': [], 'url': None, 'email': None, 'phone_number': None, 'relation': [],
+}
+
+
+class FakeApiError(Exception):
+    """
+    error which is sent as notion 'error object'.
+    """
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+    def to_object(self) -> Dict[str, Any]:
+        return {'object': 'error', 'status': self.status, 'code': self.code, 'message': self.message}
+
+
+def _key(object_id: str) -> str:
+    """
+    notion accepts ids with or without dashes.
+    """
+    return object_id.replace('-', '')
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+"""
+(method, path pattern, handler of 'FakeNotionStore')
+"""
+_routes: List[Tuple[str, 're.Pattern[str]', str]] = [(method, re.compile(pattern), handler) for
+                                                    method, pattern, handler in (
+    ('GET', r'v1/databases/([^/]+)', 'get_database'),
+    ('POST', r'v1/databases/([^/]+)/query', 'query_database'),
+    ('GET', r'v1/pages/([^/]+)', 'get_page'),
+    ('POST', r'v1/pages/?', 'create_page'),
+    ('PATCH', r'v1/pages/([^/]+)', 'update_page'),
+    ('GET', r'v1/blocks/([^/]+)', 'get_block'),
+    ('PATCH', r'v1/blocks/([^/]+)', 'update_block'),
+    ('DELETE', r'v1/blocks/([^/]+)', 'delete_block'),
+    ('GET', r'v1/blocks/([^/]+)/children', 'get_block_children'),
+    ('PATCH', r'v1/blocks/([^/]+)/children', 'append_block_children'),
+    ('GET', r'v1/users/?', 'get_users'),
+    ('GET', r'v1/users/me', 'get_me'),
+    ('GET', r'v1/users/([^/]+)', 'get_user'),
+)]
+
+
+def rich_text(content: str) -> List[Dict[str, Any]]:
+    return [{'type': 'text', 'plain_text': content, 'href': None,
+             'annotations': {'bold': False, 'italic': False, 'strikethrough': False, 'underline': False,
+                             'code': False, 'color': 'default'},
+             'text': {'content': content, 'link': None}}]
+
+
+def _normalize_rich_text(array: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    fill 'plain_text', 'annotations' and 'href' of rich text input. (ex: [{'text': {'content': 'abc'}}])
+    """
+    result = list()
+    for e in array:
+        if 'plain_text' in e:
+            result.append(e)
+        else:
+            text = e.get('text', {})
+            element = rich_text(text.get('content', ''))[0]
+            element['annotations'].update(e.get('annotations') or {})
+            if text.get('link'):
+                element['text']['link'] = text['link']
+                element['href'] = text['link'].get('url')
+            result.append(element)
+    return result
+
+
+class FakeNotionStore:
+    """
+    seeded objects of 'FakeNotionServer'. Same 'seed' gives same ids and values.
+    """
+
+    def __init__(self, seed: int = 0, databases: int = 1, rows: int = 100, block_depth: int = 2,
+                 block_breadth: int = 5):
+        """
+
+        :param seed: seed of ids and values
+        :param databases: number of databases
+        :param rows: number of pages in each database
+        :param block_depth: depth of block tree under 'root_block_id'
+        :param block_breadth: children of each block in the tree
+        """
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self.databases: Dict[str, Dict[str, Any]] = dict()
+        self.pages: Dict[str, Dict[str, Any]] = dict()
+        # database key -> page keys in creation order
+        self.rows: Dict[str, List[str]] = dict()
+        self.blocks: Dict[str, Dict[str, Any]] = dict()
+        # block(or page) key -> child block keys
+        self.children: Dict[str, List[str]] = dict()
+        # block key -> parent block(or page) key
+        self.parents: Dict[str, str] = dict()
+
+        self.bot = {'object': 'user', 'id': self._new_id(), 'type': 'bot', 'name': 'notionizer bot',
+                    'avatar_url': None, 'bot': {}}
+        self.users: Dict[str, Dict[str, Any]] = {_key(self.bot['id']): self.bot}
+        for i in range(2):
+            user = {'object': 'user', 'id': self._new_id(), 'type': 'person', 'name': f'user {i}',
+                    'avatar_url': None, 'person': {'email': f'user{i}@example.com'}}
+            self.users[_key(user['id'])] = user
+
+        self.database_ids: List[str] = list()
+        for i in range(databases):
+            database = self._new_database(f'Database {i}')
+            self.database_ids.append(database['id'])
+            for j in range(rows):
+                self._new_page(database, self._seeded_properties(database, j))
+
+        self.root_block_id: str = self._new_id()
+        self.blocks[_key(self.root_block_id)] = self._block_object(self.root_block_id, 'Root', block_depth > 0)
+        parents = [self.root_block_id]
+        for level in range(block_depth):
+            next_parents = list()
+            for parent_id in parents:
+                for i in range(block_breadth):
+                    block = self._block_object(self._new_id(), f'block {level}.{i}', level + 1 < block_depth)
+                    self._add_block(parent_id, block)
+                    next_parents.append(block['id'])
+            parents = next_parents
+
+    def _new_id(self) -> str:
+        return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def _user_reference(self) -> Dict[str, Any]:
+        return {'object': 'user', 'id': self.bot['id']}
+
+    def _new_database(self, title: str) -> Dict[str, Any]:
+        database_id = self._new_id()
+        now = _now()
+        database = {
+            'object': 'database', 'id': database_id, 'created_time': now, 'last_edited_time': now,
+            'created_by': self._user_reference(), 'last_edited_by': self._user_reference(),
+            'title': rich_text(title), 'icon': None, 'cover': None,
+            'parent': {'type': 'workspace', 'workspace': True},
+            'url': 'https://www.notion.so/' + _key(database_id), 'archived': False,
+            'properties': {
+                'Name': {'id': 'title', 'name': 'Name', 'type': 'title', 'title': {}},
+                'Note': {'id': 'n0te', 'name': 'Note', 'type': 'rich_text', 'rich_text': {}},
+                'Count': {'id': 'c0nt', 'name': 'Count', 'type': 'number', 'number': {'format': 'number'}},
+                'Done': {'id': 'd0ne', 'name': 'Done', 'type': 'checkbox', 'checkbox': {}},
+                'Status': {'id': 'st4t', 'name': 'Status', 'type': 'select', 'select': {'options': [
+                    {'id': name, 'name': name, 'color': 'default'} for name in STATUS_OPTIONS]}},
+                'Tags': {'id': 't4gs', 'name': 'Tags', 'type': 'multi_select', 'multi_select': {'options': [
+                    {'id': name, 'name': name, 'color': name} for name in TAG_OPTIONS]}},
+                'Due': {'id': 'du3d', 'name': 'Due', 'type': 'date', 'date': {}},
+            },
+        }
+        self.databases[_key(database_id)] = database
+        self.rows[_key(database_id)] = list()
+        return database
+
+    def _seeded_properties(self, database: Dict[str, Any], index: int) -> Dict[str, Any]:
+        rng = self._random
+        status = rng.choice(STATUS_OPTIONS + (None,))
+        day = datetime.date(2022, 1, 1) + datetime.timedelta(days=rng.randrange(365))
+        return {
+            'Name': {'title': rich_text(f'row {index}')},
+            'Note': {'rich_text': rich_text(' '.join(rng.choice(('lorem', 'ipsum', 'dolor', 'sit'))
+                                                     for _ in range(rng.randrange(1, 12))))},
+            'Count': {'number': rng.randrange(1000)},
+            'Done': {'checkbox': rng.random() < 0.5},
+            'Status': {'select': {'name': status} if status else None},
+            'Tags': {'multi_select': [{'name': name} for name in rng.sample(TAG_OPTIONS, rng.randrange(3))]},
+            'Due': {'date': {'start': day.isoformat(), 'end': None, 'time_zone': None}},
+        }
+
+    def _property_value(self, schema: Dict[str, Any], value: Any) -> Dict[str, Any]:
+        """
+        convert input of 'create/update page' to page property object.
+        """
+        property_type = schema['type']
+        if not isinstance(value, dict) or property_type not in value:
+            raise FakeApiError(400, 'validation_error', f"'{schema['name']}' is expected to be {property_type}.")
+        data = value[property_type]
+        if property_type in ('title', 'rich_text'):
+            data = _normalize_rich_text(data)
+        elif property_type == 'select' and data is not None:
+            data = self._option(schema, data)
+        elif property_type == 'multi_select':
+            data = [self._option(schema, e) for e in data]
+        elif property_type == 'date' and data is not None:
+            data = {'start': data.get('start'), 'end': data.get('end'), 'time_zone': data.get('time_zone')}
+        return {'id': schema['id'], 'type': property_type, property_type: data}
+
+    @staticmethod
+    def _option(schema: Dict[str, Any], value: Dict[str, Any]) -> Dict[str, Any]:
+        options = schema[schema['type']].setdefault('options', [])
+        for option in options:
+            if option['name'] == value.get('name') or option['id'] == value.get('id'):
+                return dict(option)
+        option = {'id': value.get('name', ''), 'name': value.get('name', ''), 'color': 'default'}
+        options.append(option)
+        return dict(option)
+
+    def _new_page(self, database: Dict[str, Any], properties: Dict[str, Any]) -> Dict[str, Any]:
+        page_id = self._new_id()
+        now = _now()
+        schema: Dict[str, Any] = database['properties']
+        page_properties = dict()
+        for name, property_schema in schema.items():
+            property_type = property_schema['type']
+            value = properties.get(name, {property_type: copy.deepcopy(empty_property_values.get(property_type))})
+            page_properties[name] = self._property_value(property_schema, value)
+        for name in properties:
+            if name not in schema:
+                raise FakeApiError(400, 'validation_error', f"{name} is not a property that exists.")
+
+        page = {
+            'object': 'page', 'id': page_id, 'created_time': now, 'last_edited_time': now,
+            'created_by': self._user_reference(), 'last_edited_by': self._user_reference(),
+            'cover': None, 'icon': None, 'parent': {'type': 'database_id', 'database_id': database['id']},
+            'archived': False, 'url': 'https://www.notion.so/' + _key(page_id), 'properties': page_properties,
+        }
+        self.pages[_key(page_id)] = page
+        self.rows[_key(database['id'])].append(_key(page_id))
+        return page
+
+    def _block_object(self, block_id: str, content: str, has_children: bool) -> Dict[str, Any]:
+        now = _now()
+        return {
+            'object': 'block', 'id': block_id, 'created_time': now, 'last_edited_time': now,
+            'created_by': self._user_reference(), 'last_edited_by': self._user_reference(),
+            'has_children': has_children, 'archived': False, 'type': 'paragraph',
+            'paragraph': {'rich_text': rich_text(content), 'color': 'default'},
+        }
+
+    def _add_block(self, parent_id: str, block: Dict[str, Any], index: Optional[int] = None) -> None:
+        self.blocks[_key(block['id'])] = block
+        self.parents[_key(block['id'])] = _key(parent_id)
+        children = self.children.setdefault(_key(parent_id), list())
+        children.insert(len(children) if index is None else index, _key(block['id']))
+        parent = self.blocks.get(_key(parent_id))
+        if parent:
+            parent['has_children'] = True
+
+    @staticmethod
+    def _paginate(keys: List[str], objects: Dict[str, Dict[str, Any]], start_cursor: Optional[str],
+                  page_size: Any) -> Dict[str, Any]:
+        page_size = min(MAX_PAGE_SIZE, int(page_size or MAX_PAGE_SIZE))
+        start = 0
+        if start_cursor:
+            try:
+                start = keys.index(_key(start_cursor))
+            except ValueError:
+                raise FakeApiError(400, 'validation_error', f"start_cursor should be a valid uuid: {start_cursor}")
+        end = start + page_size
+        next_cursor = objects[keys[end]]['id'] if end < len(keys) else None
+        return {'object': 'list', 'results': [objects[k] for k in keys[start:end]], 'next_cursor': next_cursor,
+                'has_more': next_cursor is not None}
+
+    def _get(self, objects: Dict[str, Dict[str, Any]], object_id: str, name: str) -> Dict[str, Any]:
+        if _key(object_id) not in objects:
+            raise FakeApiError(404, 'object_not_found', f"Could not find {name} with ID: {object_id}.")
+        return objects[_key(object_id)]
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], payload: Dict[str, Any]) -> T_Response:
+        """
+        handle an api request.
+
+        :param method: 'GET', 'POST', 'PATCH', 'DELETE'
+        :param path: 'v1/...' without query string
+        :param query: parsed query string
+        :param payload: json body
+        :return: (status, json object)
+        """
+        path = path.strip('/')
+        for route_method, pattern, handler_name in _routes:
+            match = pattern.fullmatch(path)
+            if route_method == method and match:
+                handler: Callable[..., Dict[str, Any]] = getattr(self, handler_name)
+                try:
+                    with self._lock:
+                        # objects are copied so that later changes are not shared with the response.
+                        return 200, copy.deepcopy(handler(*match.groups(), query=query, payload=payload))
+                except FakeApiError as e:
+                    return e.status, e.to_object()
+        return 400, FakeApiError(400, 'invalid_request_url', f'Invalid request URL: {method} {path}').to_object()
+
+    def get_database(self, database_id: str, **kwargs: Any) -> Dict[str, Any]:
+        return self._get(self.databases, database_id, 'database')
+
+    def query_database(self, database_id: str, query: Dict[str, List[str]], payload: Dict[str, Any]
+                       ) -> Dict[str, Any]:
+        self._get(self.databases, database_id, 'database')
+        keys = [k for k in self.rows[_key(database_id)] if not self.pages[k]['archived']]
+        if payload.get('filter'):
+            try:
+                evaluator = FilterEvaluator(payload['filter'])
+                keys = [k for k in keys if evaluator.match(self.pages[k])]
+            except (NotionApiQueoryException, AssertionError) as e:
+                raise FakeApiError(400, 'validation_error', f"body.filter is invalid: {e}")
+        result = self._paginate(keys, self.pages, payload.get('start_cursor'), payload.get('page_size'))
+        filter_properties = query.get('filter_properties')
+        if filter_properties:
+            ids = set(filter_properties)
+            result['results'] = [dict(page, properties={k: v for k, v in page['properties'].items()
+                                                        if v['id'] in ids})
+                                 for page in result['results']]
+        return result
+
+    def get_page(self, page_id: str, **kwargs: Any) -> Dict[str, Any]:
+        return self._get(self.pages, page_id, 'page')
+
+    def create_page(self, payload: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        parent = payload.get('parent', {})
+        if 'database_id' not in parent:
+            raise FakeApiError(400, 'validation_error', 'body.parent.database_id should be defined.')
+        database = self._get(self.databases, parent['database_id'], 'database')
+        return self._new_page(database, payload.get('properties', {}))
+
+    def update_page(self, page_id: str, payload: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        page = self._get(self.pages, page_id, 'page')
+        database = self.databases[_key(page['parent']['database_id'])]
+        properties = dict(page['properties'])
+        for name, value in payload.get('properties', {}).items():
+            if name not in database['properties']:
+                raise FakeApiError(400, 'validation_error', f"{name} is not a property that exists.")
+            properties[name] = self._property_value(database['properties'][name], value)
+        page['properties'] = properties
+        if 'archived' in payload:
+            page['archived'] = bool(payload['archived'])
+        page['last_edited_time'] = _now()
+        return page
+
+    def get_block(self, block_id: str, **kwargs: Any) -> Dict[str, Any]:
+        return self._get(self.blocks, block_id, 'block')
+
+    def get_block_children(self, block_id: str, query: Dict[str, List[str]], **kwargs: Any) -> Dict[str, Any]:
+        if _key(block_id) not in self.blocks and _key(block_id) not in self.pages:
+            raise FakeApiError(404, 'object_not_found', f"Could not find block with ID: {block_id}.")
+        keys = self.children.get(_key(block_id), [])
+        start_cursor = query.get('start_cursor', [None])[0]
+        page_size = query.get('page_size', [None])[0]
+        return self._paginate(keys, self.blocks, start_cursor, page_size)
+
+    @staticmethod
+    def _normalize_block_value(value: Dict[str, Any]) -> None:
+        for key in ('rich_text', 'caption'):
+            if key in value:
+                value[key] = _normalize_rich_text(value[key])
+        if 'cells' in value:
+            value['cells'] = [_normalize_rich_text(cell) for cell in value['cells']]
+
+    def _validate_children(self, children: List[Dict[str, Any]], path: str, level: int) -> int:
+        """
+        check limits of appended children: 100 children per array and two levels of nesting.
+
+        :return: number of blocks including nested children
+        """
+        if MAX_PAGE_SIZE < len(children):
+            raise FakeApiError(400, 'validation_error',
+                               f'{path}.length should be ≤ `{MAX_PAGE_SIZE}`, instead was `{len(children)}`.')
+        count = len(children)
+        for i, child in enumerate(children):
+            block_type = child.get('type') or next(k for k in child if k != 'object')
+            nested = child.get(block_type, {}).get('children')
+            if nested:
+                nested_path = f'{path}[{i}].{block_type}.children'
+                if MAX_APPEND_NESTING <= level:
+                    raise FakeApiError(400, 'validation_error', f'{nested_path} should be not present.')
+                count += self._validate_children(nested, nested_path, level + 1)
+        return count
+
+    def append_block_children(self, block_id: str, payload: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        if _key(block_id) not in self.blocks and _key(block_id) not in self.pages:
+            raise FakeApiError(404, 'object_not_found', f"Could not find block with ID: {block_id}.")
+        children = payload.get('children', [])
+        if not kwargs.get('nested'):
+            count = self._validate_children(children, 'body.children', 0)
+            if MAX_APPEND_BLOCKS < count:
+                message = f'body.children should contain ≤ `{MAX_APPEND_BLOCKS}` blocks, instead was `{count}`.'
+                raise FakeApiError(400, 'validation_error', message)
+        index = None
+        if payload.get('after'):
+            siblings = self.children.get(_key(block_id), [])
+            if _key(payload['after']) not in siblings:
+                raise FakeApiError(400, 'validation_error', f"body.after should be a child of {block_id}.")
+            index = siblings.index(_key(payload['after'])) + 1
+        results = list()
+        for child in children:
+            block_type = child.get('type') or next(k for k in child if k != 'object')
+            now = _now()
+            block = {
+                'object': 'block', 'id': self._new_id(), 'created_time': now, 'last_edited_time': now,
+                'created_by': self._user_reference(), 'last_edited_by': self._user_reference(),
+                'has_children': False, 'archived': False, 'type': block_type,
+                block_type: dict(child[block_type]),
+            }
+            self._normalize_block_value(block[block_type])
+            nested = block[block_type].pop('children', None)
+            self._add_block(block_id, block, index)
+            if index is not None:
+                index += 1
+            if nested:
+                self.append_block_children(block['id'], payload={'children': nested}, nested=True)
+            results.append(block)
+        return {'object': 'list', 'results': results, 'next_cursor': None, 'has_more': False}
+
+    def update_block(self, block_id: str, payload: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        block = self._get(self.blocks, block_id, 'block')
+        if block['archived']:
+            raise FakeApiError(400, 'validation_error', "Can't edit block that is archived.")
+        if payload.get('archived'):
+            return self.delete_block(block_id)
+        for key, value in payload.items():
+            if key == 'archived':
+                continue
+            if key != block['type']:
+                message = f"body.{key} should be not present for {block['type']} block."
+                raise FakeApiError(400, 'validation_error', message)
+            if 'children' in value:
+                raise FakeApiError(400, 'validation_error', f"body.{key}.children should be not present.")
+            block[key].update(value)
+            self._normalize_block_value(block[key])
+        block['last_edited_time'] = _now()
+        return block
+
+    def delete_block(self, block_id: str, **kwargs: Any) -> Dict[str, Any]:
+        block = self._get(self.blocks, block_id, 'block')
+        if not block['archived']:
+            block['archived'] = True
+            parent_key = self.parents[_key(block_id)]
+            self.children[parent_key].remove(_key(block_id))
+            parent = self.blocks.get(parent_key)
+            if parent and not self.children[parent_key]:
+                parent['has_children'] = False
+        return block
+
+    def get_users(self, query: Dict[str, List[str]], **kwargs: Any) -> Dict[str, Any]:
+        start_cursor = query.get('start_cursor', [None])[0]
+        page_size = query.get('page_size', [None])[0]
+        return self._paginate(list(self.users), self.users, start_cursor, page_size)
+
+    def get_me(self, **kwargs: Any) -> Dict[str, Any]:
+        return self.bot
+
+    def get_user(self, user_id: str, **kwargs: Any) -> Dict[str, Any]:
+        return self._get(self.users, user_id, 'user')
+
+
+class _FakeNotionRequestHandler(http.server.BaseHTTPRequestHandler):
+    # keep-alive connections, so that the connection pool of 'HttpRequest' is exercised.
+    protocol_version = 'HTTP/1.1'
+    server: '_FakeNotionHTTPServer'
+
+    def do_GET(self) -> None:
+        self._handle('GET')
+
+    def do_POST(self) -> None:
+        self._handle('POST')
+
+    def do_PATCH(self) -> None:
+        self._handle('PATCH')
+
+    def do_DELETE(self) -> None:
+        self._handle('DELETE')
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        status, result, headers = self.server.app.dispatch(method, self.path, self.headers, body)
+        data = json.dumps(result).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        _log.debug(format % args)
+
+
+class _FakeNotionHTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    app: 'FakeNotionServer'
+
+
+class FakeNotionServer:
+    """
+    Fake Notion API server on a background thread.
+
+    Counters:
+        requests: number of received requests
+        throttled: number of '429' responses
+    """
+
+    def __init__(self, store: Optional[FakeNotionStore] = None, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, rate_limit: Optional[float] = None,
+                 burst: Optional[float] = None, require_auth: bool = True):
+        """
+
+        :param store: 'FakeNotionStore' (default: seeded store with default arguments)
+        :param host:
+        :param port: 0 for any free port. See 'base_url'.
+        :param latency: seconds added to each response
+        :param jitter: random seconds (0 ~ jitter) added to 'latency'
+        :param rate_limit: requests per second over which '429' is sent (default: None, no limit)
+        :param burst: requests allowed at once (default: 'rate_limit')
+        :param require_auth: if True, requests without 'Authorization: Bearer ...' get '401'
+        """
+        self.store: FakeNotionStore = store if store else FakeNotionStore()
+        self.latency = latency
+        self.jitter = jitter
+        self.require_auth = require_auth
+        self.bucket: Optional[TokenBucket] = None
+        if rate_limit:
+            self.bucket = TokenBucket(rate_limit, max(1.0, burst or rate_limit))
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+
+        self._httpd = _FakeNotionHTTPServer((host, port), _FakeNotionRequestHandler)
+        self._httpd.app = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        value for 'settings.BASE_URL'.
+        """
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def __enter__(self) -> 'FakeNotionServer':
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def start(self) -> 'FakeNotionServer':
+        """
+        serve on a daemon thread.
+        :return: self
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name='notionizer-fake-server',
+                                            daemon=True)
+            self._thread.start()
+            _log.info(f"fake notion server: {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        """
+        stop serving and close the socket.
+        :return: None
+        """
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'requests': self.requests, 'throttled': self.throttled}
+
+    def dispatch(self, method: str, url: str, headers: Any, body: bytes) -> Tuple[int, Dict[str, Any],
+                                                                                   Dict[str, str]]:
+        """
+        handle a http request.
+
+        :return: (status, json object, response headers)
+        """
+        with self._lock:
+            self.requests += 1
+
+        if self.bucket:
+            wait = self.bucket.try_reserve()
+            if 0 < wait:
+                with self._lock:
+                    self.throttled += 1
+                error = FakeApiError(429, 'rate_limited', 'You have been rate limited. Please try again in a few '
+                                                          'minutes.')
+                return 429, error.to_object(), {'Retry-After': f'{wait:.3f}'}
+
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+
+        if self.require_auth and not str(headers.get('Authorization', '')).startswith('Bearer '):
+            return 401, FakeApiError(401, 'unauthorized', 'API token is invalid.').to_object(), {}
+
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return 400, FakeApiError(400, 'invalid_json', 'Error parsing JSON body.').to_object(), {}
+        url_splited = parse.urlsplit(url)
+        status, result = self.store.handle(method, url_splited.path, parse.parse_qs(url_splited.query), payload)
+        return status, result, {}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='fake notion api server for load tests')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--databases', type=int, default=1)
+    parser.add_argument('--rows', type=int, default=1000, help='pages in each database')
+    parser.add_argument('--block-depth', type=int, default=3)
+    parser.add_argument('--block-breadth', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to each response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='random seconds added to latency')
+    parser.add_argument('--rate-limit', type=float, default=None, help='requests per second')
+    parser.add_argument('--burst', type=float, default=None, help='requests allowed at once')
+    args = parser.parse_args(argv)
+
+    store = FakeNotionStore(seed=args.seed, databases=args.databases, rows=args.rows,
+                            block_depth=args.block_depth, block_breadth=args.block_breadth)
+    server = FakeNotionServer(store, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+                              rate_limit=args.rate_limit, burst=args.burst)
+    print(f"BASE_URL: {server.base_url}")
+    print(f"databases: {', '.join(store.database_ids)}")
+    print(f"root block: {store.root_block_id}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
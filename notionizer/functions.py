@@ -1,3 +1,6 @@
+import datetime
+import re
+
 from functools import wraps
 from typing import List
 from typing import Any
@@ -18,6 +21,65 @@ def from_rich_text_array_to_plain_text(array: List[Dict[str, Any]]) -> str:
     return ' '.join([e['plain_text'].replace(u'\xa0', u' ') for e in array])
 
 
+_markdown_escape_pattern = re.compile(r'([\\`*_\[\]<>|~])')
+
+
+def escape_markdown(string: str) -> str:
+    """
+    escape characters which have meaning in inline markdown.
+
+    :param string:
+    :return: str
+    """
+    return _markdown_escape_pattern.sub(r'\\\1', string)
+
+
+def from_rich_text_to_markdown(element: Dict[str, Any]) -> str:
+    """
+    convert an element of 'rich text array' to markdown with annotations and link.
+    'underline' and 'color' have no markdown syntax and are dropped.
+
+    :param element: {'type': 'text', 'plain_text': ..., 'annotations': {...}, 'href': ...}
+    :return: str
+    """
+    plain_text: str = element.get('plain_text', '').replace(u'\xa0', u' ')
+    annotations: Dict[str, Any] = element.get('annotations') or {}
+    if element.get('type') == 'equation':
+        return f"${element['equation']['expression']}$"
+    if not plain_text.strip():
+        return plain_text
+
+    # spaces are kept outside of markers. ('** bold**' is not bold)
+    stripped = plain_text.strip()
+    leading = plain_text[:len(plain_text) - len(plain_text.lstrip())]
+    trailing = plain_text[len(plain_text.rstrip()):]
+    if annotations.get('code'):
+        text = f'`` {stripped} ``' if '`' in stripped else f'`{stripped}`'
+    else:
+        text = escape_markdown(stripped)
+    if annotations.get('bold'):
+        text = f'**{text}**'
+    if annotations.get('italic'):
+        text = f'*{text}*'
+    if annotations.get('strikethrough'):
+        text = f'~~{text}~~'
+
+    href = element.get('href') or ((element.get('text') or {}).get('link') or {}).get('url')
+    if href:
+        text = f'[{text}]({href})'
+    return leading + text + trailing
+
+
+def from_rich_text_array_to_markdown(array: List[Dict[str, Any]]) -> str:
+    """
+    convert 'rich text array' to markdown.
+
+    :param array: rich text array
+    :return: str
+    """
+    return ''.join(from_rich_text_to_markdown(e) for e in array)
+
+
 def parse_date_object(date_obj: Dict[str, Any]) -> str:
     """
     parse date object to string format.
@@ -33,6 +95,33 @@ def parse_date_object(date_obj: Dict[str, Any]) -> str:
     return content
 
 
+_iso_time_pattern = re.compile(r'(\d{4}-\d{2}-\d{2})T(\d{2}):(\d{2})(?::(\d{2})(?:\.(\d+))?)?(Z|[+-]\d{2}:?\d{2})?$')
+
+
+def normalize_iso_time(value: str) -> str:
+    """
+    normalize ISO 8601 string to UTC 'YYYY-MM-DDTHH:MM:SS.fffZ' so that times could be compared as strings.
+    'date' only value ('2021-05-10') and value without timezone are returned as it is (except the format).
+
+    :param value: '2021-05-10', '2021-10-15T12:00:00-07:00', '2022-01-01T00:00:00.000Z'...
+    :return: str
+    """
+    matched = _iso_time_pattern.match(value)
+    if not matched:
+        return value
+    date, hour, minute, second, fraction, zone = matched.groups()
+    fraction = (fraction or '').ljust(6, '0')[:6]
+    time = datetime.datetime.strptime(f'{date}T{hour}:{minute}:{second or "00"}.{fraction}', '%Y-%m-%dT%H:%M:%S.%f')
+    suffix = ''
+    if zone:
+        if zone != 'Z':
+            sign = -1 if zone[0] == '-' else 1
+            digits = zone[1:].replace(':', '')
+            time -= sign * datetime.timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+        suffix = 'Z'
+    return time.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + suffix
+
+
 def from_plain_text_to_rich_text_array(string: str, link: Any = '') -> List[Dict[str, Any]]:
     content = {"content": string}
     if link != '':
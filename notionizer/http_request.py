@@ -3,15 +3,27 @@ HTTP REQUEST
 
 managing request
 
+'HttpRequest' sends requests through a 'Transport' (see 'transport.py'). The default 'SessionTransport' owns a
+'requests.Session' with a pooled 'HTTPAdapter'. Every object created from the same 'Notion' instance shares the same
+'HttpRequest', so TCP and TLS connections are kept alive and reused across calls.
+
+Outgoing calls are paced by 'RequestScheduler'. It holds a token bucket tuned for the Notion rate limit
+(about 3 requests per second per integration), honours 'Retry-After' and retries '429', '502', '503' and '504'
+responses with jittered exponential backoff.
+
 """
 
-import requests  # type: ignore
 import json
 import logging
+import random
+import threading
+import time
 
 from notionizer import settings
+from notionizer.transport import SessionTransport
+from notionizer.transport import Transport
 
-from typing import Dict, Any, Tuple, TypeVar
+from typing import Dict, Any, Tuple, TypeVar, Optional
 
 _logger = logging.getLogger(__name__)
 
@@ -23,16 +35,215 @@ class HttpRequestError(Exception):
 T_HttpRequest = TypeVar('T_HttpRequest', bound='HttpRequest')
 
 
+class TokenBucket:
+    """
+    Thread safe token bucket. 'rate' tokens are refilled per second up to 'capacity'.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+
+        :param rate: tokens per second
+        :param capacity: maximum burst size
+        """
+        assert 0 < rate, "'rate' should be positive"
+        assert 1 <= capacity, "'capacity' should be at least 1"
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        # '_updated' could be in the future while the bucket is blocked.
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self._updated < now:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """
+        take one token and return the seconds which caller should wait before using it.
+        :return: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            return max(0.0, self._updated - now) + max(0.0, -self._tokens) / self.rate
+
+    def try_reserve(self) -> float:
+        """
+        take one token only if it is available now.
+        :return: 0 if taken, otherwise seconds until a token is available
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._updated or self._tokens < 1:
+                return max(0.0, self._updated - now) + (1 - self._tokens) / self.rate
+            self._tokens -= 1
+            return 0.0
+
+    def block(self, seconds: float) -> None:
+        """
+        stop handing out tokens for 'seconds'. (ex: 'Retry-After' of '429' response)
+        :param seconds:
+        :return: None
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._updated = max(self._updated, now + seconds)
+            # restart with an empty bucket so that the burst does not trip the limit again.
+            self._tokens = min(self._tokens, 0.0)
+
+
+class RequestScheduler:
+    """
+    'RequestScheduler' paces requests of 'HttpRequest' and decides retry delays.
+
+    Counters:
+        requests: number of sent requests (including retries)
+        waits: number of times a request waited for a token
+        retries: number of retried requests
+        throttled_time: seconds spent waiting for tokens and retry delays
+
+    '429' means the request was not processed, so it is retried for every method. A gateway error could come after
+    a write was applied, so '5xx' is retried only for requests without side effects ('GET', 'DELETE' and queries),
+    unless 'retry_writes' is True.
+    """
+
+    RETRY_STATUS = (429, 502, 503, 504)
+    THROTTLED_STATUS = 429
+    IDEMPOTENT_METHODS = ('GET', 'DELETE')
+
+    def __init__(self, rate: float = settings.RATE_LIMIT, burst: float = settings.RATE_BURST,
+                 max_retries: int = settings.MAX_RETRIES, backoff_base: float = settings.BACKOFF_BASE,
+                 backoff_max: float = settings.BACKOFF_MAX, retry_writes: bool = False):
+        """
+
+        :param rate: requests per second
+        :param burst: maximum number of requests sent without waiting
+        :param max_retries: retry count before raising 'HttpRequestError'
+        :param backoff_base: seconds of the first backoff
+        :param backoff_max: upper bound of backoff seconds
+        :param retry_writes: retry 'POST' and 'PATCH' on gateway errors as well. (could create duplicates)
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_writes = retry_writes
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.waits = 0
+        self.retries = 0
+        self.throttled_time = 0.0
+
+    def acquire(self) -> None:
+        """
+        wait until a request is allowed.
+        :return: None
+        """
+        delay = self.bucket.reserve()
+        with self._lock:
+            self.requests += 1
+            if 0 < delay:
+                self.waits += 1
+                self.throttled_time += delay
+        if 0 < delay:
+            time.sleep(delay)
+
+    def should_retry(self, status_code: int, attempt: int, method: str, url: str = '') -> bool:
+        """
+        :param status_code: status of response
+        :param attempt: 0 for the first retry
+        :param method: 'GET', 'POST', 'PATCH' or 'DELETE'
+        :param url: url of request
+        :return: bool
+        """
+        if status_code not in self.RETRY_STATUS or self.max_retries <= attempt:
+            return False
+        if status_code == self.THROTTLED_STATUS or method in self.IDEMPOTENT_METHODS or self.retry_writes:
+            return True
+        # query is sent by 'POST' but has no side effect.
+        return method == 'POST' and url.split('?')[0].endswith('/query')
+
+    def retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        seconds to wait before retrying. 'Retry-After' header wins over exponential backoff.
+
+        :param attempt: 0 for the first retry
+        :param retry_after: value of 'Retry-After' header
+        :return: float
+        """
+        backoff = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        delay = random.uniform(backoff / 2, backoff)
+        if retry_after:
+            try:
+                delay = float(retry_after) + random.uniform(0, self.backoff_base)
+            except ValueError:
+                pass
+        return delay
+
+    def wait_retry(self, attempt: int, status_code: int, retry_after: Optional[str] = None) -> None:
+        """
+        sleep before retrying. '429' blocks the bucket so that other threads slow down as well.
+        :return: None
+        """
+        delay = self.retry_delay(attempt, retry_after)
+        _logger.info(f"retry after {delay:.2f}s: status {status_code} (attempt {attempt + 1})")
+        with self._lock:
+            self.retries += 1
+            self.throttled_time += delay
+        if status_code == 429:
+            self.bucket.block(delay)
+        time.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        return counters.
+        :return: {'requests': int, 'waits': int, 'retries': int, 'throttled_time': float}
+        """
+        with self._lock:
+            return {'requests': self.requests, 'waits': self.waits, 'retries': self.retries,
+                    'throttled_time': self.throttled_time}
+
+
 class HttpRequest:
 
-    def __init__(self, secret_key: str, timeout: int = 15):
+    def __init__(self, secret_key: str, timeout: int = 15,
+                 pool_connections: int = settings.POOL_CONNECTIONS,
+                 pool_maxsize: int = settings.POOL_MAXSIZE,
+                 pool_block: bool = settings.POOL_BLOCK,
+                 scheduler: Optional[RequestScheduler] = None,
+                 transport: Optional[Transport] = None):
+        """
+
+        :param secret_key: notion api key
+        :param timeout: seconds
+        :param pool_connections: number of host pools to cache
+        :param pool_maxsize: maximum number of keep-alive connections saved in each host pool
+        :param pool_block: if True, 'pool_maxsize' becomes a hard per-host limit and requests wait for a free
+            connection instead of opening a new one.
+        :param scheduler: 'RequestScheduler' (default: new one with 'settings' values)
+        :param transport: 'Transport' (default: 'SessionTransport' with 'pool_*' values)
+        """
         self.base_url = settings.BASE_URL
-        self.__headers = {
-            'Authorization': 'Bearer ' + secret_key,
-            'Content-Type': 'application/json',
-            'Notion-Version': settings.NOTION_VERSION
-        }
         self.timeout = timeout
+        self.scheduler: RequestScheduler = scheduler if scheduler else RequestScheduler()
+        if transport is None:
+            transport = SessionTransport(secret_key, pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                         pool_block=pool_block)
+        self.transport: Transport = transport
+
+    def close(self) -> None:
+        """
+        close pooled connections.
+        :return: None
+        """
+        self.transport.close()
 
     def post(self: T_HttpRequest, url: str, payload: Dict[str, Any]) -> Tuple[T_HttpRequest, Dict[str, Any]]:
         return self._request('POST', url, payload)
@@ -43,11 +254,14 @@ class HttpRequest:
     def patch(self: T_HttpRequest, url: str, payload: Dict[str, Any]) -> Tuple[T_HttpRequest, Dict[str, Any]]:
         return self._request('PATCH', url, payload)
 
+    def delete(self: T_HttpRequest, url: str) -> Tuple[T_HttpRequest, Dict[str, Any]]:
+        return self._request('DELETE', url, {})
+
     def _request(self: T_HttpRequest, request_type: str, url: str, payload: Dict[str, Any]) -> Tuple[T_HttpRequest,
                                                                                                      Dict[str, Any]]:
         """
 
-        :param request_type: 'POST' or 'GET'
+        :param request_type: 'GET', 'POST', 'PATCH' or 'DELETE'
         :param url: fully assembled url
         :param payload:
         :return: python data type object(dictionay and list)
@@ -58,10 +272,21 @@ class HttpRequest:
         if payload:
             payload_json = json.dumps(payload)
         request_url: str = self.base_url + url
-        result_json: str = requests.request(request_type, request_url, headers=self.__headers,
-                                            data=payload_json, timeout=self.timeout).text
 
-        result: Dict[str, Any] = json.loads(result_json)
+        attempt = 0
+        while True:
+            self.scheduler.acquire()
+            response = self.transport.send(request_type, request_url, payload_json, self.timeout)
+            if not self.scheduler.should_retry(response.status_code, attempt, request_type, url):
+                break
+            self.scheduler.wait_retry(attempt, response.status_code, response.headers.get('Retry-After'))
+            attempt += 1
+
+        try:
+            result: Dict[str, Any] = json.loads(response.text)
+        except ValueError:
+            raise HttpRequestError(f'[{response.status_code}] invalid response: {response.text[:200]!r}, '
+                                   f'{payload} from: {request_url}')
         _logger.debug(f"result: {result}")
         if result['object'] == 'error':
             status = result['status']
@@ -0,0 +1,177 @@
+"""
+Instance Cache
+
+Identity map of 'NotionUpdateObject'. It maps 'id' of notion object to the python instance so that '_update' can
+refresh the instance in place.
+
+- WeakInstanceCache: (default) keeps instances only while the user holds them.
+- LRUInstanceCache: keeps strong references with 'max_size' and 'ttl' bounds.
+
+[Usage]
+
+from notionizer import LRUInstanceCache, set_instance_cache
+set_instance_cache(LRUInstanceCache(max_size=10000, ttl=600))
+"""
+
+import collections
+import threading
+import time
+import weakref
+
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+_log = __import__('logging').getLogger(__name__)
+
+
+class InstanceCache:
+    """
+    Base class of identity map. Subclasses implement '_get', '_set', '_delete', '_live' and '_clear'.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        return cached instance or None.
+        :param key: id of notion object
+        :return: instance or None
+        """
+        with self._lock:
+            instance = self._get(key)
+            if instance is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return instance
+
+    def __getitem__(self, key: str) -> Any:
+        instance = self.get(key)
+        if instance is None:
+            raise KeyError(key)
+        return instance
+
+    def __setitem__(self, key: str, instance: Any) -> None:
+        with self._lock:
+            self._set(key, instance)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            self._delete(key)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._get(key) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._live()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        return counters of cache.
+        :return: {'hits': int, 'misses': int, 'evictions': int, 'live': int}
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'live': self._live()}
+
+    def _get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def _set(self, key: str, instance: Any) -> None:
+        raise NotImplementedError
+
+    def _delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def _live(self) -> int:
+        raise NotImplementedError
+
+    def _clear(self) -> None:
+        raise NotImplementedError
+
+
+class WeakInstanceCache(InstanceCache):
+    """
+    Identity map with weak references. Instance is evicted when it is garbage collected.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._refs: Dict[str, 'weakref.ref[Any]'] = dict()
+
+    def _on_collected(self, key: str, ref: 'weakref.ref[Any]') -> None:
+        with self._lock:
+            if self._refs.get(key) is ref:
+                del self._refs[key]
+                self.evictions += 1
+
+    def _get(self, key: str) -> Optional[Any]:
+        ref = self._refs.get(key)
+        return ref() if ref else None
+
+    def _set(self, key: str, instance: Any) -> None:
+        self._refs[key] = weakref.ref(instance, lambda ref, key=key: self._on_collected(key, ref))
+
+    def _delete(self, key: str) -> None:
+        del self._refs[key]
+
+    def _live(self) -> int:
+        return len(self._refs)
+
+    def _clear(self) -> None:
+        self._refs.clear()
+
+
+class LRUInstanceCache(InstanceCache):
+    """
+    Identity map with strong references, bounded by 'max_size' (least recently used is evicted first) and 'ttl'.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = None) -> None:
+        """
+
+        :param max_size: maximum number of instances
+        :param ttl: seconds which an instance is kept after it is stored (default: None, no expiry)
+        """
+        assert 0 < max_size, "'max_size' should be positive"
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: 'collections.OrderedDict[str, Any]' = collections.OrderedDict()
+
+    def _get(self, key: str) -> Optional[Any]:
+        if key not in self._data:
+            return None
+        instance, stored = self._data[key]
+        if self.ttl is not None and self.ttl < time.monotonic() - stored:
+            del self._data[key]
+            self.evictions += 1
+            return None
+        self._data.move_to_end(key)
+        return instance
+
+    def _set(self, key: str, instance: Any) -> None:
+        self._data[key] = (instance, time.monotonic())
+        self._data.move_to_end(key)
+        while self.max_size < len(self._data):
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def _delete(self, key: str) -> None:
+        del self._data[key]
+
+    def _live(self) -> int:
+        return len(self._data)
+
+    def _clear(self) -> None:
+        self._data.clear()
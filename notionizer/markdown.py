@@ -0,0 +1,727 @@
+"""
+Markdown
+
+'MarkdownRenderer' writes markdown of blocks streamed by 'BlockWalker' in document order. Each block is written
+as soon as it arrives, so the block tree of a page is never held in memory.
+'MarkdownExporter' exports many pages concurrently.
+
+'MarkdownParser' converts markdown to block objects, which are uploaded with the chunked 'BlockAppender'.
+
+[Usage]
+
+with open('page.md', 'w') as f:
+    page.to_markdown(f)
+
+exporter = MarkdownExporter(notion._request, concurrency=4)
+for page, blocks, error in exporter.export(db.query('Name'), lambda page: open(f'{page.id}.md', 'w')):
+    if error:
+        print(page, error)
+
+page.append_markdown(open('page.md').read())
+"""
+
+import collections
+import concurrent.futures
+import re
+
+from typing import Any
+from typing import Callable
+from typing import ContextManager
+from typing import Deque
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+
+from notionizer import settings
+from notionizer.functions import escape_markdown
+from notionizer.functions import from_rich_text_array_to_markdown
+from notionizer.http_request import HttpRequest
+from notionizer.traversal import BlockWalker
+
+_log = __import__('logging').getLogger(__name__)
+
+LIST_TYPES = ('bulleted_list_item', 'numbered_list_item', 'to_do', 'toggle')
+HEADING_LEVELS = {'heading_1': 1, 'heading_2': 2, 'heading_3': 3}
+FILE_TYPES = ('image', 'video', 'file', 'pdf', 'audio')
+LINK_TYPES = ('bookmark', 'embed', 'link_preview')
+# blocks without content of their own. Children are written without indentation.
+CONTAINER_TYPES = ('column_list', 'column', 'synced_block', 'template', 'table_of_contents', 'breadcrumb',
+                   'unsupported')
+
+# start of line which would be read as a block. (ex: paragraph '# not heading')
+_block_start_pattern = re.compile(r'([#>+=-])|(\d+)([.)](?:\s|$))')
+
+
+def escape_block_start(line: str) -> str:
+    """
+    escape the start of line which would be read as heading, quote, list or rule.
+
+    :param line:
+    :return: str
+    """
+    matched = _block_start_pattern.match(line)
+    if not matched:
+        return line
+    if matched.group(1):
+        return '\\' + line
+    return matched.group(2) + '\\' + line[len(matched.group(2)):]
+
+
+def get_page_title(data: Dict[str, Any]) -> str:
+    """
+    markdown of 'title' property of page object.
+
+    :param data: page object
+    :return: str
+    """
+    for value in data.get('properties', {}).values():
+        if value.get('type') == 'title':
+            return from_rich_text_array_to_markdown(value['title'])
+    return ''
+
+
+class _Level:
+    """
+    the last block written at a depth.
+    """
+    __slots__ = ('type', 'number', 'child_prefix')
+
+    def __init__(self, block_type: str, number: int, child_prefix: str):
+        self.type = block_type
+        self.number = number
+        self.child_prefix = child_prefix
+
+
+class MarkdownRenderer:
+    """
+    write '(depth, raw block)' of depth-first traversal to 'stream' as markdown.
+    Children of list items are indented and children of quotes are quoted.
+    """
+
+    def __init__(self, stream: TextIO):
+        """
+
+        :param stream: text stream with 'write' method
+        """
+        self._stream = stream
+        self._levels: List[_Level] = list()
+        self._previous: Optional[str] = None
+        # number of written blocks
+        self.blocks = 0
+
+    def write_title(self, title: str) -> None:
+        """
+        write page title as the first heading.
+
+        :param title: markdown
+        :return: None
+        """
+        self._stream.write(f'# {title}\n')
+        self._previous = 'heading_1'
+
+    def feed(self, depth: int, block: Dict[str, Any]) -> None:
+        """
+        write a block. Blocks should be fed in document order.
+
+        :param depth: depth of block. direct children of the page have depth 1.
+        :param block: raw block object
+        :return: None
+        """
+        assert 0 < depth <= len(self._levels) + 1, f"block at depth {depth} is fed before its parent."
+        sibling = self._levels[depth - 1] if depth <= len(self._levels) else None
+        del self._levels[depth - 1:]
+        prefix = ''.join(level.child_prefix for level in self._levels)
+
+        block_type: str = block['type']
+        number = sibling.number + 1 if sibling and sibling.type == block_type else 1
+        marker, child_prefix, lines = self._render(block_type, block.get(block_type) or {}, number, block)
+        self._levels.append(_Level(block_type, number, child_prefix))
+        self.blocks += 1
+        if lines is None:
+            return
+
+        # rows of the same table are tight. a table right after another table is separated.
+        tight = (block_type in LIST_TYPES and self._previous in LIST_TYPES) or \
+                (block_type == 'table_row' and 1 < number)
+        if self._previous is not None and not tight:
+            self._stream.write(prefix.rstrip() + '\n')
+        continuation = prefix + (marker if marker.strip() == '>' else ' ' * len(marker))
+        for i, line in enumerate(lines):
+            head = prefix + marker if i == 0 else continuation
+            self._stream.write((head + line).rstrip(' ') + ('  ' if line.endswith('  ') else '') + '\n')
+        self._previous = block_type
+
+    @staticmethod
+    def _text(value: Dict[str, Any]) -> List[str]:
+        """
+        lines of 'rich_text'. Line breaks in text are written as hard breaks.
+        """
+        lines = [escape_block_start(line) for line in from_rich_text_array_to_markdown(
+            value.get('rich_text') or value.get('text') or []).split('\n')]
+        return [line + '  ' for line in lines[:-1]] + lines[-1:]
+
+    def _render(self, block_type: str, value: Dict[str, Any], number: int, block: Dict[str, Any]
+                ) -> Tuple[str, str, Optional[List[str]]]:
+        """
+        :return: (marker of the first line, prefix of children, lines or None if nothing is written)
+        """
+        if block_type == 'paragraph':
+            return '', '', self._text(value)
+        if block_type in HEADING_LEVELS:
+            return '#' * HEADING_LEVELS[block_type] + ' ', '', [' '.join(line.rstrip() for line in self._text(value))]
+        if block_type in ('bulleted_list_item', 'toggle'):
+            return '- ', '  ', self._text(value)
+        if block_type == 'numbered_list_item':
+            marker = f'{number}. '
+            return marker, ' ' * len(marker), self._text(value)
+        if block_type == 'to_do':
+            return ('- [x] ' if value.get('checked') else '- [ ] '), '  ', self._text(value)
+        if block_type in ('quote', 'callout'):
+            lines = self._text(value)
+            icon = value.get('icon') or {}
+            if icon.get('type') == 'emoji':
+                lines[0] = f"{icon['emoji']} {lines[0]}"
+            return '> ', '> ', lines
+        if block_type == 'code':
+            language = value.get('language') or ''
+            code = ''.join(e.get('plain_text', '') for e in value.get('rich_text') or [])
+            fence = '````' if '```' in code else '```'
+            return '', '', [fence + ('' if language == 'plain text' else language), *code.split('\n'), fence]
+        if block_type == 'equation':
+            return '', '', ['$$', value.get('expression', ''), '$$']
+        if block_type == 'divider':
+            return '', '', ['---']
+        if block_type in FILE_TYPES or block_type in LINK_TYPES:
+            url = value.get('url') or (value.get(value.get('type', '')) or {}).get('url', '')
+            caption = from_rich_text_array_to_markdown(value.get('caption') or []) or escape_markdown(
+                value.get('name') or url)
+            return '', '', [f"{'!' if block_type == 'image' else ''}[{caption}]({url})"]
+        if block_type in ('child_page', 'child_database'):
+            url = 'https://www.notion.so/' + block['id'].replace('-', '')
+            return '', '', [f"[{escape_markdown(value.get('title') or 'Untitled')}]({url})"]
+        if block_type == 'table':
+            return '', '', None
+        if block_type == 'table_row':
+            cells = [from_rich_text_array_to_markdown(cell).replace('\n', '<br>') for cell in value.get('cells', [])]
+            lines = ['| ' + ' | '.join(cells) + ' |']
+            if number == 1:
+                lines.append('|' + ' --- |' * len(cells))
+            return '', '', lines
+        if block_type not in CONTAINER_TYPES:
+            _log.debug(f"'{block_type}' block is not written in markdown.")
+        return '', '', None
+
+
+class MarkdownExporter:
+    """
+    export pages to markdown streams. Blocks of each page are walked with 'BlockWalker' and written as they
+    arrive; up to 'concurrency' pages are exported at once.
+    """
+
+    def __init__(self, request: HttpRequest, concurrency: int = settings.MARKDOWN_CONCURRENCY,
+                 block_concurrency: int = settings.BLOCK_CONCURRENCY, title: bool = True):
+        """
+
+        :param request: HttpRequest
+        :param concurrency: maximum number of pages exported at once
+        :param block_concurrency: maximum number of concurrent children requests of each page
+        :param title: write page title as the first heading
+        """
+        assert 0 < concurrency, "'concurrency' should be positive"
+        self._request = request
+        self.concurrency = concurrency
+        self.block_concurrency = block_concurrency
+        self.title = title
+
+    def write(self, page: Any, stream: TextIO) -> int:
+        """
+        write markdown of a page.
+
+        :param page: 'Page', raw page object or page id (title is not written)
+        :param stream: text stream with 'write' method
+        :return: number of written blocks
+        """
+        data: Dict[str, Any] = getattr(page, '_raw_data', page) if not isinstance(page, str) else {'id': page}
+        renderer = MarkdownRenderer(stream)
+        if self.title and 'properties' in data:
+            renderer.write_title(get_page_title(data))
+        walker = BlockWalker(self._request, concurrency=self.block_concurrency)
+        for depth, block in walker.walk(str(data['id'])):
+            renderer.feed(depth, block)
+        return renderer.blocks
+
+    def _export(self, page: Any, open_stream: Callable[[Any], ContextManager[TextIO]]) -> int:
+        with open_stream(page) as stream:
+            return self.write(page, stream)
+
+    def export(self, pages: Iterable[Any], open_stream: Callable[[Any], ContextManager[TextIO]]
+               ) -> Iterator[Tuple[Any, int, Optional[Exception]]]:
+        """
+        export pages concurrently. Results are yielded in input order and a failed page does not stop others.
+
+        :param pages: 'Page', raw page objects or page ids
+        :param open_stream: function which opens a stream of the page. The stream is closed after the page.
+            (ex: lambda page: open(f'{page.id}.md', 'w'))
+        :return: Iterator[(page, number of written blocks, error or None)]
+        """
+        pending: Deque[Tuple[Any, 'concurrent.futures.Future[int]']] = collections.deque()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency,
+                                                         thread_name_prefix='notionizer-markdown')
+
+        def resolve(page: Any, future: 'concurrent.futures.Future[int]') -> Tuple[Any, int, Optional[Exception]]:
+            try:
+                return page, future.result(), None
+            except Exception as e:
+                _log.info(f"markdown export of {page} failed: {e}")
+                return page, 0, e
+
+        try:
+            for page in pages:
+                pending.append((page, executor.submit(self._export, page, open_stream)))
+                while 2 * self.concurrency <= len(pending):
+                    yield resolve(*pending.popleft())
+            while pending:
+                yield resolve(*pending.popleft())
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+
+# 'language' of code block accepted by notion api. Other languages are imported as 'plain text'.
+CODE_LANGUAGES = (
+    'abap', 'arduino', 'bash', 'basic', 'c', 'clojure', 'coffeescript', 'c++', 'c#', 'css', 'dart', 'diff', 'docker',
+    'elixir', 'elm', 'erlang', 'flow', 'fortran', 'f#', 'gherkin', 'glsl', 'go', 'graphql', 'groovy', 'haskell',
+    'html', 'java', 'javascript', 'json', 'julia', 'kotlin', 'latex', 'less', 'lisp', 'livescript', 'lua',
+    'makefile', 'markdown', 'markup', 'matlab', 'mermaid', 'nix', 'objective-c', 'ocaml', 'pascal', 'perl', 'php',
+    'plain text', 'powershell', 'prolog', 'protobuf', 'python', 'r', 'reason', 'ruby', 'rust', 'sass', 'scala',
+    'scheme', 'scss', 'shell', 'sql', 'swift', 'typescript', 'vb.net', 'verilog', 'vhdl', 'visual basic',
+    'webassembly', 'xml', 'yaml', 'java/c/c++/c#',
+)
+CODE_LANGUAGE_ALIASES = {
+    'py': 'python', 'js': 'javascript', 'ts': 'typescript', 'sh': 'shell', 'zsh': 'shell', 'yml': 'yaml',
+    'md': 'markdown', 'cpp': 'c++', 'cs': 'c#', 'csharp': 'c#', 'rb': 'ruby', 'rs': 'rust', 'kt': 'kotlin',
+    'dockerfile': 'docker', 'tex': 'latex', 'objc': 'objective-c', 'text': 'plain text', 'txt': 'plain text',
+}
+
+_fence_pattern = re.compile(r'(`{3,}|~{3,})\s*([^`\s]*)')
+_heading_pattern = re.compile(r'(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+_rule_pattern = re.compile(r'([-*_])(?:[ \t]*\1){2,}[ \t]*$')
+_list_pattern = re.compile(r'([-*+]|\d{1,9}[.)])([ \t]+|$)')
+_todo_pattern = re.compile(r'\[([ xX])\](?:[ \t]+|$)')
+_table_separator_pattern = re.compile(r'\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)*\|?[ \t]*$')
+_table_cell_pattern = re.compile(r'(?<!\\)\|')
+_equation_pattern = re.compile(r'\$\$(.+)\$\$[ \t]*$')
+_image_pattern = re.compile(r'!\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)$')
+_autolink_pattern = re.compile(r'<(https?://[^>\s]+)>')
+_br_pattern = re.compile(r'<br\s*/?>', re.IGNORECASE)
+
+_punctuation = frozenset('!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~')
+# (delimiter, annotation) tried in order at each position
+_emphasis_delimiters = (('**', 'bold'), ('__', 'bold'), ('~~', 'strikethrough'), ('*', 'italic'), ('_', 'italic'))
+
+T_Segment = Tuple[str, Tuple[str, ...], Optional[str]]
+
+
+def get_code_language(language: str) -> str:
+    """
+    notion 'language' of code block from info string of fenced code.
+
+    :param language: ex: 'py'
+    :return: ex: 'python'
+    """
+    language = CODE_LANGUAGE_ALIASES.get(language.lower(), language.lower())
+    return language if language in CODE_LANGUAGES else 'plain text'
+
+
+def split_rich_text(segments: Iterable[T_Segment], max_length: int = settings.RICH_TEXT_MAX_LENGTH
+                    ) -> List[Dict[str, Any]]:
+    """
+    rich text array of '(content, annotations, link)'. Content is split within 'max_length' of rich text object.
+
+    :param segments: [(content, ('bold', ...), url or None), ...]
+    :param max_length: maximum length of 'text.content'
+    :return: rich text array
+    """
+    array: List[Dict[str, Any]] = list()
+    for content, annotations, link in segments:
+        for start in range(0, len(content), max_length):
+            element: Dict[str, Any] = {'type': 'text', 'text': {'content': content[start:start + max_length]}}
+            if link:
+                element['text']['link'] = {'url': link}
+            if annotations:
+                element['annotations'] = {name: True for name in annotations}
+            array.append(element)
+    return array
+
+
+def _skip_code_span(text: str, start: int) -> int:
+    """
+    index after the code span at 'start', or -1 if the backticks are not closed.
+    """
+    run = len(text[start:]) - len(text[start:].lstrip('`'))
+    i = start + run
+    while True:
+        end = text.find('`' * run, i)
+        if end == -1:
+            return -1
+        i = len(text) - len(text[end:].lstrip('`'))
+        # closing backticks should be the same length.
+        if i - end == run:
+            return i
+
+
+def _find_closing(text: str, start: int, delimiter: str) -> int:
+    """
+    index of the delimiter which closes emphasis opened before 'start', or -1.
+    """
+    i = start
+    while i < len(text):
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '`':
+            end = _skip_code_span(text, i)
+            i = end if end != -1 else i + 1
+            continue
+        if len(delimiter) == 1 and text.startswith(delimiter * 2, i):
+            # nested strong emphasis. (ex: *italic **bold** italic*)
+            end = _find_closing(text, i + 2, delimiter * 2)
+            i = end + 2 if end != -1 else i + 2
+            continue
+        if text.startswith(delimiter, i) and i > start and not text[i - 1].isspace():
+            after = text[i + len(delimiter):i + len(delimiter) + 1]
+            if delimiter[0] != '_' or not after.isalnum():
+                return i
+        i += 1
+    return -1
+
+
+def _find_link(text: str, start: int) -> Optional[Tuple[str, str, int]]:
+    """
+    '[label](url)' at 'start'.
+
+    :return: (label, url, index after link) or None
+    """
+    depth = 0
+    i = start
+    while i < len(text):
+        if text[i] == '\\':
+            i += 2
+            continue
+        if text[i] == '[':
+            depth += 1
+        elif text[i] == ']':
+            depth -= 1
+            if depth == 0:
+                break
+        i += 1
+    else:
+        return None
+    if text[i + 1:i + 2] != '(':
+        return None
+    end = text.find(')', i + 2)
+    if end == -1:
+        return None
+    target = text[i + 2:end].strip().split()
+    if not target:
+        return None
+    return text[start + 1:i], target[0].strip('<>'), end + 1
+
+
+def _parse_inline(text: str, annotations: Tuple[str, ...], link: Optional[str], segments: List[T_Segment]) -> None:
+    buffer: List[str] = list()
+
+    def flush() -> None:
+        if buffer:
+            segments.append((''.join(buffer), annotations, link))
+            buffer.clear()
+
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c == '\\' and text[i + 1:i + 2] in _punctuation:
+            buffer.append(text[i + 1])
+            i += 2
+            continue
+        if c == '`':
+            end = _skip_code_span(text, i)
+            if end != -1:
+                run = len(text[i:]) - len(text[i:].lstrip('`'))
+                code = text[i + run:end - run]
+                if code.startswith(' ') and code.endswith(' ') and code.strip():
+                    code = code[1:-1]
+                flush()
+                segments.append((code, annotations + ('code',), link))
+                i = end
+                continue
+        if c == '<':
+            matched = _autolink_pattern.match(text, i)
+            if matched:
+                flush()
+                segments.append((matched.group(1), annotations, matched.group(1)))
+                i = matched.end()
+                continue
+        if c == '[' or (c == '!' and text[i + 1:i + 2] == '['):
+            found = _find_link(text, i + (c == '!'))
+            if found and not link:
+                label, url, end = found
+                flush()
+                _parse_inline(label, annotations, url, segments)
+                i = end
+                continue
+        matched = False
+        for delimiter, name in _emphasis_delimiters:
+            if not text.startswith(delimiter, i) or name in annotations:
+                continue
+            start = i + len(delimiter)
+            if delimiter[0] == '_' and 0 < i and text[i - 1].isalnum():
+                continue
+            end = _find_closing(text, start, delimiter)
+            if end != -1 and not text[start].isspace():
+                flush()
+                _parse_inline(text[start:end], annotations + (name,), link, segments)
+                i = end + len(delimiter)
+                matched = True
+                break
+        if not matched:
+            buffer.append(c)
+            i += 1
+    flush()
+
+
+def from_markdown_to_rich_text_array(text: str) -> List[Dict[str, Any]]:
+    """
+    convert inline markdown to 'rich text array': emphasis, strikethrough, code, links and backslash escapes.
+
+    :param text: inline markdown
+    :return: rich text array
+    """
+    segments: List[T_Segment] = list()
+    _parse_inline(text, (), None, segments)
+    merged: List[T_Segment] = list()
+    for content, annotations, link in segments:
+        if merged and merged[-1][1:] == (annotations, link):
+            merged[-1] = (merged[-1][0] + content, annotations, link)
+        elif content:
+            merged.append((content, annotations, link))
+    return split_rich_text(merged)
+
+
+class MarkdownParser:
+    """
+    convert markdown to block objects for 'BlockAppender': headings, paragraphs, bulleted, numbered and to-do
+    lists with nesting, fenced code, quotes, tables, dividers, equations and images.
+    Headings deeper than 3 are 'heading_3'.
+    """
+
+    def parse(self, markdown: str) -> List[Dict[str, Any]]:
+        """
+
+        :param markdown: markdown document
+        :return: block objects. Nested blocks are in 'children' of the type object.
+        """
+        return self._parse_blocks(markdown.expandtabs(4).splitlines())
+
+    @staticmethod
+    def _is_block_start(line: str) -> bool:
+        return bool(_fence_pattern.match(line) or _heading_pattern.match(line) or _rule_pattern.match(line) or
+                    _list_pattern.match(line) or line.startswith('>') or line.rstrip() == '$$' or
+                    _equation_pattern.match(line))
+
+    def _parse_blocks(self, lines: List[str]) -> List[Dict[str, Any]]:
+        blocks: List[Dict[str, Any]] = list()
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            indent = len(line) - len(line.lstrip(' '))
+            text = line.lstrip(' ') if indent < 4 else line
+            if not text.strip():
+                i += 1
+                continue
+            if _fence_pattern.match(text):
+                i = self._parse_code(lines, i, indent, blocks)
+            elif text.rstrip() == '$$' or _equation_pattern.match(text):
+                i = self._parse_equation(lines, i, blocks)
+            elif _heading_pattern.match(text):
+                matched = _heading_pattern.match(text)
+                level = min(3, len(matched.group(1)))
+                blocks.extend(self._text_blocks(f'heading_{level}', matched.group(2) or ''))
+                i += 1
+            elif _rule_pattern.match(text):
+                blocks.append({'type': 'divider', 'divider': {}})
+                i += 1
+            elif _list_pattern.match(text):
+                i = self._parse_list_item(lines, i, indent, blocks)
+            elif text.startswith('>'):
+                i = self._parse_quote(lines, i, blocks)
+            elif '|' in text and i + 1 < len(lines) and '-' in lines[i + 1] and \
+                    _table_separator_pattern.match(lines[i + 1].strip()):
+                i = self._parse_table(lines, i, blocks)
+            else:
+                i = self._parse_paragraph(lines, i, blocks)
+        return blocks
+
+    def _text_blocks(self, block_type: str, text: str, children: Optional[List[Dict[str, Any]]] = None,
+                     rich_text: Optional[List[Dict[str, Any]]] = None, **value: Any) -> List[Dict[str, Any]]:
+        """
+        blocks with rich text. Rich text over 'RICH_TEXT_MAX_ELEMENTS' is continued in following blocks of the
+        same type, and 'children' are added to the last one.
+        """
+        if rich_text is None:
+            rich_text = from_markdown_to_rich_text_array(text)
+        size = settings.RICH_TEXT_MAX_ELEMENTS
+        blocks: List[Dict[str, Any]] = list()
+        for start in range(0, max(1, len(rich_text)), size):
+            blocks.append({'type': block_type, block_type: dict(value, rich_text=rich_text[start:start + size])})
+        if children:
+            blocks[-1][block_type]['children'] = children
+        return blocks
+
+    def _container_blocks(self, block_type: str, lines: List[str], **value: Any) -> List[Dict[str, Any]]:
+        """
+        blocks of list item or quote. The first paragraph is the text and the others are children.
+        """
+        children = self._parse_blocks(lines)
+        rich_text: List[Dict[str, Any]] = list()
+        if children and children[0]['type'] == 'paragraph':
+            rich_text = children.pop(0)['paragraph']['rich_text']
+        return self._text_blocks(block_type, '', children=children, rich_text=rich_text, **value)
+
+    def _parse_paragraph(self, lines: List[str], i: int, blocks: List[Dict[str, Any]]) -> int:
+        text = ''
+        while i < len(lines) and lines[i].strip():
+            line = lines[i].lstrip(' ')
+            if text and self._is_block_start(line):
+                break
+            if text.endswith('  ') or text.endswith('\\'):
+                # two spaces or backslash at the end is a hard line break.
+                text = text.rstrip(' ').rstrip('\\') + '\n'
+            elif text:
+                text = text.rstrip(' ') + ' '
+            text += line
+            i += 1
+        text = text.rstrip()
+        matched = _image_pattern.match(text)
+        if matched:
+            image: Dict[str, Any] = {'type': 'external', 'external': {'url': matched.group(2)}}
+            if matched.group(1):
+                image['caption'] = from_markdown_to_rich_text_array(matched.group(1))
+            blocks.append({'type': 'image', 'image': image})
+        else:
+            blocks.extend(self._text_blocks('paragraph', text))
+        return i
+
+    def _parse_code(self, lines: List[str], i: int, indent: int, blocks: List[Dict[str, Any]]) -> int:
+        matched = _fence_pattern.match(lines[i].lstrip(' '))
+        fence, language = matched.group(1), matched.group(2)
+        code: List[str] = list()
+        i += 1
+        while i < len(lines):
+            line = lines[i]
+            stripped = line.strip()
+            if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                i += 1
+                break
+            code.append(line[min(indent, len(line) - len(line.lstrip(' '))):])
+            i += 1
+        rich_text = split_rich_text([('\n'.join(code), (), None)])
+        blocks.extend(self._text_blocks('code', '', rich_text=rich_text, language=get_code_language(language)))
+        return i
+
+    def _parse_equation(self, lines: List[str], i: int, blocks: List[Dict[str, Any]]) -> int:
+        matched = _equation_pattern.match(lines[i].strip())
+        if matched:
+            blocks.append({'type': 'equation', 'equation': {'expression': matched.group(1).strip()}})
+            return i + 1
+        expression: List[str] = list()
+        i += 1
+        while i < len(lines) and lines[i].strip() != '$$':
+            expression.append(lines[i])
+            i += 1
+        blocks.append({'type': 'equation', 'equation': {'expression': '\n'.join(expression)}})
+        return i + 1
+
+    def _parse_list_item(self, lines: List[str], i: int, indent: int, blocks: List[Dict[str, Any]]) -> int:
+        text = lines[i][indent:]
+        matched = _list_pattern.match(text)
+        marker, spacing = matched.group(1), matched.group(2)
+        column = indent + len(marker) + (len(spacing) if 0 < len(spacing) <= 4 else 1)
+        item_lines = [text[len(marker) + len(spacing):]]
+        i += 1
+        while i < len(lines):
+            line = lines[i]
+            if not line.strip():
+                item_lines.append('')
+            elif column <= len(line) - len(line.lstrip(' ')):
+                item_lines.append(line[column:])
+            elif item_lines[-1].strip() and not self._is_block_start(line.lstrip(' ')):
+                # lazy continuation of paragraph
+                item_lines.append(line.lstrip(' '))
+            else:
+                break
+            i += 1
+        while not item_lines[-1].strip() and 1 < len(item_lines):
+            item_lines.pop()
+
+        value: Dict[str, Any] = dict()
+        if marker[0].isdigit():
+            block_type = 'numbered_list_item'
+        else:
+            block_type = 'bulleted_list_item'
+            todo = _todo_pattern.match(item_lines[0])
+            if todo:
+                block_type = 'to_do'
+                value['checked'] = todo.group(1) != ' '
+                item_lines[0] = item_lines[0][todo.end():]
+        blocks.extend(self._container_blocks(block_type, item_lines, **value))
+        return i
+
+    def _parse_quote(self, lines: List[str], i: int, blocks: List[Dict[str, Any]]) -> int:
+        quote_lines: List[str] = list()
+        while i < len(lines):
+            line = lines[i].lstrip(' ')
+            if line.startswith('>'):
+                quote_lines.append(line[2:] if line.startswith('> ') else line[1:])
+            elif line.strip() and quote_lines[-1].strip() and not self._is_block_start(line):
+                quote_lines.append(line)
+            else:
+                break
+            i += 1
+        blocks.extend(self._container_blocks('quote', quote_lines))
+        return i
+
+    def _parse_table(self, lines: List[str], i: int, blocks: List[Dict[str, Any]]) -> int:
+        def cells(line: str) -> List[str]:
+            line = line.strip()
+            line = line[1:] if line.startswith('|') else line
+            line = line[:-1] if line.endswith('|') and not line.endswith('\\|') else line
+            return [_br_pattern.sub('\n', cell.strip()) for cell in _table_cell_pattern.split(line)]
+
+        header = cells(lines[i])
+        width = len(header)
+        rows = [header]
+        i += 2
+        while i < len(lines) and lines[i].strip() and '|' in lines[i]:
+            rows.append((cells(lines[i]) + [''] * width)[:width])
+            i += 1
+        table_rows = [{'type': 'table_row', 'table_row': {'cells': [from_markdown_to_rich_text_array(cell)
+                                                                    for cell in row]}} for row in rows]
+        blocks.append({'type': 'table', 'table': {'table_width': width, 'has_column_header': True,
+                                                  'has_row_header': False, 'children': table_rows}})
+        return i
+
+
+def markdown_to_blocks(markdown: str) -> List[Dict[str, Any]]:
+    """
+    convert markdown to block objects. See 'MarkdownParser'.
+
+    :param markdown: markdown document
+    :return: block objects for 'Page.append_blocks'
+    """
+    return MarkdownParser().parse(markdown)
@@ -0,0 +1,414 @@
+"""
+Database Mirror
+
+'DatabaseMirror' materializes pages of databases into a local SQLite file and answers 'Database.query' expressions
+(or 'filter' objects) without requests.
+
+- one table per database. Properties are typed columns derived from the property types of the schema and the raw
+  page object is kept to return the same 'Page' or raw dict as 'Database.query'.
+- 'sync' is incremental (see 'notionizer.sync'). 'SyncState' is saved in the same file, so a mirror opened again
+  requests only pages edited since the last run. If the schema of database changes, the table is built again.
+- archived (deleted) pages are not returned by the api, so they stay in the mirror until it is rebuilt.
+
+Filters have the same semantics as 'FilterEvaluator' (see 'notionizer.evaluator').
+Relative date operators ('past_week'...), 'formula' and 'rollup' filters are not supported.
+
+[Usage]
+
+mirror = DatabaseMirror('notion.sqlite3')
+mirror.sync(database)
+for page in mirror.query(database, 'not Done'):
+    ...
+for row in mirror.query_values(database, 'Status', ['Name', 'Status']):
+    ...
+"""
+
+import json
+import sqlite3
+import threading
+
+import notionizer.decoder
+import notionizer.evaluator
+import notionizer.functions
+import notionizer.query
+import notionizer.sync
+import notionizer.object_page
+
+from notionizer.exception import NotionApiQueoryException
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+_log = __import__('logging').getLogger(__name__)
+
+filter = notionizer.query.filter
+SyncState = notionizer.sync.SyncState
+SyncResult = notionizer.sync.SyncResult
+RowDecoder = notionizer.decoder.RowDecoder
+Page = notionizer.object_page.Page
+normalize_iso_time = notionizer.functions.normalize_iso_time
+get_filter_value = notionizer.evaluator.get_filter_value
+
+"""
+column types by property type ('database_properties_mapper' keys). Other types are saved as json text.
+"""
+SQLITE_TYPES: Dict[str, str] = {
+    'title': 'TEXT',
+    'text': 'TEXT',
+    'url': 'TEXT',
+    'email': 'TEXT',
+    'phone_number': 'TEXT',
+    'select': 'TEXT',
+    'status': 'TEXT',
+    'number': 'REAL',
+    'checkbox': 'INTEGER',
+    'date': 'TEXT',
+    'created_time': 'TEXT',
+    'last_edited_time': 'TEXT',
+}
+
+TEXT_TYPES = ('title', 'rich_text', 'text', 'url', 'email', 'phone_number')
+OPTION_TYPES = ('select', 'status')
+ARRAY_TYPES = ('multi_select', 'people', 'relation', 'files', 'created_by', 'last_edited_by')
+TIME_TYPES = ('date', 'created_time', 'last_edited_time')
+# SQL function of 'str.lower' registered on the connection.
+LOWER_FUNCTION = 'notion_lower'
+
+T_Sql = Tuple[str, List[Any]]
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _encode_text(value: Any) -> Any:
+    return value
+
+
+def _encode_checkbox(value: Any) -> Any:
+    return int(bool(value))
+
+
+def _encode_json(value: Any) -> Any:
+    if value is None:
+        return None
+    return json.dumps(list(value) if isinstance(value, tuple) else value, ensure_ascii=False)
+
+
+def _get_encoder(property_type: str) -> Callable[[Any], Any]:
+    if property_type == 'checkbox':
+        return _encode_checkbox
+    if property_type in SQLITE_TYPES:
+        return _encode_text
+    return _encode_json
+
+
+class MirrorTable:
+    """
+    table of a database in the mirror.
+
+    schema: ((property_name, property_type, property_id), ...). 'rich_text' is 'text' like 'database_properties_mapper'.
+    """
+
+    def __init__(self, name: str, schema: List[Tuple[str, str, str]]):
+        self.name = name
+        self.schema = schema
+        self.columns: Dict[str, Tuple[str, str]] = dict()
+        for index, (prop_name, prop_type, prop_id) in enumerate(schema):
+            column = (f'p{index}', prop_type)
+            self.columns[prop_name] = column
+            self.columns.setdefault(prop_id, column)
+        self._encoders = [(prop_name, _get_encoder(prop_type)) for prop_name, prop_type, _ in schema]
+
+    def get_create_sql(self) -> str:
+        columns = ['id TEXT PRIMARY KEY', 'created_time TEXT', 'last_edited_time TEXT', 'raw TEXT']
+        for index, (_, prop_type, _) in enumerate(self.schema):
+            columns.append(f"p{index} {SQLITE_TYPES.get(prop_type, 'TEXT')}")
+        return f"CREATE TABLE {_quote(self.name)} ({', '.join(columns)})"
+
+    def get_insert_sql(self) -> str:
+        count = 4 + len(self.schema)
+        return f"INSERT OR REPLACE INTO {_quote(self.name)} VALUES ({', '.join('?' * count)})"
+
+    def encode(self, data: Dict[str, Any]) -> Tuple[Any, ...]:
+        """
+        row of raw page object. Columns keep the values which filters compare (see 'get_filter_value').
+
+        :param data: raw page object
+        :return: tuple of column values
+        """
+        properties: Dict[str, Any] = data['properties']
+        return (str(data['id']), normalize_iso_time(data['created_time']), normalize_iso_time(data['last_edited_time']),
+                json.dumps(data, ensure_ascii=False),
+                *(encode(get_filter_value(properties[name])) if name in properties else None
+                  for name, encode in self._encoders))
+
+    def translate(self, body: Dict[str, Any]) -> T_Sql:
+        """
+        translate body of 'filter' to 'WHERE' clause.
+
+        :param body: {'or': [condition, ...]} or condition
+        :return: (sql, parameters)
+        """
+        for bool_op in ('or', 'and'):
+            if bool_op in body:
+                conditions = [self.translate(condition) for condition in body[bool_op]]
+                if not conditions:
+                    return '1', []
+                sql = f' {bool_op.upper()} '.join(f'({sql})' for sql, _ in conditions)
+                return sql, [param for _, params in conditions for param in params]
+
+        if 'timestamp' in body:
+            filter_type = str(body['timestamp'])
+            column = filter_type
+        else:
+            prop_name = str(body.get('property'))
+            if prop_name not in self.columns:
+                raise NotionApiQueoryException(f"'{prop_name}' property is not in the mirror table '{self.name}'.")
+            column, _ = self.columns[prop_name]
+            filter_types = [key for key in body if key != 'property']
+            assert len(filter_types) == 1, f"invalid filter condition: {body}"
+            filter_type = filter_types[0]
+
+        operators: Dict[str, Any] = body[filter_type]
+        if not operators:
+            raise NotionApiQueoryException(f"filter condition has no operator: {body}")
+        conditions = [self._translate_operator(column, filter_type, operator, value)
+                      for operator, value in operators.items()]
+        sql = ' AND '.join(f'({sql})' for sql, _ in conditions)
+        return sql, [param for _, params in conditions for param in params]
+
+    def _translate_operator(self, column: str, filter_type: str, operator: str, value: Any) -> T_Sql:
+        if filter_type in TEXT_TYPES:
+            text = f"COALESCE({column}, '')"
+            if operator == 'is_empty':
+                return f"{text} = ''", []
+            if operator == 'is_not_empty':
+                return f"{text} != ''", []
+            if operator == 'equals':
+                return f'{text} = ?', [value]
+            if operator == 'does_not_equal':
+                return f'{text} != ?', [value]
+            # like the api, the other operators ignore case. SQLite 'lower' changes only ascii letters.
+            text, value = f'{LOWER_FUNCTION}({text})', str(value).lower()
+            if operator == 'contains':
+                return f'instr({text}, ?) > 0', [value]
+            if operator == 'does_not_contain':
+                return f'instr({text}, ?) = 0', [value]
+            if operator == 'starts_with':
+                return f'substr({text}, 1, length(?)) = ?', [value, value]
+            if operator == 'ends_with':
+                return f'length({text}) >= length(?) AND substr({text}, -length(?)) = ?', [value, value, value]
+
+        elif filter_type in ('number', 'checkbox') + OPTION_TYPES:
+            if filter_type == 'checkbox' and operator in ('equals', 'does_not_equal'):
+                value = int(bool(value))
+            if operator == 'is_empty':
+                return f'{column} IS NULL', []
+            if operator == 'is_not_empty':
+                return f'{column} IS NOT NULL', []
+            if operator == 'equals':
+                return f'{column} = ?', [value]
+            if operator == 'does_not_equal':
+                return f'{column} IS NOT ?', [value]
+            comparisons = {'greater_than': '>', 'less_than': '<', 'greater_than_or_equal_to': '>=',
+                           'less_than_or_equal_to': '<='}
+            if filter_type == 'number' and operator in comparisons:
+                return f'{column} {comparisons[operator]} ?', [value]
+
+        elif filter_type in ARRAY_TYPES:
+            array = f"COALESCE({column}, '[]')"
+            if operator == 'is_empty':
+                return f"{array} = '[]'", []
+            if operator == 'is_not_empty':
+                return f"{array} != '[]'", []
+            # elements are json strings, so quoted value matches a whole element.
+            element = json.dumps(value, ensure_ascii=False)
+            if operator == 'contains':
+                return f'instr({array}, ?) > 0', [element]
+            if operator == 'does_not_contain':
+                return f'instr({array}, ?) = 0', [element]
+
+        elif filter_type in TIME_TYPES:
+            if operator == 'is_empty':
+                return f'{column} IS NULL', []
+            if operator == 'is_not_empty':
+                return f'{column} IS NOT NULL', []
+            comparisons = {'equals': '=', 'before': '<', 'after': '>', 'on_or_before': '<=', 'on_or_after': '>='}
+            if operator in comparisons:
+                time = normalize_iso_time(str(value))
+                # 'date' only value compares the day.
+                target = f'substr({column}, 1, 10)' if len(time) == 10 else column
+                return f'{target} {comparisons[operator]} ?', [time]
+
+        raise NotionApiQueoryException(f"'{filter_type}' filter with '{operator}' is not supported by the mirror.")
+
+
+class DatabaseMirror:
+    """
+    local SQLite mirror of databases. Access to the connection is serialized with a lock.
+    """
+
+    META_TABLE = 'notionizer_mirror'
+
+    def __init__(self, path: str = ':memory:'):
+        """
+
+        :param path: SQLite file path (default: ':memory:')
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._tables: Dict[str, MirrorTable] = dict()
+        self._connection.create_function(LOWER_FUNCTION, 1, lambda value: None if value is None else value.lower(),
+                                         deterministic=True)
+        with self._connection:
+            self._connection.execute(f"CREATE TABLE IF NOT EXISTS {self.META_TABLE} "
+                                     f"(database_id TEXT PRIMARY KEY, title TEXT, schema TEXT, state TEXT)")
+
+    def __repr__(self) -> str:
+        return f"<'{self.__class__.__name__}({self.path})' at {hex(id(self))}>"
+
+    def __enter__(self) -> 'DatabaseMirror':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    @staticmethod
+    def _get_database_id(database: Any) -> str:
+        return str(database.id).replace('-', '')
+
+    @staticmethod
+    def _get_schema(database: Any) -> List[Tuple[str, str, str]]:
+        schema = list()
+        for name, prop in database.properties.items():
+            prop_type = str(prop.type)
+            schema.append((str(name), 'text' if prop_type == 'rich_text' else prop_type, str(prop.id)))
+        return schema
+
+    def _get_table(self, database: Any) -> MirrorTable:
+        """
+        table of 'database'. Table is created again when the schema is changed.
+        """
+        database_id = self._get_database_id(database)
+        schema = self._get_schema(database)
+        table = self._tables.get(database_id)
+        if table is not None and table.schema == schema:
+            return table
+
+        table = MirrorTable('db_' + database_id, schema)
+        schema_json = json.dumps(schema, ensure_ascii=False)
+        row = self._connection.execute(f"SELECT schema FROM {self.META_TABLE} WHERE database_id = ?",
+                                       (database_id,)).fetchone()
+        if row is None or row[0] != schema_json:
+            if row is not None:
+                _log.info(f"schema of {database} is changed. mirror table is built again.")
+            with self._connection:
+                self._connection.execute(f"DROP TABLE IF EXISTS {_quote(table.name)}")
+                self._connection.execute(table.get_create_sql())
+                self._connection.execute(f"INSERT OR REPLACE INTO {self.META_TABLE} VALUES (?, ?, ?, NULL)",
+                                         (database_id, str(database.title), schema_json))
+        self._tables[database_id] = table
+        return table
+
+    def get_state(self, database: Any) -> Optional[SyncState]:
+        """
+        'SyncState' of the last 'sync'.
+
+        :param database: Database
+        :return: SyncState or None (not synced)
+        """
+        with self._lock:
+            self._get_table(database)
+            row = self._connection.execute(f"SELECT state FROM {self.META_TABLE} WHERE database_id = ?",
+                                           (self._get_database_id(database),)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return SyncState.from_dict(json.loads(row[0]))
+
+    def sync(self, database: Any, prefetch: int = 0) -> SyncResult:
+        """
+        request pages edited since the last sync and save them.
+
+        :param database: Database
+        :param prefetch: number of result pages requested ahead on a worker thread
+        :return: SyncResult (records are raw page objects)
+        """
+        state = self.get_state(database)
+        result: SyncResult = database.sync(state, raw=True, prefetch=prefetch)
+        with self._lock:
+            table = self._get_table(database)
+            with self._connection:
+                self._connection.executemany(table.get_insert_sql(),
+                                             [table.encode(data) for data in result.inserted + result.updated])
+                self._connection.execute(f"UPDATE {self.META_TABLE} SET state = ? WHERE database_id = ?",
+                                         (json.dumps(result.state.to_dict()), self._get_database_id(database)))
+        _log.debug(f"{self}: {database} {result}")
+        return result
+
+    def count(self, database: Any) -> int:
+        with self._lock:
+            table = self._get_table(database)
+            return int(self._connection.execute(f"SELECT COUNT(*) FROM {_quote(table.name)}").fetchone()[0])
+
+    def _select(self, database: Any, notion_filter: Optional[Any]) -> List[Dict[str, Any]]:
+        with self._lock:
+            table = self._get_table(database)
+            where, params = table.translate(notion_filter.get_body()) if notion_filter else ('1', [])
+            sql = f"SELECT raw FROM {_quote(table.name)} WHERE {where} ORDER BY created_time, id"
+            _log.debug(f"{sql} {params}")
+            rows = self._connection.execute(sql, params).fetchall()
+        return [json.loads(raw) for raw, in rows]
+
+    def query_filter(self, database: Any, notion_filter: Optional[Any] = None, raw: bool = False,
+                     columns: Optional[List[str]] = None) -> Iterator[Any]:
+        """
+        pages of the mirror which match 'filter' object. Pages are sorted by 'created_time'.
+
+        :param database: Database
+        :param notion_filter: 'filter' instance (default: None, all pages)
+        :param raw: if True, iterate raw page objects(dict) instead of 'Page'
+        :param columns: ('column_name1', 'column_name2'...) only these properties are returned.
+        :return: iterator of 'Page' or dict
+        """
+        for data in self._select(database, notion_filter):
+            if columns:
+                data['properties'] = {k: v for k, v in data['properties'].items() if k in columns}
+            yield data if raw else Page(database._request, data)
+
+    def query(self, database: Any, query_expression: str, raw: bool = False,
+              columns: Optional[List[str]] = None) -> Iterator[Any]:
+        """
+        same as 'Database.query' without requests.
+
+        :param database: Database
+        :param query_expression: simple 'python expression'
+        :param raw: if True, iterate raw page objects(dict) instead of 'Page'
+        :param columns: ('column_name1', 'column_name2'...) only these properties are returned.
+        :return: iterator of 'Page' or dict
+        """
+        notion_filter: filter = database._query_helper.query_by_expression(query_expression)
+        return self.query_filter(database, notion_filter, raw=raw, columns=columns)
+
+    def query_values(self, database: Any, query_expression: str,
+                     columns_select: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        same as 'Database.query_values' without requests.
+
+        :param database: Database
+        :param query_expression: simple 'python expression'
+        :param columns_select: ('column_name1', 'column_name2'...) (default: all)
+        :return: iterator of {'key': value, ...}
+        """
+        decoder: RowDecoder = database.compile_decoder(columns_select)
+        for data in self.query(database, query_expression, raw=True):
+            yield decoder.decode_dict(data)
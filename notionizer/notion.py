@@ -4,11 +4,18 @@ Notion API
 
 """
 
+from typing import Any
+from typing import Dict
+from typing import Optional
+
 import logging as _logging
 _log = _logging.getLogger(__name__)
 _logging.basicConfig(format='%(asctime)s [%(filename)s:%(lineno)s|%(levelname)s] %(funcName)s(): %(message)s')
 
+from notionizer import settings
 from notionizer.http_request import HttpRequest
+from notionizer.http_request import RequestScheduler
+from notionizer.transport import Transport
 from notionizer.objects import Database
 from notionizer.object_page import Page
 from notionizer.object_user import User
@@ -20,24 +27,71 @@ class Notion:
     Notion
 
     'Notion' is basic object of 'notionizer' module.
+
+    Every 'Database', 'Page', 'User' and 'Block' created from the instance shares its pooled 'HttpRequest'.
+    Call 'close()' or use 'with' statement to release the connections.
+
+    [Usage]
+
+    with Notion('notion_api_key') as notion:
+        db = notion.get_database('database_id')
     """
 
-    def __init__(self, secret_key: str):
+    def __init__(self, secret_key: str, timeout: int = 15,
+                 pool_connections: int = settings.POOL_CONNECTIONS,
+                 pool_maxsize: int = settings.POOL_MAXSIZE,
+                 pool_block: bool = settings.POOL_BLOCK,
+                 scheduler: Optional[RequestScheduler] = None,
+                 transport: Optional[Transport] = None):
+        """
+
+        :param secret_key: notion api key
+        :param timeout: seconds
+        :param pool_connections: number of host pools to cache
+        :param pool_maxsize: maximum number of keep-alive connections for each host
+        :param pool_block: if True, 'pool_maxsize' is a hard per-host limit
+        :param scheduler: 'RequestScheduler' for rate limiting and retries. Share one instance between 'Notion'
+            objects using the same integration token.
+        :param transport: 'Transport' which sends requests. (ex: 'ReplayTransport' for offline tests)
+        """
         self.__secret_key = secret_key
-        self._request: HttpRequest = HttpRequest(secret_key)
+        self._request: HttpRequest = HttpRequest(secret_key, timeout=timeout, pool_connections=pool_connections,
+                                                 pool_maxsize=pool_maxsize, pool_block=pool_block,
+                                                 scheduler=scheduler, transport=transport)
+
+    def __enter__(self) -> 'Notion':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
-    def get_database(self, database_id: str) -> Database:
+    def close(self) -> None:
+        """
+        close pooled connections of 'HttpRequest'.
+        :return: None
+        """
+        self._request.close()
+
+    def get_request_stats(self) -> Dict[str, Any]:
+        """
+        counters of the request scheduler: 'requests', 'waits', 'retries' and 'throttled_time'.
+        :return: dict
+        """
+        return self._request.scheduler.get_stats()
+
+    def get_database(self, database_id: str, defer_relation: bool = False) -> Database:
         """
         get 'Database' Object by 'database_id'
 
         https://www.notion.so/myworkspace/a8aec43384f447ed84390e8e42c2e089?v=...
                                          |---------- Database ID --------|
         :param database_id:
+        :param defer_relation: if True, related databases are not requested until relation reference is used.
         :return: Database
         """
 
         result = self._request.get('v1/databases/' + database_id)
-        db_object: Database = Database(*result)
+        db_object: Database = Database(*result, defer_relation=defer_relation)
         return db_object
 
     def get_page(self, page_id: str) -> Page:
@@ -82,9 +136,12 @@ class Notion:
         return me
 
     def get_block(self, block_id: str) -> Block:
+        """
+        get 'Block' object by 'block id'. Children are not requested; use 'Block.get_children' or
+        'Block.walk_blocks'.
+        :param block_id:
+        :return: Block
+        """
         block: Block = Block(*self._request.get('v1/blocks/' + block_id))
-        if block.has_children == True:
-            # block: Block = Block(*self._request.get('v1/blocks/' + block_id + "/children"))
-            block: Block = Block(*self._request.get('v1/blocks/' + block_id + "/children?page_size=2&"))
         return block
 
@@ -0,0 +1,259 @@
+"""
+Notion API (asyncio)
+
+'AsyncNotion' is the asyncio counterpart of 'Notion'. Requests are sent through 'AsyncHttpRequest', which runs the
+pooled 'HttpRequest' of a wrapped 'Notion' on a bounded thread pool. Objects are the same 'Database', 'Page', 'User'
+and 'Block' objects as the sync client and the rate limiter is shared, so sync and async calls never exceed the limit
+together.
+
+[Usage]
+
+async with AsyncNotion('notion_api_key') as notion:
+    db = await notion.get_database('database_id')
+    async for page in db.query('Status'):
+        ...
+
+    pages = await notion.get_pages(['page_id1', 'page_id2'])
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import TypeVar
+
+from notionizer import settings
+from notionizer.http_request import HttpRequest
+from notionizer.http_request import RequestScheduler
+from notionizer.notion import Notion
+from notionizer.transport import Transport
+from notionizer.objects import Database
+from notionizer.objects import QueriedPageIterator
+from notionizer.object_page import Page
+from notionizer.object_user import User
+from notionizer.object_block import Block
+
+_log = __import__('logging').getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class AsyncHttpRequest:
+    """
+    asyncio transport for 'HttpRequest'. Blocking calls run on a bounded thread pool and return awaitables.
+    """
+
+    def __init__(self, request: HttpRequest, max_workers: int = settings.ASYNC_MAX_WORKERS):
+        """
+
+        :param request: HttpRequest (its pool and scheduler are shared)
+        :param max_workers: maximum number of concurrent requests
+        """
+        self.request: HttpRequest = request
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                               thread_name_prefix='notionizer')
+
+    def run(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> Awaitable[T]:
+        """
+        run blocking 'function' on the thread pool.
+        """
+        # 'get_running_loop' is not available in python 3.6.
+        loop = asyncio.get_event_loop()
+        return loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    async def get(self, url: str):
+        return await self.run(self.request.get, url)
+
+    async def post(self, url: str, payload: Dict[str, Any]):
+        return await self.run(self.request.post, url, payload)
+
+    async def patch(self, url: str, payload: Dict[str, Any]):
+        return await self.run(self.request.patch, url, payload)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+class AsyncQueriedPageIterator:
+    """
+    asynchronous iterator over 'QueriedPageIterator'. Network round-trips run on the thread pool and 'Page'
+    objects are built on the event loop.
+    """
+
+    def __init__(self, request: AsyncHttpRequest, iterator_factory: Callable[[], QueriedPageIterator]):
+        """
+
+        :param request: AsyncHttpRequest
+        :param iterator_factory: function which sends the first query and returns 'QueriedPageIterator'
+        """
+        self._request = request
+        self._iterator_factory = iterator_factory
+        self._iterator: Optional[QueriedPageIterator] = None
+
+    def __aiter__(self) -> 'AsyncQueriedPageIterator':
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._iterator is None:
+            self._iterator = await self._request.run(self._iterator_factory)
+
+        iterator: QueriedPageIterator = self._iterator
+        while True:
+            try:
+                data = next(iterator.results_iter)
+            except StopIteration:
+                if not iterator.has_more:
+                    raise StopAsyncIteration
+                await self._request.run(iterator._fetch_next)
+                continue
+            return iterator._wrap(data)
+
+    async def to_list(self) -> List[Any]:
+        """
+        collect all queried pages.
+        :return: list
+        """
+        return [page async for page in self]
+
+
+class AsyncDatabase:
+    """
+    asyncio wrapper of 'Database'. Attributes which are not defined here are read from the wrapped 'Database'.
+    Only requests run on the thread pool; notion objects are built on the event loop, because their descriptors
+    are shared by the class.
+    """
+
+    def __init__(self, request: AsyncHttpRequest, database: Database):
+        self._async_request = request
+        self.database: Database = database
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.database, name)
+
+    def __str__(self) -> str:
+        return str(self.database)
+
+    def __repr__(self) -> str:
+        return f"<'AsyncDatabase' of {repr(self.database)}>"
+
+    def query(self, query_expression: str, prefetch: int = 0, raw: bool = False) -> AsyncQueriedPageIterator:
+        """
+        query with simple 'python expression'. The request is sent when iteration starts.
+
+        :param query_expression:
+        :param prefetch: number of result pages requested ahead (see 'QueriedPageIterator')
+        :param raw: if True, iterate raw page objects(dict)
+        :return: AsyncQueriedPageIterator
+        """
+        return AsyncQueriedPageIterator(self._async_request,
+                                        functools.partial(self.database.query, query_expression, prefetch=prefetch,
+                                                          raw=raw))
+
+    async def create_page(self, properties: Optional[Dict[str, Any]] = None) -> Page:
+        """
+        create 'new page' in the database.
+        :param properties: dictionary
+        :return: Page
+        """
+        payload = self.database.compile_converter().convert(dict(properties or {}))
+        return Page(*await self._async_request.post('v1/pages/', payload))
+
+
+class AsyncNotion:
+    """
+    AsyncNotion
+
+    asyncio client which shares the object model and the rate limiter with 'Notion'.
+    """
+
+    def __init__(self, secret_key: str, timeout: int = 15,
+                 pool_connections: int = settings.POOL_CONNECTIONS,
+                 pool_maxsize: int = settings.POOL_MAXSIZE,
+                 pool_block: bool = settings.POOL_BLOCK,
+                 scheduler: Optional[RequestScheduler] = None,
+                 transport: Optional[Transport] = None,
+                 max_workers: int = settings.ASYNC_MAX_WORKERS):
+        """
+
+        :param secret_key: notion api key
+        :param timeout: seconds
+        :param pool_connections: number of host pools to cache
+        :param pool_maxsize: maximum number of keep-alive connections for each host
+        :param pool_block: if True, 'pool_maxsize' is a hard per-host limit
+        :param scheduler: 'RequestScheduler'. Pass 'notion._request.scheduler' to share a sync client's limiter.
+        :param transport: 'Transport' which sends requests
+        :param max_workers: maximum number of concurrent requests
+        """
+        self.notion = Notion(secret_key, timeout=timeout, pool_connections=pool_connections,
+                             pool_maxsize=pool_maxsize, pool_block=pool_block, scheduler=scheduler,
+                             transport=transport)
+        self._request: AsyncHttpRequest = AsyncHttpRequest(self.notion._request, max_workers=max_workers)
+
+    async def __aenter__(self) -> 'AsyncNotion':
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        wait for running requests and close pooled connections.
+        :return: None
+        """
+        await asyncio.get_event_loop().run_in_executor(None, self._request.close)
+        self.notion.close()
+
+    def get_request_stats(self) -> Dict[str, Any]:
+        return self.notion.get_request_stats()
+
+    async def get_database(self, database_id: str, defer_relation: bool = False) -> AsyncDatabase:
+        """
+        get 'AsyncDatabase' by 'database_id'.
+        :param database_id:
+        :param defer_relation: if True, related databases are not requested until relation reference is used.
+        :return: AsyncDatabase
+        """
+        database = Database(*await self._request.get('v1/databases/' + database_id), defer_relation=True)
+        if not defer_relation:
+            # related schemas are read from raw objects on the thread pool.
+            await self._request.run(database._update_relation_reference)
+        return AsyncDatabase(self._request, database)
+
+    async def get_page(self, page_id: str) -> Page:
+        return Page(*await self._request.get('v1/pages/' + page_id))
+
+    async def get_pages(self, page_ids: Iterable[str]) -> List[Page]:
+        """
+        get pages concurrently. Order of result is same with 'page_ids'.
+        :param page_ids:
+        :return: List[Page]
+        """
+        return list(await asyncio.gather(*(self.get_page(page_id) for page_id in page_ids)))
+
+    async def get_user(self, user_id: str) -> User:
+        return User(*await self._request.get('v1/users/' + user_id))
+
+    async def get_all_users(self) -> List[User]:
+        request, result = await self._request.get('v1/users')
+        return [User(request, obj) for obj in result['results']]
+
+    async def get_me(self) -> User:
+        return User(*await self._request.get('v1/users/me'))
+
+    async def get_block(self, block_id: str) -> Block:
+        return Block(*await self._request.get('v1/blocks/' + block_id))
+
+    async def get_blocks(self, block_ids: Iterable[str]) -> List[Block]:
+        """
+        get blocks concurrently. Order of result is same with 'block_ids'.
+        :param block_ids:
+        :return: List[Block]
+        """
+        return list(await asyncio.gather(*(self.get_block(block_id) for block_id in block_ids)))
@@ -1,9 +1,14 @@
+import contextlib
+
 from notionizer.object_adt import DictionaryObject, ListObject, ImmutableProperty
 from notionizer.exception import NotionApiPropertyException
 from notionizer.http_request import HttpRequest
+from notionizer.instance_cache import InstanceCache
+from notionizer.instance_cache import WeakInstanceCache
 from typing import Any
 from typing import Optional
 from typing import Dict
+from typing import Iterator
 from typing import Tuple
 from typing import List
 
@@ -118,8 +123,9 @@ class ObjectProperty(ImmutableProperty):
     ObjectProperty which inherits 'ImmutableProperty'.
     """
 
-    def __set__(self, owner: Any, value: Dict[str, Any]) -> None:
-        obj = DictionaryObject(self.public_name, owner, value)
+    def __set__(self, owner: Any, value: Optional[Dict[str, Any]]) -> None:
+        # descriptor is shared by class. 'null' object (ex: empty 'select' of page) should stay 'None'.
+        obj = DictionaryObject(self.public_name, owner, value) if value is not None else None
         super().__set__(owner, obj)
 
 
@@ -178,8 +184,13 @@ def set_proper_descriptor(cls: Any, key: str, value: Any) -> None:
 class NotionUpdateObject(NotionBaseObject):
     """
     'NotionUpdateObject' overrides '_update' method for updating and refreshing itself.
+
+    Instances are registered on '_instances' (identity map) by 'id'. See 'set_instance_cache'.
+
+    Inside 'batch()', updates are collected in '_pending_update' and sent as one request when the block exits.
     """
-    _instances: Dict[str, Any] = {}
+    _instances: InstanceCache = WeakInstanceCache()
+    _pending_update: Optional[Dict[str, Any]] = None
 
     _api_url: str
     id: ImmutableProperty
@@ -199,12 +210,12 @@ class NotionUpdateObject(NotionBaseObject):
         instance: 'NotionUpdateObject' = super(NotionUpdateObject, cls).__new__(cls, data)  # type: ignore
 
         # assign 'new namespace' with 'unassigned descriptors'.
-        if instance_id:
-            NotionUpdateObject._instances[instance_id].__dict__ = instance.__dict__
+        instances: InstanceCache = NotionUpdateObject._instances
+        target: Optional['NotionUpdateObject'] = instances.get(instance_id) if instance_id else None
+        if target is not None:
+            target.__dict__ = instance.__dict__
         else:
-            print(data)
-            instance_id = str(data['id'])
-            NotionUpdateObject._instances[instance_id] = instance
+            instances[str(data['id'])] = instance
 
         return instance
 
@@ -220,12 +231,93 @@ class NotionUpdateObject(NotionBaseObject):
         super().__init__(data)
 
     def _update(self, property_name: str, contents: Dict[str, Any]) -> None:
+        pending = self._pending_update
+        if pending is not None:
+            # 'properties' of several assignments are merged. later assignment wins.
+            if isinstance(contents, dict) and isinstance(pending.get(property_name), dict):
+                pending[property_name].update(contents)
+            else:
+                pending[property_name] = contents
+            return
+        self._flush({property_name: contents})
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator['NotionUpdateObject']:
+        """
+        collect updates of the block and send them as a single request. The instance is refreshed once after
+        the request, so values read inside the block are not updated yet. If the block raises, collected updates
+        are discarded. Nested 'batch()' joins the outer one.
+
+        [Usage]
+
+        with page.batch():
+            page.properties['Count'].number = 3
+            page.properties['Done'].checkbox = True
+
+        :return: context manager
+        """
+        if self._pending_update is not None:
+            yield self
+            return
+
+        self._pending_update = dict()
+        try:
+            yield self
+        except BaseException:
+            self._pending_update = None
+            raise
+        pending, self._pending_update = self._pending_update, None
+        if pending:
+            self._flush(pending)
+
+    def _flush(self, contents: Dict[str, Any]) -> None:
+        """
+        send update request and refresh instance.
+
+        :param contents: {'property_name': contents, ...}
+        :return: None
+        """
         url = self._api_url + str(self.id)
-        request, data = self._request.patch(url, {property_name: contents})
+        request, data = self._request.patch(url, contents)
+        self._refresh(request, data)
+
+    def _refresh(self, request: HttpRequest, data: Dict[str, Any]) -> None:
+        """
+        refresh instance itself in place with new 'data'.
+
+        :param request:
+        :param data: notion object returned from api
+        :return: None
+        """
+        instance_id = str(data['id'])
+        # instance could be evicted from identity map while user holds it.
+        NotionUpdateObject._instances[instance_id] = self
         # update property of object using 'id' value.
         cls: type(NotionUpdateObject) = type(self)  # type: ignore
-        # update instance
-        cls(request, data, instance_id=str(data['id']))
+        cls(request, data, instance_id=instance_id)
+        # namespace is filled by a temporary instance. copies of descriptors bound to it are bound to this one.
+        for value in list(vars(self).values()):
+            bind = getattr(value, '_bind', None)
+            if bind is not None:
+                bind(self)
+
+
+def set_instance_cache(cache: InstanceCache) -> None:
+    """
+    replace identity map of 'NotionUpdateObject'. (default: 'WeakInstanceCache')
+
+    :param cache: InstanceCache (ex: LRUInstanceCache(max_size=10000, ttl=600))
+    :return: None
+    """
+    NotionUpdateObject._instances = cache
+
+
+def get_instance_cache_stats() -> Dict[str, int]:
+    """
+    return counters of identity map: 'hits', 'misses', 'evictions' and 'live'.
+    :return: dict
+    """
+    return NotionUpdateObject._instances.get_stats()
 
 
 # class Listblock(ListObject):
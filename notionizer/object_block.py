@@ -1,6 +1,157 @@
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
 import notionizer.objects
+import notionizer.traversal
+import notionizer.block_writer
+import notionizer.block_diff
+import notionizer.markdown
 NotionUpdateObject = notionizer.objects.NotionUpdateObject
+ImmutableProperty = notionizer.objects.ImmutableProperty
+UserProperty = notionizer.objects.UserProperty
+HttpRequest = notionizer.objects.HttpRequest
+notion_object_init_handler = notionizer.functions.notion_object_init_handler
+BlockWalker = notionizer.traversal.BlockWalker
+get_children = notionizer.traversal.get_children
+BlockAppender = notionizer.block_writer.BlockAppender
+BlockDiff = notionizer.block_diff.BlockDiff
+BlockOperation = notionizer.block_diff.BlockOperation
+markdown_to_blocks = notionizer.markdown.markdown_to_blocks
+settings = notionizer.settings
 
 
 class Block(NotionUpdateObject):
-    pass
+    """
+    Block Object
+    """
+    id = ImmutableProperty()
+    created_by = UserProperty()
+    last_edited_by = UserProperty()
+
+    _api_url = 'v1/blocks/'
+
+    @notion_object_init_handler
+    def __init__(self, request: HttpRequest, data: Dict[str, Any]):
+        """
+
+        :param request: Notion._request
+        :param data: returned from ._request
+        """
+        object_type = data['object']
+        assert object_type == 'block', f"data type is not 'block'. (type: {object_type})"
+        super().__init__(request, data)
+
+    def __repr__(self) -> str:
+        return f"<Block '{self.type}' at '{self.id}'>"
+
+    def get_children(self) -> List['Block']:
+        """
+        get direct children of the block. Every page of 'next_cursor' is requested.
+
+        :return: List[Block]
+        """
+        return [Block(self._request, data) for data in get_children(self._request, str(self.id))]
+
+    def append_children(self, blocks: Iterable[Dict[str, Any]],
+                        concurrency: int = settings.BLOCK_CONCURRENCY) -> List['Block']:
+        """
+        append blocks to the end of children. Long lists and nested children are split into requests within
+        the api limits. See 'BlockAppender'.
+
+        :param blocks: block objects. Nested blocks are in 'children' of the type object.
+        :param concurrency: maximum number of concurrent requests
+        :return: created top level blocks
+        """
+        return append_blocks(self._request, str(self.id), blocks, concurrency=concurrency)
+
+    def append_markdown(self, markdown: str, concurrency: int = settings.BLOCK_CONCURRENCY) -> List['Block']:
+        """
+        convert markdown to blocks and append them to the end of children. See 'MarkdownParser'.
+
+        :param markdown: markdown document
+        :param concurrency: maximum number of concurrent requests
+        :return: created top level blocks
+        """
+        return self.append_children(markdown_to_blocks(markdown), concurrency=concurrency)
+
+    def update_children(self, blocks: List[Dict[str, Any]],
+                        concurrency: int = settings.BLOCK_CONCURRENCY) -> List[BlockOperation]:
+        """
+        change children to block objects. Only changed blocks are appended, updated or deleted. See 'BlockDiff'.
+
+        :param blocks: block objects. Nested blocks are in 'children' of the type object.
+        :param concurrency: maximum number of concurrent requests
+        :return: applied operations
+        """
+        return update_blocks(self._request, str(self.id), blocks, concurrency=concurrency)
+
+    def walk_blocks(self, order: str = BlockWalker.DEPTH_FIRST, max_depth: Optional[int] = None,
+                    concurrency: int = settings.BLOCK_CONCURRENCY, follow_child_pages: bool = False,
+                    raw: bool = False) -> Iterator[Tuple[int, Any]]:
+        """
+        stream '(depth, block)' of every block under the block. See 'BlockWalker'.
+
+        :param order: 'BlockWalker.DEPTH_FIRST' or 'BlockWalker.BREADTH_FIRST'
+        :param max_depth: deepest level to yield. 1 yields direct children only. (default: unlimited)
+        :param concurrency: maximum number of concurrent children requests
+        :param follow_child_pages: walk into 'child_page' and 'child_database' blocks
+        :param raw: yield raw block objects instead of 'Block'
+        :return: Iterator[(depth, Block)]
+        """
+        return walk_blocks(self._request, str(self.id), order=order, max_depth=max_depth, concurrency=concurrency,
+                           follow_child_pages=follow_child_pages, raw=raw)
+
+
+def walk_blocks(request: HttpRequest, block_id: str, order: str = BlockWalker.DEPTH_FIRST,
+                max_depth: Optional[int] = None, concurrency: int = settings.BLOCK_CONCURRENCY,
+                follow_child_pages: bool = False, raw: bool = False) -> Iterator[Tuple[int, Any]]:
+    """
+    stream '(depth, block)' of every block under the block or page.
+
+    :param request: HttpRequest
+    :param block_id: id of block or page
+    :param order: 'BlockWalker.DEPTH_FIRST' or 'BlockWalker.BREADTH_FIRST'
+    :param max_depth: deepest level to yield. 1 yields direct children only. (default: unlimited)
+    :param concurrency: maximum number of concurrent children requests
+    :param follow_child_pages: walk into 'child_page' and 'child_database' blocks
+    :param raw: yield raw block objects instead of 'Block'
+    :return: Iterator[(depth, Block)]
+    """
+    wrap = None if raw else (lambda data: Block(request, data))
+    walker = BlockWalker(request, order=order, max_depth=max_depth, concurrency=concurrency,
+                         follow_child_pages=follow_child_pages, wrap=wrap)
+    return walker.walk(block_id)
+
+
+def append_blocks(request: HttpRequest, block_id: str, blocks: Iterable[Dict[str, Any]],
+                  concurrency: int = settings.BLOCK_CONCURRENCY) -> List[Block]:
+    """
+    append blocks to the end of children of the block or page.
+
+    :param request: HttpRequest
+    :param block_id: id of block or page
+    :param blocks: block objects. Nested blocks are in 'children' of the type object.
+    :param concurrency: maximum number of concurrent requests
+    :return: created top level blocks
+    """
+    created = BlockAppender(request, concurrency=concurrency).append(block_id, blocks)
+    return [Block(request, data) for data in created]
+
+
+def update_blocks(request: HttpRequest, block_id: str, blocks: List[Dict[str, Any]],
+                  concurrency: int = settings.BLOCK_CONCURRENCY) -> List[BlockOperation]:
+    """
+    change children of the block or page to block objects with the least append, update and delete requests.
+
+    :param request: HttpRequest
+    :param block_id: id of block or page
+    :param blocks: block objects. Nested blocks are in 'children' of the type object.
+    :param concurrency: maximum number of concurrent requests
+    :return: applied operations
+    """
+    return BlockDiff(request, concurrency=concurrency).update(block_id, blocks)
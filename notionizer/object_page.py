@@ -1,4 +1,6 @@
-from typing import Dict, Any
+import io
+
+from typing import Dict, Any, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 # from notionizer import UserProperty, Database
 # from notionizer.objects import NotionUpdateObject, PropertiesProperty, ImmutableProperty, notion_object_init_handler, \
@@ -8,8 +10,10 @@ import notionizer
 import notionizer.object_user
 import notionizer.properties_property
 import notionizer.functions
+import notionizer.converter
+import notionizer.traversal
+import notionizer.markdown
 
-print(dir(notionizer))
 
 NotionUpdateObject = notionizer.object_basic.NotionUpdateObject
 UserProperty = notionizer.object_user.UserProperty
@@ -19,6 +23,11 @@ ImmutableProperty = notionizer.object_user.ImmutableProperty
 notion_object_init_handler = notionizer.functions.notion_object_init_handler
 HttpRequest = notionizer.http_request.HttpRequest
 from_plain_text_to_rich_text_array = notionizer.functions.from_plain_text_to_rich_text_array
+get_page_property_converter = notionizer.converter.get_page_property_converter
+BlockWalker = notionizer.traversal.BlockWalker
+MarkdownExporter = notionizer.markdown.MarkdownExporter
+markdown_to_blocks = notionizer.markdown.markdown_to_blocks
+settings = notionizer.settings
 
 
 class Page(NotionUpdateObject):
@@ -45,21 +54,154 @@ class Page(NotionUpdateObject):
         object_type = data['object']
         assert object_type == 'page', f"data type is not 'database'. (type: {object_type})"
         super().__init__(request, data)
+        # raw page object for 'FilterEvaluator'. Refreshed with the instance after update.
+        self._raw_data: Dict[str, Any] = data
 
     def __repr__(self) -> str:
         return f"<Page at '{self.id}'>"
 
-    def get_properties(self) -> Dict[str, Any]:
+    def get_properties(self, columns: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
-        return value of properties simply
+        return value of properties simply. Only properties in 'columns' are decoded.
+
+        :param columns: names of properties (default: all)
         :return: {'key' : value, ...}
         """
+        properties = self.properties
+        if columns is None:
+            columns = list(properties.keys())
+
         result = dict()
-        for k, v in self.properties.items():
-            result[k] = v.get_value()
+        for k in columns:
+            result[k] = properties[k].get_value()
 
         return result
 
+    def update(self, fields: Optional[Dict[str, Any]] = None, **kwargs: Any) -> 'Page':
+        """
+        update properties with simple values in a single request. Values are validated like 'create_page' of
+        the database. If any value is invalid, nothing is sent.
+
+        :param fields: {'property_name': value, ...} (for names which are not python identifier)
+        :param kwargs: property_name=value
+        :return: self
+
+        [Usage]
+
+        page.update(Count=3, Done=True)
+        page.update({'Due Date': {'start': '2022-01-01'}})
+        """
+        values: Dict[str, Any] = dict(fields or {}, **kwargs)
+        properties = self.properties
+        with self.batch():
+            for name, value in values.items():
+                assert name in properties.keys(), f"'{name}' property not in the page."
+                convert = get_page_property_converter(name, str(properties[name].type))
+                self._update('properties', {name: convert(value)})
+        return self
+
+    def append_blocks(self, blocks: Iterable[Dict[str, Any]],
+                      concurrency: int = settings.BLOCK_CONCURRENCY) -> List['Block']:
+        """
+        append blocks to the end of the page. Long lists and nested children are split into requests within
+        the api limits. See 'BlockAppender'.
+
+        :param blocks: block objects. Nested blocks are in 'children' of the type object.
+        :param concurrency: maximum number of concurrent requests
+        :return: created top level blocks
+
+        [Usage]
+
+        page.append_blocks([
+            {'type': 'paragraph', 'paragraph': {'rich_text': [{'type': 'text', 'text': {'content': 'hello'}}]}},
+        ])
+        """
+        append_blocks = __import__('notionizer').object_block.append_blocks
+        return append_blocks(self._request, str(self.id), blocks, concurrency=concurrency)
+
+    def append_markdown(self, markdown: str, concurrency: int = settings.BLOCK_CONCURRENCY) -> List['Block']:
+        """
+        convert markdown to blocks and append them to the end of the page. See 'MarkdownParser'.
+
+        :param markdown: markdown document
+        :param concurrency: maximum number of concurrent requests
+        :return: created top level blocks
+        """
+        return self.append_blocks(markdown_to_blocks(markdown), concurrency=concurrency)
+
+    def update_blocks(self, blocks: List[Dict[str, Any]],
+                      concurrency: int = settings.BLOCK_CONCURRENCY) -> List[Any]:
+        """
+        change blocks of the page to block objects. Blocks are compared by content hash and only changed blocks
+        are appended, updated or deleted. See 'BlockDiff'.
+
+        :param blocks: block objects. Nested blocks are in 'children' of the type object.
+        :param concurrency: maximum number of concurrent requests
+        :return: applied operations (List[BlockOperation])
+        """
+        update_blocks = __import__('notionizer').object_block.update_blocks
+        return update_blocks(self._request, str(self.id), blocks, concurrency=concurrency)
+
+    def update_markdown(self, markdown: str, concurrency: int = settings.BLOCK_CONCURRENCY) -> List[Any]:
+        """
+        change blocks of the page to converted markdown. Only changed blocks are sent.
+
+        :param markdown: markdown document
+        :param concurrency: maximum number of concurrent requests
+        :return: applied operations (List[BlockOperation])
+
+        [Usage]
+
+        with open('page.md') as f:
+            page.update_markdown(f.read())
+        """
+        return self.update_blocks(markdown_to_blocks(markdown), concurrency=concurrency)
+
+    def walk_blocks(self, order: str = BlockWalker.DEPTH_FIRST, max_depth: Optional[int] = None,
+                    concurrency: int = settings.BLOCK_CONCURRENCY, follow_child_pages: bool = False,
+                    raw: bool = False) -> Iterator[Tuple[int, Any]]:
+        """
+        stream '(depth, block)' of every block in the page. See 'BlockWalker'.
+
+        :param order: 'BlockWalker.DEPTH_FIRST' or 'BlockWalker.BREADTH_FIRST'
+        :param max_depth: deepest level to yield. 1 yields top level blocks only. (default: unlimited)
+        :param concurrency: maximum number of concurrent children requests
+        :param follow_child_pages: walk into 'child_page' and 'child_database' blocks
+        :param raw: yield raw block objects instead of 'Block'
+        :return: Iterator[(depth, Block)]
+
+        [Usage]
+
+        for depth, block in page.walk_blocks(max_depth=2):
+            print('  ' * (depth - 1) + block.type)
+        """
+        walk_blocks = __import__('notionizer').object_block.walk_blocks
+        return walk_blocks(self._request, str(self.id), order=order, max_depth=max_depth, concurrency=concurrency,
+                           follow_child_pages=follow_child_pages, raw=raw)
+
+    def to_markdown(self, stream: Optional[TextIO] = None, title: bool = True,
+                    concurrency: int = settings.BLOCK_CONCURRENCY) -> Optional[str]:
+        """
+        write blocks of the page as markdown. Blocks are written as they arrive. See 'MarkdownExporter' for
+        exporting many pages concurrently.
+
+        :param stream: text stream with 'write' method (default: markdown is returned as string)
+        :param title: write page title as the first heading
+        :param concurrency: maximum number of concurrent children requests
+        :return: markdown if 'stream' is not given
+
+        [Usage]
+
+        with open('page.md', 'w') as f:
+            page.to_markdown(f)
+        """
+        exporter = MarkdownExporter(self._request, block_concurrency=concurrency, title=title)
+        if stream is not None:
+            exporter.write(self, stream)
+            return None
+        buffer = io.StringIO()
+        exporter.write(self, buffer)
+        return buffer.getvalue()
 
     def create_database(self,
                         title: str = '',
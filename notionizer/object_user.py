@@ -53,4 +53,4 @@ class User(NotionUpdateObject, UserBaseObject):
         url = self._api_url + str(self.id)
         request, data = self._request.get(url)
         _log.debug(f"{type(self).__init__}")
-        type(self)(request, data, instance_id=data['id'])
+        self._refresh(request, data)
@@ -17,6 +17,7 @@ Fallow rules make python object safety from user assignment event.
 """
 
 import notionizer.http_request
+import notionizer.settings
 import notionizer.object_basic
 import notionizer.object_adt
 import notionizer.properties_property
@@ -24,6 +25,18 @@ import notionizer.functions
 import notionizer.properties_basic
 import notionizer.properties_db
 import notionizer.query
+import notionizer.decoder
+import notionizer.converter
+import notionizer.bulk
+import notionizer.sync
+import notionizer.columnar
+
+import concurrent.futures
+import queue
+import threading
+import weakref
+
+from urllib import parse
 
 from typing import Optional
 from typing import Any
@@ -31,6 +44,9 @@ from typing import Dict
 from typing import List
 from typing import Union
 from typing import Set
+from typing import Iterator
+from typing import Tuple
+from typing import Iterable
 
 # import notionizer.object_page
 
@@ -42,6 +58,9 @@ UserProperty = notionizer.object_user.UserProperty
 # Page = notionizer.object_page.Page
 Query = notionizer.query.Query
 filter = notionizer.query.filter
+filter_date = notionizer.query.filter_date
+sorts = notionizer.query.sorts
+sort_by_timestamp = notionizer.query.sort_by_timestamp
 T_Filter = notionizer.query.T_Filter
 T_Sorts = notionizer.query.T_Sorts
 
@@ -57,16 +76,64 @@ from_plain_text_to_rich_text_array = notionizer.functions.from_plain_text_to_ric
 DbPropertyObject = notionizer.properties_basic.DbPropertyObject
 TitleProperty = notionizer.properties_basic.TitleProperty
 DbPropertyRelation = notionizer.properties_db.DbPropertyRelation
+RowDecoder = notionizer.decoder.RowDecoder
+PageConverter = notionizer.converter.PageConverter
+BulkOperation = notionizer.bulk.BulkOperation
+BulkResult = notionizer.bulk.BulkResult
+SyncState = notionizer.sync.SyncState
+SyncResult = notionizer.sync.SyncResult
+ColumnarStore = notionizer.columnar.ColumnarStore
 
 _log = __import__('logging').getLogger(__name__)
 
 
+"""
+schema of databases for relation reference: {'database_id': {'property_id': 'property_type', ...}}
+shared by 'Database' instances of the same 'HttpRequest' (same 'Notion').
+"""
+_relation_schema_cache: 'weakref.WeakKeyDictionary[HttpRequest, Dict[str, Dict[str, str]]]' = \
+    weakref.WeakKeyDictionary()
+_relation_schema_lock = threading.Lock()
+
+
+def _get_relation_schema_cache(request: HttpRequest) -> Dict[str, Dict[str, str]]:
+    with _relation_schema_lock:
+        if request not in _relation_schema_cache:
+            _relation_schema_cache[request] = dict()
+        return _relation_schema_cache[request]
+
+
+def _prefetch_pages(request: HttpRequest, url: str, payload: Dict[str, Any], next_cursor: str,
+                    result_queue: 'queue.Queue[Any]', stop_event: threading.Event) -> None:
+    """
+    worker of 'QueriedPageIterator' prefetch mode. Requests pages in cursor order and puts the results (or the
+    raised exception) on 'result_queue' until the last page or 'stop_event'.
+    """
+    payload = dict(payload)
+    while next_cursor and not stop_event.is_set():
+        payload['start_cursor'] = next_cursor
+        try:
+            result_data: Any = request.post(url, payload)[1]
+            next_cursor = result_data['next_cursor'] if result_data['has_more'] else ''
+        except Exception as e:
+            result_data = e
+            next_cursor = ''
+
+        while not stop_event.is_set():
+            try:
+                result_queue.put(result_data, timeout=0.5)
+                break
+            except queue.Full:
+                pass
+
+
 class QueriedPageIterator:
     """
     database Queried Page Iterator
     """
 
-    def __init__(self, request: HttpRequest, url: str, payload: Dict[str, Any]):
+    def __init__(self, request: HttpRequest, url: str, payload: Dict[str, Any], prefetch: int = 0,
+                 raw: bool = False, columns: Optional[List[str]] = None):
         """
         Automatically query next page.
 
@@ -76,6 +143,10 @@ class QueriedPageIterator:
             request: HttpRequest
             url: str
             payload: dict
+            prefetch: number of pages requested ahead on a worker thread. (default: 0, disabled)
+                With prefetch, next 'start_cursor' request is sent as soon as the current page is received.
+            raw: if True, iterator returns raw page objects(dict) instead of 'Page'.
+            columns: names of properties which the request asked. (None: all properties)
 
         Usage:
             queried = db.query(filter=filter_base)
@@ -87,6 +158,11 @@ class QueriedPageIterator:
         self._request: HttpRequest = request
         self._url: str = url
         self._payload: Dict[str, Any] = dict(payload)
+        self._prefetch: int = prefetch
+        self._raw: bool = raw
+        self.columns: Optional[List[str]] = list(columns) if columns else None
+        self._prefetch_queue: Optional['queue.Queue[Any]'] = None
+        self._prefetch_stop: Optional[threading.Event] = None
 
         request_post: HttpRequest
         result_data: Dict[str, Any]
@@ -94,6 +170,29 @@ class QueriedPageIterator:
 
         self._assign_data(result_data)
 
+        if prefetch and self.has_more:
+            self._start_prefetch()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        stop the prefetch worker. Iterating after 'close()' ends with the pages already received.
+        :return: None
+        """
+        stop_event: Optional[threading.Event] = getattr(self, '_prefetch_stop', None)
+        if stop_event:
+            stop_event.set()
+
+    def _start_prefetch(self) -> None:
+        self._prefetch_queue = queue.Queue(maxsize=self._prefetch)
+        self._prefetch_stop = threading.Event()
+        worker = threading.Thread(target=_prefetch_pages, name='notionizer-prefetch', daemon=True,
+                                  args=(self._request, self._url, self._payload, self.next_cursor,
+                                        self._prefetch_queue, self._prefetch_stop))
+        worker.start()
+
     def _assign_data(self, result_data: dict):
 
         self.object = result_data['object']
@@ -103,19 +202,58 @@ class QueriedPageIterator:
 
         self.results_iter = iter(self._results)
 
+    def _fetch_next(self) -> None:
+        """
+        request next page with 'next_cursor' and assign it.
+        :return: None
+        """
+        if self._prefetch_queue is not None:
+            assert self._prefetch_stop is not None
+            if self._prefetch_stop.is_set():
+                self.has_more = False
+                self.results_iter = iter(())
+                return
+            result_data = self._prefetch_queue.get()
+            if isinstance(result_data, Exception):
+                raise result_data
+        else:
+            self._payload['start_cursor'] = self.next_cursor
+            request, result_data = self._request.post(self._url, self._payload)
+        self._assign_data(result_data)
+
+    def _wrap(self, data: Dict[str, Any]) -> Any:
+        """
+        convert a result object of the response.
+        :param data: page object
+        :return: Page (or 'data' itself in raw mode)
+        """
+        if self._raw:
+            return data
+        return Page(self._request, data)
+
+    def iter_raw(self) -> Iterator[Dict[str, Any]]:
+        """
+        iterate remaining results as raw page objects(dict), regardless of 'raw' mode.
+        :return: iterator
+        """
+        while True:
+            for data in self.results_iter:
+                yield data
+            if not self.has_more:
+                return
+            self._fetch_next()
+
     def __iter__(self):
         self.results_iter = iter(self._results)
         return self
 
     def __next__(self):
         try:
-            return Page(self._request, next(self.results_iter))
+            return self._wrap(next(self.results_iter))
         except StopIteration:
 
             if self.has_more:
-                self._payload['start_cursor'] = self.next_cursor
-                request, result_data = self._request.post(self._url, self._payload)
-                self._assign_data(result_data)
+                self._fetch_next()
                 return self.__next__()
             else:
                 raise StopIteration
@@ -148,13 +286,16 @@ class Database(NotionUpdateObject):
     properties: PropertiesProperty = PropertiesProperty(object_type='database')
 
     @notion_object_init_handler
-    def __init__(self, request: HttpRequest, data: Dict[str, Any], update_relation: bool = True):
+    def __init__(self, request: HttpRequest, data: Dict[str, Any], update_relation: bool = True,
+                 defer_relation: bool = False):
         """
          initilize Database instance.
 
         :param request: Notion._request
         :param data: returned from ._request
         :param update_relation: (bool) assign 'False' for 'database object' of checking relation reference
+        :param defer_relation: (bool) if True, related databases are requested when relation reference is used
+            first. (see 'get_relation_reference')
         """
 
         object_type = data['object']
@@ -163,8 +304,15 @@ class Database(NotionUpdateObject):
         _log.debug(" ".join(map(str, ('Database:', self))))
         super().__init__(request, data)
         self._relation_reference: Dict[str, DictionaryObject] = dict()
+        self._relation_reference_updated = False
+        self._decoders: Dict[Tuple[str, ...], RowDecoder] = dict()
+        self._converter: Optional[PageConverter] = None
         self._query_helper = Query(self.properties)
-        if update_relation:
+
+        # other databases relating this one don't need to request it again.
+        _get_relation_schema_cache(request)[str(self.id)] = self._get_property_types()
+
+        if update_relation and not defer_relation:
             self._update_relation_reference()
 
     def __str__(self) -> str:
@@ -176,49 +324,173 @@ class Database(NotionUpdateObject):
         str_content = f"<'{self.__class__.__name__}{title}'>"
         return str_content
 
-    def _update_relation_reference(self) -> None:
+    def _get_property_types(self) -> Dict[str, str]:
+        """
+        :return: {'property_id': 'property_type', ...}
         """
-        update relation reference to
+        sub_prop: DbPropertyObject
+        return {str(sub_prop.id): str(sub_prop.type) for sub_prop in self.properties.values()}
+
+    def _update_relation_reference(self, use_cache: bool = True) -> None:
+        """
+        update relation reference to related databases. Missing databases are requested concurrently and cached
+        for 'Database' instances of the same 'Notion'.
+
+        :param use_cache: if False, request all related databases again.
         :return:
         """
         relation_db_id_set: Set[str] = set()
         prop: DbPropertyRelation
         for prop in self.properties.values():
             if prop.type == 'relation':
-                relation_db_id_set.add(prop.relation['database_id'])
+                relation_db_id_set.add(str(prop.relation['database_id']))
 
-        for db_id in relation_db_id_set:
-            db: 'Database' = Database(*self._request.get('v1/databases/' + db_id), update_relation=False)
+        schema_cache: Dict[str, Dict[str, str]] = _get_relation_schema_cache(self._request)
+        missing: List[str] = sorted(db_id for db_id in relation_db_id_set
+                                    if not use_cache or db_id not in schema_cache)
 
-            sub_prop: DbPropertyObject
-            sub_prop_dict: Dict[str, str] = dict()
+        def get_property_types(db_id: str) -> Dict[str, str]:
+            # types are read from the raw object. 'Database' instances are not created on worker threads.
+            _, data = self._request.get('v1/databases/' + db_id)
+            return {parse.unquote(str(prop['id'])): str(prop['type']) for prop in data['properties'].values()}
 
-            for sub_prop in db.properties.values():
-                sub_prop_dict[str(sub_prop.id)] = str(sub_prop.type)
+        if missing:
+            max_workers = min(notionizer.settings.RELATION_MAX_WORKERS, len(missing))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for db_id, property_types in zip(missing, executor.map(get_property_types, missing)):
+                    schema_cache[db_id] = property_types
+
+        for db_id in relation_db_id_set:
+            self._relation_reference[db_id] = DictionaryObject('relation_properties', self, schema_cache[db_id])
+        self._relation_reference_updated = True
+
+    def get_relation_reference(self) -> Dict[str, DictionaryObject]:
+        """
+        property types of related databases. If the database was created with 'defer_relation', related databases
+        are requested here at first.
 
-            self._relation_reference[db_id] = DictionaryObject('relation_properties', self, sub_prop_dict)
+        :return: {'database_id': {'property_id': 'property_type', ...}, ...}
+        """
+        if not self._relation_reference_updated:
+            self._update_relation_reference()
+        return self._relation_reference
 
-    def query(self, query_expression: str) -> QueriedPageIterator:
+    def query(self, query_expression: str, prefetch: int = 0, raw: bool = False,
+              columns: Optional[List[str]] = None) -> QueriedPageIterator:
         """
         query with simple 'python expression'.
 
         :param query_expression:
+        :param prefetch: number of result pages requested ahead on a worker thread (default: 0, disabled)
+        :param raw: if True, iterate raw page objects(dict) and skip creating 'Page'.
+        :param columns: ('column_name1', 'column_name2'...) only these properties are returned by the api.
         :return: 'pages iterator'
         """
         filter_ins: Union[filter, None] = self._query_helper.query_by_expression(query_expression)
 
         # todo: sorts implement
         sorts_ins: Union[filter, None] = None
-        return self._filter_and_sort(notion_filter=filter_ins, sorts=sorts_ins)
+        return self._filter_and_sort(notion_filter=filter_ins, sorts=sorts_ins, prefetch=prefetch, raw=raw,
+                                     columns=columns)
+
+    def invalidate_query_cache(self) -> int:
+        """
+        remove compiled query expressions of the current schema. The schema version changes when the database is
+        refreshed with a new schema, so this is needed only when properties are changed without refreshing.
+
+        :return: number of removed filters
+        """
+        return self._query_helper.invalidate()
+
+    def query_values(self, query_expression: str, columns_select: Optional[List[str]] = None,
+                     prefetch: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        query with simple 'python expression' and yield simple values of each page. Same values as
+        'Page.get_properties()' without creating 'Page'.
+
+        :param query_expression:
+        :param columns_select: ('column_name1', 'column_name2'...) (default: all)
+        :param prefetch: number of result pages requested ahead on a worker thread
+        :return: iterator of {'key': value, ...}
+
+        Usage:
+
+        for row in database.query_values('Status', ('Name', 'Status')):
+            ...
+        """
+        decoder: RowDecoder = self.compile_decoder(columns_select)
+        for data in self.query(query_expression, prefetch=prefetch, raw=True, columns=columns_select):
+            yield decoder.decode_dict(data)
+
+    def sync(self, state: Optional[SyncState] = None, raw: bool = False, columns: Optional[List[str]] = None,
+             prefetch: int = 0) -> SyncResult:
+        """
+        request pages edited since 'state' (see 'notionizer.sync'). Pages are requested with 'last_edited_time'
+        filter and sort, so the cost is proportional to the number of changed pages.
+
+        :param state: 'SyncState' of the last run (default: None, all pages are 'inserted')
+        :param raw: if True, records are raw page objects(dict) instead of 'Page'
+        :param columns: ('column_name1', 'column_name2'...) only these properties are returned by the api.
+        :param prefetch: number of result pages requested ahead on a worker thread
+        :return: SyncResult ('inserted', 'updated' and new 'state')
+
+        Usage:
+
+        result = database.sync(state)
+        save(result.state.to_dict())
+        """
+        state = state if state else SyncState()
+        notion_filter: Optional[filter] = None
+        if state.watermark:
+            condition = filter_date(filter_date.TYPE_LAST_EDITED_TIME, '').on_or_after(state.watermark)
+            notion_filter = filter().add(condition)
+        sort = sorts().add(sort_by_timestamp(sorts.LAST_EDITED_TIME, sorts.ASCENDING))
+
+        result = SyncResult(state)
+        iterator = self._filter_and_sort(notion_filter=notion_filter, sorts=sort, prefetch=prefetch, raw=True,
+                                         columns=columns)
+        for data in iterator.iter_raw():
+            kind = result.classify(data)
+            if kind:
+                result.add(kind, data if raw else Page(self._request, data))
+        _log.debug(f"{self}: {result}")
+        return result
+
+    def compile_decoder(self, columns: Optional[List[str]] = None) -> RowDecoder:
+        """
+        compile 'RowDecoder' for the schema of database. Decoders are cached by columns and renewed when the
+        database is refreshed.
+
+        :param columns: ('column_name1', 'column_name2'...) (default: all)
+        :return: RowDecoder
+
+        Usage:
+
+        decoder = database.compile_decoder(['Name', 'Status'])
+        rows = [decoder(data) for data in database.query('Status', raw=True)]
+        """
+        keys: Tuple[str, ...] = tuple(columns) if columns else (*self.properties.keys(),)
+        if keys not in self._decoders:
+            schema = list()
+            for name in keys:
+                assert name in self.properties, f"'{name}' property not in the database '{self.title}'."
+                schema.append((name, str(self.properties[name].type)))
+            self._decoders[keys] = RowDecoder(schema)
+        return self._decoders[keys]
 
     def _filter_and_sort(self, notion_filter: Optional[T_Filter] = None, sorts: Optional[T_Sorts] = None,
-                         start_cursor: Optional[int] = None, page_size: Optional[int] = None) -> QueriedPageIterator:
+                         start_cursor: Optional[int] = None, page_size: Optional[int] = None,
+                         prefetch: int = 0, raw: bool = False,
+                         columns: Optional[List[str]] = None) -> QueriedPageIterator:
         """
         Args:
             notion_filter: query.filter
             sorts: query.sorts
             start_cursor: string
             page_size: int (Max:100)
+            prefetch: number of result pages requested ahead on a worker thread
+            raw: if True, iterator returns raw page objects(dict)
+            columns: names of properties returned by the api. (default: all)
 
         Returns: 'pages iterator'
         """
@@ -244,7 +516,43 @@ class Database(NotionUpdateObject):
 
         id_raw = str(self.id).replace('-', '')
         url = f'{self._api_url}{id_raw}/query'
-        return QueriedPageIterator(self._request, url, payload)
+        if columns:
+            url += '?' + self._get_filter_properties(columns)
+        return QueriedPageIterator(self._request, url, payload, prefetch=prefetch, raw=raw, columns=columns)
+
+    def _get_filter_properties(self, columns: List[str]) -> str:
+        """
+        query string which asks api to return only 'columns' properties.
+
+        :param columns: names of properties
+        :return: 'filter_properties=id1&filter_properties=id2...'
+        """
+        query_list: List[str] = list()
+        for name in columns:
+            assert name in self.properties, f"'{name}' property not in the database '{self.title}'."
+            property_id = str(self.properties[name].id)
+            query_list.append('filter_properties=' + parse.quote(property_id, safe=''))
+        return '&'.join(query_list)
+
+    def _get_columns(self, queried_page_iterator: QueriedPageIterator, columns_select: List[str]) -> Tuple[str, ...]:
+        """
+        names of exported columns. Projected query has only its own columns.
+        """
+        if columns_select:
+            return tuple(columns_select)
+        elif getattr(queried_page_iterator, 'columns', None):
+            return tuple(queried_page_iterator.columns)  # type: ignore
+        else:
+            return (*self.properties.keys(),)
+
+    @staticmethod
+    def _iter_rows(queried_page_iterator: QueriedPageIterator) -> Iterator[Any]:
+        """
+        iterate queried pages without creating 'Page' if possible.
+        """
+        if isinstance(queried_page_iterator, QueriedPageIterator):
+            return queried_page_iterator.iter_raw()
+        return iter(queried_page_iterator)
 
     def get_as_tuples(self, queried_page_iterator: QueriedPageIterator, columns_select: list=[], header=True):
         """
@@ -257,17 +565,14 @@ class Database(NotionUpdateObject):
 
         database.get_tuples(database.query())
         database.get_tuples(database.query(), ('column_name1', 'column_name2'), header=False)
-        """
-        result = list()
 
-        if columns_select:
-            keys = tuple(columns_select)
-        else:
-            keys = (*self.properties.keys(),)
+        # only selected properties are requested and decoded.
+        database.get_tuples(database.query('column_name1', columns=['column_name1', 'column_name2']))
+        """
+        keys = self._get_columns(queried_page_iterator, columns_select)
+        decoder: RowDecoder = self.compile_decoder(list(keys))
 
-        for page in queried_page_iterator:
-            values = page.get_properties()
-            result.append(tuple([values[k] for k in keys]))
+        result: List[Any] = [decoder.decode(row) for row in self._iter_rows(queried_page_iterator)]
         if not result:
             return tuple()
 
@@ -288,20 +593,42 @@ class Database(NotionUpdateObject):
         database.get_tuples(database.query())
         database.get_tuples(database.query(), ('column_name1', 'column_name2'), header=False)
         """
-        result = list()
+        keys = self._get_columns(queried_page_iterator, columns_select)
+        decoder: RowDecoder = self.compile_decoder(list(keys))
 
-        if columns_select:
-            keys = tuple(columns_select)
-        else:
-            keys = (*self.properties.keys(),)
-        for page in queried_page_iterator:
-            values = page.get_properties()
-            result.append({k: values[k] for k in keys})
+        result = [decoder.decode_dict(row) for row in self._iter_rows(queried_page_iterator)]
         if not result:
             return tuple()
 
         return tuple(result)
 
+    def get_as_columns(self, queried_page_iterator: QueriedPageIterator,
+                       columns_select: Optional[List[str]] = None) -> ColumnarStore:
+        """
+        change QueriedPageIterator as NumPy arrays per property (requires numpy, see 'notionizer.columnar').
+        :param queried_page_iterator: QueriedPageIterator() or iterable of raw page object and 'Page'
+        :param columns_select: ('column_name1', 'column_name2'...)
+        :return: ColumnarStore
+
+        Usage:
+
+        store = database.get_as_columns(database.query('Name', columns=['Name', 'Count']))
+        pages_ids = store.ids[store.mask(filter().add(filter_number('Count').greater_than(3)))]
+        """
+        keys = self._get_columns(queried_page_iterator, columns_select or [])
+        return ColumnarStore.from_database(self, self._iter_rows(queried_page_iterator), keys)
+
+    def compile_converter(self) -> PageConverter:
+        """
+        compile 'PageConverter' for the schema of database. The converter is renewed when the database is refreshed.
+
+        :return: PageConverter
+        """
+        if self._converter is None:
+            self._converter = PageConverter(str(self.id), {k: self.properties[k] for k in self.properties.keys()},
+                                            str(self.title))
+        return self._converter
+
     def create_page(self, properties: dict = {}):
         """
         Create 'new page' in the database.
@@ -311,24 +638,137 @@ class Database(NotionUpdateObject):
         """
 
         url = 'v1/pages/'
+        payload = self.compile_converter().convert(properties)
+        return Page(*self._request.post(url, payload))
 
-        payload = dict()
-        payload['parent'] = {'database_id': self.id}
-        payload['properties'] = dict(properties)
+    def create_pages(self, rows: Iterable[Dict[str, Any]],
+                     concurrency: int = notionizer.settings.BULK_CONCURRENCY, raw: bool = False) -> BulkOperation:
+        """
+        Create 'new pages' in the database concurrently.
 
-        if properties:
-            for key, value in properties.items():
+        All rows are validated and converted before the first request. Rows with invalid values are not sent and
+        reported as failures. Requests share the rate limiter of 'Notion'.
 
-                assert key in self.properties, f"'{key}' property not in the database '{self.title}'."
-                db_property: DbPropertyObject = self.properties[key]
-                assert db_property._mutable is True, f"{db_property}('{key}') property is 'Immutable Property'"
-                assert type(value) in db_property._input_validation, f"type of '{value}' is '{type(value)}'. " \
-                    f"{db_property}('{key}') property has type {db_property._input_validation}"
+        Pages are created while the returned operation is consumed. Iterate it or call '.wait()'; otherwise
+        nothing is sent.
 
-                value_converted = db_property._convert_to_update(value)
-                payload['properties'][key] = value_converted
+        :param rows: iterable of 'dictionay' type for database property
+        :param concurrency: maximum number of concurrent requests
+        :param raw: if True, 'BulkResult.page' is raw page object(dict) instead of 'Page'
+        :return: 'BulkOperation' which yields 'BulkResult' in order of 'rows'. (see 'BulkOperation.report')
 
-        return Page(*self._request.post(url, payload))
+        Usage:
+
+        operation = database.create_pages([{'Name': 'a'}, {'Name': 'b'}], concurrency=4)
+        pages = [result.page for result in operation if result.ok]
+        print(operation.report)
+
+        print(database.create_pages(rows).wait())
+        """
+        converter: PageConverter = self.compile_converter()
+        results: List[BulkResult] = list()
+        for index, row in enumerate(rows):
+            try:
+                results.append(BulkResult(index, row, payload=converter.convert(row)))
+            except AssertionError as e:
+                results.append(BulkResult(index, row, error=e))
+
+        request: HttpRequest = self._request
+
+        def send(result: BulkResult) -> Dict[str, Any]:
+            return request.post('v1/pages/', result.payload)[1]
+
+        def wrap(data: Dict[str, Any]) -> Any:
+            return data if raw else Page(request, data)
+
+        return BulkOperation(results, send, wrap, concurrency)
+
+    def update_pages(self, updates: Iterable[Tuple[Any, Dict[str, Any]]],
+                     concurrency: int = notionizer.settings.BULK_CONCURRENCY, raw: bool = False) -> BulkOperation:
+        """
+        Update properties of pages in the database concurrently.
+
+        Changes of the same page are coalesced into one request (later change wins). Values equal to the cached
+        'Page' instance (identity map) are dropped, and pages without any change are not requested. All changes
+        are validated and converted before the first request.
+
+        Pages are updated while the returned operation is consumed. Iterate it or call '.wait()'; otherwise
+        nothing is sent.
+
+        :param updates: iterable of (page_id or 'Page', {'property_name': value, ...})
+        :param concurrency: maximum number of concurrent requests
+        :param raw: if True, 'BulkResult.page' is raw page object(dict) instead of 'Page'
+        :return: 'BulkOperation' which yields 'BulkResult' for each page in order of first appearance.
+            'BulkResult.row' is (page_id, coalesced changes).
+
+        Usage:
+
+        operation = database.update_pages((page, {'Status': {'name': 'Done'}}) for page in database.query(...))
+        print(operation.wait())
+        """
+        coalesced: Dict[str, Dict[str, Any]] = dict()
+        for page_or_id, changes in updates:
+            page_id = str(page_or_id.id) if isinstance(page_or_id, Page) else str(page_or_id)
+            coalesced.setdefault(page_id, dict()).update(changes)
+
+        converter: PageConverter = self.compile_converter()
+        results: List[BulkResult] = list()
+        for index, (page_id, changes) in enumerate(coalesced.items()):
+            result = BulkResult(index, (page_id, changes))
+            cached: Optional[Page] = NotionUpdateObject._instances.get(page_id)
+            if cached is not None:
+                result.page = cached
+                changes = _drop_unchanged(cached, changes)
+            if not changes:
+                result.unchanged = True
+            else:
+                try:
+                    result.payload = {'properties': converter.convert_properties(changes)}
+                except AssertionError as e:
+                    result.error = e
+            results.append(result)
+
+        request: HttpRequest = self._request
+
+        def send(result: BulkResult) -> Dict[str, Any]:
+            return request.patch(Page._api_url + result.row[0], result.payload)[1]
+
+        def wrap(data: Dict[str, Any]) -> Any:
+            if raw:
+                return data
+            cached: Optional[Page] = NotionUpdateObject._instances.get(str(data['id']))
+            if cached is None:
+                return Page(request, data)
+            cached._refresh(request, data)
+            return cached
+
+        return BulkOperation(results, send, wrap, concurrency)
+
+
+def _simple_value(value: Any) -> Any:
+    """
+    input value of 'create_page' in the form of 'Page.get_properties()'. (ex: {'name': 'Done'} -> 'Done')
+    """
+    if isinstance(value, dict) and list(value) == ['name']:
+        return value['name']
+    if isinstance(value, list) and all(isinstance(e, dict) and list(e) == ['name'] for e in value):
+        return tuple(e['name'] for e in value)
+    return value
+
+
+def _drop_unchanged(page: Page, changes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    remove changes which are equal to current values of 'page'. Values which could not be compared are kept.
+    """
+    current: Dict[str, Any] = page.get_properties([k for k in changes if k in page.properties.keys()])
+    result = dict()
+    for key, value in changes.items():
+        simple = _simple_value(value)
+        if key in current and type(simple) in (str, int, float, bool, tuple) and current[key] == simple \
+                and type(current[key]) is type(simple):
+            continue
+        result[key] = value
+    return result
 
 
 class Property:
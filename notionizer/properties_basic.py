@@ -93,7 +93,7 @@ class PagePropertyObject(PropertyBaseObject):
         return f"<'{self.__class__.__name__}: {self._name}' at {hex(id(self))}>"
 
     def _update(self, property_name: str, data: Dict[str, Any]) -> None:
-        self._parent._update(self.name, {property_name: data})
+        self._parent._update(self._name, {property_name: data})
 
     def get_value(self):
 
@@ -142,9 +142,11 @@ class DbPropertyObject(PropertyBaseObject):
         else:
             self._parent._update(self.name, {property_name: data})
 
-    def _convert_to_update(self, value: Any) -> Dict[str, Any]:
+    @classmethod
+    def _convert_to_update(cls, value: Any) -> Dict[str, Any]:
         """
-        convert value to update object form.
+        convert value to update object form. (classmethod: page properties convert values with the class of
+        database property)
 
         to make some more specific, 'inheritance' should overide this method.
 
@@ -154,7 +156,7 @@ class DbPropertyObject(PropertyBaseObject):
         :param value: nay of type
         :return: dictionary
         """
-        return {self._type_defined: value}
+        return {cls._type_defined: value}
 
     def __repr__(self) -> str:
         return f"<'{self.__class__.__name__}: {self.name}' at {hex(id(self))}>"
\ No newline at end of file
@@ -152,17 +152,18 @@ class DbPropertyText(DbPropertyObject):
     _mutable = True
     _input_validation = (str, list)
 
-    def _convert_to_update(self, value: Any) -> Any:
+    @classmethod
+    def _convert_to_update(cls, value: Any) -> Any:
         """
         convert value to 'text' update from.
 
-        :param value: str or list
+        :param value: str or list('rich text' array)
         :return: dictionary
         """
         if type(value) is str:
             return {'rich_text': from_plain_text_to_rich_text_array(value)}
         elif type(value) is list:
-            return value
+            return {'rich_text': value}
 
 
 class DbPropertyTitle(DbPropertyObject):
@@ -174,13 +175,16 @@ class DbPropertyTitle(DbPropertyObject):
     _input_validation = (str, list)
     title = TitleProperty()
 
-    def _convert_to_update(self, value: str) -> Dict[str, Any]:
+    @classmethod
+    def _convert_to_update(cls, value: Any) -> Dict[str, Any]:
         """
         convert value to 'title' update from.
 
-        :param value: str
+        :param value: str or list('rich text' array)
         :return: dictionary
         """
+        if type(value) is list:
+            return {'title': value}
         return {'title': from_plain_text_to_rich_text_array(value)}
 
 
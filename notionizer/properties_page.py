@@ -3,7 +3,7 @@ from notionizer.functions import parse_date_object
 from notionizer.object_adt import MutableProperty
 from notionizer.properties_basic import PagePropertyObject
 from notionizer.object_basic import UserBaseObject
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Iterable
 
 
 def parse_value_object(obj: Any) -> Any:
@@ -25,6 +25,70 @@ def parse_value_object(obj: Any) -> Any:
         return value
 
 
+def parse_plain_value(value: Any) -> Any:
+    """
+    parse raw value of page property like 'PagePropertyObject.get_value'.
+
+    - object with 'name' (select, user...): name
+    - array: tuple of 'name' or 'id' of each element (multi_select, people, relation, files)
+    - others: raw value
+    """
+    if isinstance(value, dict):
+        if 'name' in value:
+            return value['name'].replace(u'\xa0', u' ')
+        return value
+
+    elif isinstance(value, list):
+        result = []
+        for e in value:
+            if isinstance(e, dict) and 'name' in e:
+                result.append(e['name'].replace(u'\xa0', u' '))
+            elif isinstance(e, dict) and 'id' in e:
+                result.append(e['id'])
+            else:
+                result.append(e)
+        return tuple(result)
+    else:
+        return value
+
+
+"""
+raw value parsers for 'page property object'. Types not in the mapper use 'parse_plain_value'.
+"""
+page_property_value_parsers: Dict[str, Callable[[Any], Any]] = {
+    'title': from_rich_text_array_to_plain_text,
+    'rich_text': from_rich_text_array_to_plain_text,
+    'date': parse_date_object,
+    'formula': parse_value_object,
+    'rollup': parse_value_object,
+}
+
+
+def parse_page_property(data: Dict[str, Any]) -> Any:
+    """
+    return simple value of raw 'page property object' without creating 'PagePropertyObject'.
+
+    :param data: {'id': ..., 'type': 'number', 'number': 3}
+    :return: value
+    """
+    property_type: str = data['type']
+    parser = page_property_value_parsers.get(property_type, parse_plain_value)
+    return parser(data[property_type])
+
+
+def parse_page_properties(properties: Dict[str, Any], columns: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    return simple values of raw 'properties' of page object. Same result as 'Page.get_properties()'.
+
+    :param properties: 'properties' of raw page object
+    :param columns: names of properties to parse (default: all)
+    :return: {'key': value, ...}
+    """
+    if columns is None:
+        columns = properties.keys()
+    return {k: parse_page_property(properties[k]) for k in columns}
+
+
 class PagePropertyPhoneNumber(PagePropertyObject):
     """
     'PagePropertyPhoneNumber'
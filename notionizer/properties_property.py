@@ -15,8 +15,8 @@ class PropertiesProperty(DictionaryObject, ImmutableProperty):
     """
 
     """
-    '_parent' property is assigned with every '__get__' and '__set__' method call event for pointing to
-    proper '_data' object.
+    descriptor is shared by every instance of the class. '__get__' and '__set__' work on a copy bound to the
+    instance, so that '_parent' and '_mutable' of other threads are not changed.
     """
     _parent: Any
 
@@ -48,10 +48,27 @@ class PropertiesProperty(DictionaryObject, ImmutableProperty):
 
     def __get__(self, owner: object, object_type: Optional[object] = None) -> 'PropertiesProperty':
         """
-        before call '__set_item__' or '__get_item__' method, install call itself by '__get__' method.
+        return the copy bound to 'owner'. The copy is kept in the instance.
+        """
+        if owner is None:
+            return self
+        bound: Optional[PropertiesProperty] = vars(owner).get(self._bound_name)
+        if bound is None:
+            bound = object.__new__(type(self))
+            vars(bound).update(vars(self))
+            bound._parent = owner
+            setattr(owner, self._bound_name, bound)
+        return bound
+
+    @property
+    def _bound_name(self) -> str:
+        return '__bound_' + self.name
+
+    def _bind(self, owner: object) -> None:
+        """
+        point the bound copy to 'owner'. (ex: namespace of refreshed instance is moved to the cached one)
         """
         self._parent = owner
-        return self
 
     def __set__(self, owner, value: DictionaryObject):
 
@@ -59,34 +76,56 @@ class PropertiesProperty(DictionaryObject, ImmutableProperty):
 
         if not self._check_assigned(owner):
             setattr(owner, self.private_name, dict())
-        mutable_status = self._mutable
-        self._parent = owner
-        self._mutable = True
+        if self._parent_object_type not in ['database', 'page']:
+            raise NotImplementedError(f"'{self._parent_object_type}' object is not implemented")
+
+        bound = self.__get__(owner)
+        bound._mutable = True
+        try:
+            for k, v in value.items():
+                # page keeps 'raw property object' and creates 'PagePropertyObject' on first access.
+                if self._parent_object_type == 'page':
+                    bound.__setitem__(k, v)
+                else:
+                    bound.__setitem__(k, bound._create_property(k, v))
+        finally:
+            bound._mutable = self._mutable
+
+    def __getitem__(self, key: str) -> PropertyBaseObject:
+        value = self._data[key]
+        if type(value) is dict:
+            value = self._create_property(key, value)
+            self._data[key] = value
+        return value
+
+    def _create_property(self, name: str, data: Dict[str, Any]) -> PropertyBaseObject:
+        """
+        create proper 'PropertyBaseObject' for raw property object.
+
+        :param name: property name
+        :param data: raw property object
+        :return: PropertyBaseObject
+        """
         if self._parent_object_type == 'database':
             properties_mapper = database_properties_mapper
-        elif self._parent_object_type == 'page':
-            properties_mapper = page_properties_mapper
         else:
-            raise NotImplementedError(f"'{self._parent_object_type}' object is not implemented")
+            properties_mapper = page_properties_mapper
 
-        for k, v in value.items():
-            property_type: str = v['type']
-            if self._parent_object_type == 'database' and property_type == 'rich_text':
-                property_type = 'text'
-
-            if property_type in properties_mapper:
-
-                property_cls: PropertyBaseObject = properties_mapper.get(property_type)
-                property_ins: PropertyBaseObject = property_cls(self, v, parent_type=self._parent_object_type, name=k)
-            else:
-                if self._parent_object_type == 'database':
-                    property_ins: DbPropertyObject = DbPropertyObject(self, v, parent_type=self._parent_object_type,
-                                                                      force_new=True, name=k)
-                elif self._parent_object_type == 'page':
-                    property_ins: PagePropertyObject = PagePropertyObject(self, v, parent_type=self._parent_object_type,
-                                                                          force_new=True, name=k)
-            self.__setitem__(k, property_ins)
-        self._mutable = mutable_status
+        property_type: str = data['type']
+        if self._parent_object_type == 'database' and property_type == 'rich_text':
+            property_type = 'text'
+
+        property_ins: PropertyBaseObject
+        if property_type in properties_mapper:
+            property_cls: PropertyBaseObject = properties_mapper.get(property_type)
+            property_ins = property_cls(self, data, parent_type=self._parent_object_type, name=name)
+        elif self._parent_object_type == 'database':
+            property_ins = DbPropertyObject(self, data, parent_type=self._parent_object_type, force_new=True,
+                                            name=name)
+        else:
+            property_ins = PagePropertyObject(self, data, parent_type=self._parent_object_type, force_new=True,
+                                              name=name)
+        return property_ins
 
     def _update(self, property_name, data):
         """
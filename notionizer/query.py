@@ -51,9 +51,14 @@ import copy
 import abc
 import ast
 import _ast
+import collections
+import hashlib
+import logging
+import threading
 import time
 
 from notionizer import properties_basic
+from notionizer import settings
 from notionizer.properties_basic import DbPropertyObject
 from notionizer.functions import pdir
 from notionizer.exception import NotionApiQueoryException
@@ -310,7 +315,7 @@ class filter_text(FilterConditionEquals,
         """
 
         Args:
-            string: case sensitive
+            string: case insensitive
 
         Returns:
 
@@ -322,7 +327,7 @@ class filter_text(FilterConditionEquals,
         """
 
         Args:
-            string: case sensitive
+            string: case insensitive
 
         Returns:
 
@@ -334,7 +339,7 @@ class filter_text(FilterConditionEquals,
         """
 
         Args:
-            string: case sensitive
+            string: case insensitive
 
         Returns:
 
@@ -345,7 +350,7 @@ class filter_text(FilterConditionEquals,
     def ends_with(self, string: str) -> 'filter_text':
         """
         Args:
-            string: case sensitive
+            string: case insensitive
 
         Returns:
         """
@@ -551,6 +556,10 @@ class filter_multi_select(FilterConditionContains, FilterConditionEmpty):
 class filter_date(FilterConditionEmpty):
     data_type = 'date'
 
+    TYPE_DATE = 'date'
+    TYPE_CREATED_TIME = 'created_time'
+    TYPE_LAST_EDITED_TIME = 'last_edited_time'
+
     def __init__(self, property_type: str, property_name: str, timezone: Optional[str] = ''):
         """
 
@@ -988,12 +997,15 @@ class sorts:
         """
         self._body: List[Any] = []
 
-    def add(self, sort_obj: Type[SortObject]) -> 'sorts':
-        assert issubclass(sort_obj, SortObject)
-        self._body.append(dict(sort_obj._body))
+    def add(self, sort_obj: SortObject) -> 'sorts':
+        assert isinstance(sort_obj, SortObject), 'type: ' + str(type(sort_obj))
+        self._body.append(sort_obj.get_body())
 
         return self
 
+    def get_body(self) -> List[Dict[str, Any]]:
+        return copy.deepcopy(self._body)
+
 
 class sort_by_timestamp(SortObject):
 
@@ -1209,7 +1221,7 @@ def display_ast_tree(node: T_Node, indent: int = 0, key: str = '') -> None:
     if hasattr(node, 'value'):
         content += f" value:{node.value}"  # type: ignore
 
-    log.info(content)
+    log.debug(content)
 
     if isinstance(node, list):
         for e in node:
@@ -1242,6 +1254,7 @@ class Query:
         self.properties = db_properties
         self._error_with_expr = ''
         self.expression = ''
+        self.schema_version = get_schema_version(db_properties)
 
     def parse_unaryop(self, expr: _ast.UnaryOp) -> filter:
         """
@@ -1367,8 +1380,14 @@ class Query:
         search object and call proper function
         """
 
-        node: _ast.Module = ast.parse(expression)
-        display_ast_tree(node)
+        return self.parse_node(ast.parse(expression))
+
+    def parse_node(self, node: _ast.Module) -> filter:
+        """
+        create 'filter' from parsed 'Module' node of expression.
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            display_ast_tree(node)
         assert check_ast_type(node, 'Module'), f"{self.get_error_comment(node)} Invalid expression"
         assert len(node.body) == 1, f"{self.get_error_comment(node)} Invalid expression"
 
@@ -1439,8 +1458,17 @@ class Query:
         assert prop_name in self.properties, f"{self.get_error_comment(expr)} Wrong property name."
         prop_obj: properties_basic.DbPropertyObject = self.properties[prop_name]
         prop_type = prop_obj._type_defined
+        # 'filter_text', 'filter_date' and 'filter_people' require the type of property before the name.
         if prop_type == 'title':
-            prop_type = 'text'
+            return prop_obj, filter_text(filter_text.TYPE_TITLE, prop_name)
+        if prop_type == 'text':
+            return prop_obj, filter_text(filter_text.TYPE_RICHTEXT, prop_name)
+        if prop_type in ('url', 'email', 'phone_number'):
+            return prop_obj, filter_text(prop_type, prop_name)
+        if prop_type == 'date':
+            return prop_obj, filter_date(filter_date.TYPE_DATE, prop_name)
+        if prop_type == 'people':
+            return prop_obj, filter_people(filter_people.TYPE_PEOPLE, prop_name)
         filter_name: str = f'filter_{prop_type}'
         assert filter_name in globals()
         filter_cls: Type[T_Filter] = globals()[filter_name]  # type: ignore
@@ -1463,19 +1491,131 @@ class Query:
 
     def query_by_expression(self, expression: str) -> filter:
         """
-        create 'filter' and 'sorts' object with 'python expression'
+        create 'filter' and 'sorts' object with 'python expression'. Compiled filters are cached by schema version
+        and expression (see 'ExpressionCache'), so the same expression is not parsed again.
 
         :param expression: str
-        :return: (filter, sorts)
+        :return: filter
+        """
+        cache = get_expression_cache()
+        key = (self.schema_version, expression)
+        result: Optional[filter] = cache.get(key)
+        if result is None:
+            self.expression = f"{expression}"
+            self._error_with_expr = f"'{expression}' is invalid expression."
+            node: _ast.Module = ast.parse(expression)
+            # expressions which differ only in spaces or parentheses share the compiled filter.
+            # the miss is already counted by the lookup of 'expression'.
+            normalized_key = (self.schema_version, ast.dump(node))
+            result = cache.peek(normalized_key)
+            if result is None:
+                result = self.parse_node(node)
+                log.debug(f"{expression}: {result.get_body()}")
+                cache.set(normalized_key, result)
+            cache.set(key, result)
+        # cached filter is shared. caller could modify the copy.
+        return copy.deepcopy(result)
+
+    def invalidate(self) -> int:
+        """
+        remove compiled filters of the schema from the cache.
+
+        :return: number of removed filters
+        """
+        return get_expression_cache().invalidate(self.schema_version)
+
+
+"""
+EXPRESSION CACHE
+"""
+
+
+def get_schema_version(db_properties: Any) -> str:
+    """
+    fingerprint of property names and types. Filters compiled for a schema are valid while it does not change.
+
+    :param db_properties: PropertiesProperty of 'Database'
+    :return: str
+    """
+    schema = sorted((str(name), str(prop.type)) for name, prop in db_properties.items())
+    return hashlib.sha1(repr(schema).encode('utf-8')).hexdigest()[:16]
+
+
+class ExpressionCache:
+    """
+    Thread safe LRU cache of compiled 'filter' by (schema version, expression).
+    """
+
+    def __init__(self, max_size: int = settings.QUERY_CACHE_SIZE) -> None:
+        """
+
+        :param max_size: maximum number of compiled filters
+        """
+        assert 0 < max_size, "'max_size' should be positive"
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data: 'collections.OrderedDict[Tuple[str, str], filter]' = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[filter]:
+        with self._lock:
+            result = self._data.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+            return result
+
+    def peek(self, key: Tuple[str, str]) -> Optional[filter]:
         """
-        self.expression = f"{expression}"
+        'get' without counting hits and misses.
+        """
+        with self._lock:
+            result = self._data.get(key)
+            if result is not None:
+                self._data.move_to_end(key)
+            return result
+
+    def set(self, key: Tuple[str, str], result: filter) -> None:
+        with self._lock:
+            self._data[key] = result
+            self._data.move_to_end(key)
+            while self.max_size < len(self._data):
+                self._data.popitem(last=False)
+
+    def invalidate(self, schema_version: Optional[str] = None) -> int:
+        """
+        remove compiled filters.
+
+        :param schema_version: remove only filters of this schema (default: None, all)
+        :return: number of removed filters
+        """
+        with self._lock:
+            keys = [k for k in self._data if schema_version is None or k[0] == schema_version]
+            for k in keys:
+                del self._data[k]
+            return len(keys)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        :return: {'size': int, 'hits': int, 'misses': int}
+        """
+        with self._lock:
+            return {'size': len(self._data), 'hits': self.hits, 'misses': self.misses}
 
-        self._error_with_expr = f"'{expression}' is invalid expression."
 
-        result: filter = self.parse_module(expression)  # type: ignore
-        log.info(f"{expression}: {result.get_body()}")
-        # assert result._body['or'], f"{result._body['or']}"
-        return result
+_expression_cache = ExpressionCache()
 
 
+def get_expression_cache() -> ExpressionCache:
+    return _expression_cache
 
+
+def set_expression_cache(cache: ExpressionCache) -> None:
+    """
+    replace cache of compiled filters. (ex: ExpressionCache(max_size=1024))
+    """
+    global _expression_cache
+    _expression_cache = cache
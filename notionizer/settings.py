@@ -1,3 +1,44 @@
 MODULE_NAME = 'notionizer'
 BASE_URL = 'https://api.notion.com/'
 NOTION_VERSION = '2022-02-22'
+
+# connection pool of 'HttpRequest'
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+POOL_BLOCK = False
+
+# rate limit of 'RequestScheduler'
+RATE_LIMIT = 3
+RATE_BURST = 3
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30
+
+# thread pool size of 'AsyncNotion'
+ASYNC_MAX_WORKERS = 8
+
+# maximum number of concurrent requests for related databases of 'Database'
+RELATION_MAX_WORKERS = 4
+
+# maximum number of concurrent requests of bulk operations (ex: 'Database.create_pages')
+BULK_CONCURRENCY = 4
+
+# maximum number of compiled query expressions cached by 'Query'
+QUERY_CACHE_SIZE = 256
+
+# page size and maximum number of concurrent children requests of block traversal ('BlockWalker')
+BLOCK_PAGE_SIZE = 100
+BLOCK_CONCURRENCY = 4
+
+# limits of appending block children ('BlockAppender'): children per request, blocks per request including
+# nested children and levels of nested children
+BLOCK_APPEND_SIZE = 100
+BLOCK_APPEND_MAX_BLOCKS = 1000
+BLOCK_APPEND_NESTING = 2
+
+# maximum number of pages exported at once by 'MarkdownExporter'
+MARKDOWN_CONCURRENCY = 4
+
+# limits of rich text in a request: length of 'text.content' and objects of a rich text array
+RICH_TEXT_MAX_LENGTH = 2000
+RICH_TEXT_MAX_ELEMENTS = 100
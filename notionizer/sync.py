@@ -0,0 +1,120 @@
+"""
+Incremental Sync
+
+'Database.sync' requests only pages edited since the watermark of the last run, sorted by 'last_edited_time'.
+'last_edited_time' of Notion is rounded (to the minute), so a page edited again in the minute of the watermark
+keeps the same time. Pages edited exactly at the watermark are therefore returned again as 'updated' (records should
+be upserted). 'boundary_ids' tells them apart from pages created in that minute, which are 'inserted'.
+
+Archived (deleted) pages are not returned by the query, so they are not detected.
+
+[Usage]
+
+state = SyncState.from_dict(json.load(f)) if saved else None
+result = database.sync(state)
+for page in result.inserted: ...
+for page in result.updated: ...
+json.dump(result.state.to_dict(), f)
+"""
+
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+
+_log = __import__('logging').getLogger(__name__)
+
+INSERTED = 'inserted'
+UPDATED = 'updated'
+
+
+class SyncState:
+    """
+    persisted position of 'Database.sync'.
+
+    watermark: the latest 'last_edited_time' seen (ISO 8601 string). None before the first sync.
+    boundary_ids: ids of pages seen with 'last_edited_time' equal to 'watermark'
+    """
+
+    def __init__(self, watermark: Optional[str] = None, boundary_ids: Iterable[str] = ()):
+        self.watermark = watermark
+        self.boundary_ids: Set[str] = set(boundary_ids)
+
+    def __repr__(self) -> str:
+        return f"<'{self.__class__.__name__}: {self.watermark} ({len(self.boundary_ids)} boundary ids)'>"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, SyncState) and (self.watermark, self.boundary_ids) == \
+            (other.watermark, other.boundary_ids)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        json serializable form.
+        :return: {'watermark': str or None, 'boundary_ids': [str, ...]}
+        """
+        return {'watermark': self.watermark, 'boundary_ids': sorted(self.boundary_ids)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SyncState':
+        return cls(data.get('watermark'), data.get('boundary_ids', ()))
+
+
+class SyncResult:
+    """
+    result of 'Database.sync'.
+
+    inserted: pages created after the previous sync
+    updated: pages created before and edited after the previous sync
+    state: new 'SyncState' to persist for the next run
+    scanned: number of pages returned by the api
+    """
+
+    def __init__(self, previous: SyncState):
+        self.previous = previous
+        self.inserted: List[Any] = list()
+        self.updated: List[Any] = list()
+        self.scanned = 0
+        self.state = SyncState(previous.watermark, previous.boundary_ids)
+
+    def __repr__(self) -> str:
+        return f"<'{self.__class__.__name__}: {len(self.inserted)} inserted, {len(self.updated)} updated, " \
+               f"{self.scanned} scanned'>"
+
+    def classify(self, data: Dict[str, Any]) -> Optional[str]:
+        """
+        classify raw page object and advance the watermark.
+
+        :param data: raw page object
+        :return: 'inserted', 'updated' or None (already synced)
+            pages edited at the previous watermark are 'updated' again: they could be edited later in the same minute.
+        """
+        self.scanned += 1
+        previous = self.previous
+        page_id = str(data['id'])
+        edited: str = data['last_edited_time']
+        created: str = data['created_time']
+
+        if previous.watermark is not None:
+            # timestamps of the api have the same format, so they are compared as strings.
+            if edited < previous.watermark:
+                return None
+
+        state = self.state
+        if state.watermark is None or state.watermark < edited:
+            state.watermark = edited
+            state.boundary_ids = {page_id}
+        elif edited == state.watermark:
+            state.boundary_ids.add(page_id)
+
+        if previous.watermark is None or previous.watermark < created or \
+                (created == previous.watermark and page_id not in previous.boundary_ids):
+            return INSERTED
+        return UPDATED
+
+    def add(self, kind: str, record: Any) -> None:
+        if kind == INSERTED:
+            self.inserted.append(record)
+        else:
+            self.updated.append(record)
@@ -0,0 +1,234 @@
+"""
+TRANSPORT
+
+'HttpRequest' sends requests through a 'Transport'.
+
+- SessionTransport: (default) pooled 'requests.Session'.
+- RecordingTransport: wraps other transport and saves request/response pairs to a 'json lines' file.
+- ReplayTransport: serves saved pairs without network. Useful for tests and benchmarks.
+
+[Usage]
+
+# record
+notion = Notion(key, transport=RecordingTransport(SessionTransport(key), 'cassette.jsonl'))
+
+# replay (secret key is not used)
+notion = Notion('', transport=ReplayTransport('cassette.jsonl'))
+"""
+
+import collections
+import json
+import threading
+import time
+
+from urllib import parse
+
+import requests  # type: ignore
+import requests.adapters  # type: ignore
+
+from notionizer import settings
+
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+_log = __import__('logging').getLogger(__name__)
+
+
+class TransportResponse:
+    """
+    response of 'Transport'. Same attributes as 'requests.Response' which 'HttpRequest' uses.
+    """
+
+    def __init__(self, status_code: int, text: str, headers: Optional[Mapping[str, str]] = None):
+        self.status_code = status_code
+        self.text = text
+        self.headers: Dict[str, str] = dict(headers or {})
+
+
+class Transport:
+    """
+    Base class of transport.
+    """
+
+    def send(self, method: str, url: str, data: str, timeout: float) -> Any:
+        """
+        send request and return response which has 'status_code', 'text' and 'headers'.
+
+        :param method: 'GET', 'POST', 'PATCH', 'DELETE'
+        :param url: full url
+        :param data: json string ('' for no body)
+        :param timeout: seconds
+        :return: response
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SessionTransport(Transport):
+    """
+    Transport with pooled 'requests.Session'. TCP and TLS connections are kept alive and reused.
+    """
+
+    def __init__(self, secret_key: str, pool_connections: int = settings.POOL_CONNECTIONS,
+                 pool_maxsize: int = settings.POOL_MAXSIZE, pool_block: bool = settings.POOL_BLOCK):
+        """
+
+        :param secret_key: notion api key
+        :param pool_connections: number of host pools to cache
+        :param pool_maxsize: maximum number of keep-alive connections saved in each host pool
+        :param pool_block: if True, 'pool_maxsize' becomes a hard per-host limit and requests wait for a free
+            connection instead of opening a new one.
+        """
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                                pool_block=pool_block)
+        self.session: requests.Session = requests.Session()
+        self.session.headers.update({
+            'Authorization': 'Bearer ' + secret_key,
+            'Content-Type': 'application/json',
+            'Notion-Version': settings.NOTION_VERSION
+        })
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def send(self, method: str, url: str, data: str, timeout: float) -> Any:
+        return self.session.request(method, url, data=data, timeout=timeout)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def _get_request_key(method: str, url: str, data: str, match_payload: bool = True) -> Tuple[str, str, str]:
+    """
+    key of recorded request. Host is ignored so that records could be replayed for other 'BASE_URL'.
+    """
+    url_splited = parse.urlsplit(url)
+    path = url_splited.path.lstrip('/')
+    if url_splited.query:
+        path += '?' + url_splited.query
+    payload = ''
+    if match_payload and data:
+        payload = json.dumps(json.loads(data), sort_keys=True, ensure_ascii=False)
+    return method.upper(), path, payload
+
+
+class RecordingTransport(Transport):
+    """
+    Transport which records request/response pairs of other transport to a 'json lines' file.
+    Request headers (including the secret key) are not recorded.
+    """
+
+    RECORDED_HEADERS = ('Retry-After',)
+
+    def __init__(self, transport: Transport, path: str):
+        """
+
+        :param transport: transport which sends real requests
+        :param path: file path. Records are appended.
+        """
+        self.transport = transport
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, method: str, url: str, data: str, timeout: float) -> Any:
+        response = self.transport.send(method, url, data, timeout)
+        method, path, payload = _get_request_key(method, url, data)
+        record = {
+            'method': method,
+            'url': path,
+            'payload': json.loads(payload) if payload else None,
+            'status_code': response.status_code,
+            'headers': {k: response.headers[k] for k in self.RECORDED_HEADERS if k in response.headers},
+            'body': response.text,
+        }
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """
+    read records of 'RecordingTransport'.
+    :param path: file path
+    :return: list of record
+    """
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class ReplayTransport(Transport):
+    """
+    Transport which serves recorded responses.
+
+    Records of the same request are served in recorded order and the last one is repeated after that.
+    Unknown request gets '404' error object.
+    """
+
+    def __init__(self, records: Union[str, Iterable[Dict[str, Any]]], match_payload: bool = True,
+                 latency: float = 0.0):
+        """
+
+        :param records: file path of 'RecordingTransport' or list of record
+            record: {'method': 'GET', 'url': 'v1/pages/...', 'payload': dict or None, 'status_code': 200,
+                     'headers': {}, 'body': 'json string' or object}
+        :param match_payload: if False, requests are matched only with method and url.
+        :param latency: seconds of sleep for each response (to simulate network)
+        """
+        if isinstance(records, str):
+            records = load_records(records)
+        self.match_payload = match_payload
+        self.latency = latency
+        self.requests: List[Tuple[str, str, str]] = list()
+        self._responses: Dict[Tuple[str, str, str], Deque[TransportResponse]] = collections.defaultdict(
+            collections.deque)
+        self._lock = threading.Lock()
+        for record in records:
+            self.add(record)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """
+        add a record.
+        :param record: see '__init__'
+        :return: None
+        """
+        payload = record.get('payload')
+        key = _get_request_key(record['method'], record['url'], json.dumps(payload) if payload else '',
+                               self.match_payload)
+        body = record['body']
+        if not isinstance(body, str):
+            body = json.dumps(body)
+        with self._lock:
+            self._responses[key].append(TransportResponse(record['status_code'], body, record.get('headers')))
+
+    def send(self, method: str, url: str, data: str, timeout: float) -> Any:
+        key = _get_request_key(method, url, data, self.match_payload)
+        with self._lock:
+            self.requests.append(key)
+            responses = self._responses.get(key)
+            if not responses:
+                response = None
+            elif 1 < len(responses):
+                response = responses.popleft()
+            else:
+                response = responses[0]
+
+        if self.latency:
+            time.sleep(self.latency)
+        if response is None:
+            _log.warning(f"request is not recorded: {key}")
+            error = {'object': 'error', 'status': 404, 'code': 'object_not_found',
+                     'message': f'request is not recorded: {key[0]} {key[1]}'}
+            return TransportResponse(404, json.dumps(error))
+        return response
@@ -0,0 +1,188 @@
+"""
+Block Traversal
+
+'BlockWalker' walks 'v1/blocks/{id}/children' with full cursor pagination and streams blocks of the whole tree.
+Children of blocks which have 'has_children' are requested on a bounded thread pool as soon as their parent list
+is received, so the requests of a level overlap while the consumer is still reading the previous blocks.
+
+Blocks are yielded as '(depth, block)'. Direct children of the walked block have depth 1.
+
+[Usage]
+
+for depth, block in page.walk_blocks(order=BlockWalker.DEPTH_FIRST, max_depth=3):
+    print('  ' * (depth - 1) + block.type)
+
+walker = BlockWalker(request, concurrency=4)
+for depth, data in walker.walk('block_id'):
+    ...
+"""
+
+import collections
+import concurrent.futures
+
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from notionizer import settings
+from notionizer.http_request import HttpRequest
+
+_log = __import__('logging').getLogger(__name__)
+
+# blocks which are pages on their own. Their contents are not walked unless 'follow_child_pages' is set.
+CHILD_PAGE_TYPES = ('child_page', 'child_database')
+
+T_Children = Deque[Tuple[Dict[str, Any], Optional['concurrent.futures.Future[List[Dict[str, Any]]]']]]
+
+
+def iter_children(request: HttpRequest, block_id: str, page_size: int = settings.BLOCK_PAGE_SIZE
+                  ) -> Iterator[Dict[str, Any]]:
+    """
+    iterate raw child blocks of the block following 'next_cursor'.
+
+    :param request: HttpRequest
+    :param block_id: id of block or page
+    :param page_size: number of blocks per request (maximum: 100)
+    :return: Iterator[block object]
+    """
+    cursor: Optional[str] = None
+    while True:
+        url = f'v1/blocks/{block_id}/children?page_size={page_size}'
+        if cursor:
+            url += f'&start_cursor={cursor}'
+        _, result = request.get(url)
+        yield from result['results']
+        cursor = result.get('next_cursor')
+        if not (result.get('has_more') and cursor):
+            return
+
+
+def get_children(request: HttpRequest, block_id: str, page_size: int = settings.BLOCK_PAGE_SIZE
+                 ) -> List[Dict[str, Any]]:
+    """
+    get all raw child blocks of the block.
+
+    :param request: HttpRequest
+    :param block_id: id of block or page
+    :param page_size: number of blocks per request (maximum: 100)
+    :return: List[block object]
+    """
+    return list(iter_children(request, block_id, page_size))
+
+
+class BlockWalker:
+    """
+    stream blocks under a block or page depth-first(document order) or breadth-first. At most 'concurrency'
+    children requests are running at once.
+    """
+
+    DEPTH_FIRST = 'depth'
+    BREADTH_FIRST = 'breadth'
+
+    def __init__(self, request: HttpRequest, order: str = DEPTH_FIRST, max_depth: Optional[int] = None,
+                 concurrency: int = settings.BLOCK_CONCURRENCY, follow_child_pages: bool = False,
+                 wrap: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        """
+
+        :param request: HttpRequest
+        :param order: 'BlockWalker.DEPTH_FIRST' or 'BlockWalker.BREADTH_FIRST'
+        :param max_depth: deepest level to yield. 1 yields direct children only. (default: unlimited)
+        :param concurrency: maximum number of concurrent children requests
+        :param follow_child_pages: walk into 'child_page' and 'child_database' blocks
+        :param wrap: function which creates yielded object from raw block. (ex: 'Block') (default: raw block)
+        """
+        assert order in (self.DEPTH_FIRST, self.BREADTH_FIRST), f"invalid 'order': {order}"
+        assert max_depth is None or 0 < max_depth, "'max_depth' should be positive"
+        assert 0 < concurrency, "'concurrency' should be positive"
+        self._request = request
+        self.order = order
+        self.max_depth = max_depth
+        self.concurrency = concurrency
+        self.follow_child_pages = follow_child_pages
+        self._wrap = wrap
+
+    def _descend(self, block: Dict[str, Any], depth: int) -> bool:
+        if not block.get('has_children'):
+            return False
+        if self.max_depth is not None and self.max_depth <= depth:
+            return False
+        return self.follow_child_pages or block.get('type') not in CHILD_PAGE_TYPES
+
+    def _expand(self, executor: concurrent.futures.ThreadPoolExecutor, blocks: List[Dict[str, Any]],
+                depth: int) -> T_Children:
+        """
+        pair each block with the request of its children, which is submitted right away.
+        """
+        children: T_Children = collections.deque()
+        for block in blocks:
+            future = None
+            if self._descend(block, depth):
+                future = executor.submit(get_children, self._request, block['id'])
+            children.append((block, future))
+        return children
+
+    def _yield(self, depth: int, block: Dict[str, Any]) -> Tuple[int, Any]:
+        return depth, (self._wrap(block) if self._wrap else block)
+
+    def walk(self, block_id: str) -> Iterator[Tuple[int, Any]]:
+        """
+        stream '(depth, block)' under the block. Stopping the iteration cancels requests which are not started.
+
+        :param block_id: id of block or page
+        :return: Iterator[(depth, block)]
+        """
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency,
+                                                         thread_name_prefix='notionizer-blocks')
+        pending: List[T_Children] = list()
+        try:
+            root = self._expand(executor, get_children(self._request, block_id), 1)
+            if self.order == self.DEPTH_FIRST:
+                yield from self._depth_first(executor, root, pending)
+            else:
+                yield from self._breadth_first(executor, root, pending)
+        finally:
+            cancelled = 0
+            for children in pending:
+                for _, future in children:
+                    if future is not None and future.cancel():
+                        cancelled += 1
+            if cancelled:
+                _log.info(f"block walk of '{block_id}' stopped: {cancelled} requests cancelled")
+            executor.shutdown(wait=True)
+
+    def _depth_first(self, executor: concurrent.futures.ThreadPoolExecutor, root: T_Children,
+                     pending: List[T_Children]) -> Iterator[Tuple[int, Any]]:
+        # stack of remaining siblings of each level. 'pending' shares the deques for cancellation.
+        pending.append(root)
+        while pending:
+            siblings = pending[-1]
+            if not siblings:
+                pending.pop()
+                continue
+            block, future = siblings[0]
+            depth = len(pending)
+            yield self._yield(depth, block)
+            siblings.popleft()
+            if future is not None:
+                pending.append(self._expand(executor, future.result(), depth + 1))
+
+    def _breadth_first(self, executor: concurrent.futures.ThreadPoolExecutor, root: T_Children,
+                       pending: List[T_Children]) -> Iterator[Tuple[int, Any]]:
+        level: T_Children = root
+        depth = 1
+        while level:
+            pending[:] = [level]
+            for block, _ in level:
+                yield self._yield(depth, block)
+            next_level: T_Children = collections.deque()
+            pending.append(next_level)
+            for _, future in level:
+                if future is not None:
+                    next_level.extend(self._expand(executor, future.result(), depth + 1))
+            level = next_level
+            depth += 1
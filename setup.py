@@ -21,6 +21,9 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/kimsg1984/notionizer",
     install_requires=install_requires,
+    extras_require={
+        'columnar': ['numpy'],
+    },
     include_package_data=True,
     packages=setuptools.find_packages(),
     python_requires=">=3.6",
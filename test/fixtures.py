@@ -0,0 +1,123 @@
+"""
+offline json fixtures for tests.
+"""
+import json
+from typing import Any, Dict, List, Optional
+from unittest import TestCase
+from unittest import mock
+
+import requests
+
+from notionizer import settings
+from notionizer.fake_server import FakeNotionServer, FakeNotionStore
+from notionizer.http_request import RequestScheduler
+from notionizer.notion import Notion
+
+USER = {'object': 'user', 'id': 'user-1'}
+TIME = '2022-01-01T00:00:00.000Z'
+
+
+def rich_text(content: str) -> List[Dict[str, Any]]:
+    return [{'type': 'text', 'plain_text': content, 'href': None, 'annotations': {},
+             'text': {'content': content, 'link': None}}]
+
+
+def database_json(database_id: str = 'db-1') -> Dict[str, Any]:
+    return {
+        'object': 'database', 'id': database_id, 'created_time': TIME, 'last_edited_time': TIME,
+        'created_by': dict(USER), 'last_edited_by': dict(USER), 'title': rich_text('Test DB'),
+        'icon': None, 'cover': None, 'parent': {'type': 'page_id', 'page_id': 'parent-1'},
+        'url': 'https://www.notion.so/' + database_id, 'archived': False,
+        'properties': {
+            'Name': {'id': 'title', 'name': 'Name', 'type': 'title', 'title': {}},
+            'Count': {'id': 'a%3Bc', 'name': 'Count', 'type': 'number', 'number': {'format': 'number'}},
+            'Done': {'id': 'd0ne', 'name': 'Done', 'type': 'checkbox', 'checkbox': {}},
+            'Status': {'id': 'st4t', 'name': 'Status', 'type': 'select', 'select': {'options': []}},
+        },
+    }
+
+
+def page_json(page_id: str, name: str = 'page', count: Any = 1, done: bool = False,
+              status: Any = None, database_id: str = 'db-1') -> Dict[str, Any]:
+    return {
+        'object': 'page', 'id': page_id, 'created_time': TIME, 'last_edited_time': TIME,
+        'created_by': dict(USER), 'last_edited_by': dict(USER), 'cover': None, 'icon': None,
+        'parent': {'type': 'database_id', 'database_id': database_id}, 'archived': False,
+        'url': 'https://www.notion.so/' + page_id,
+        'properties': {
+            'Name': {'id': 'title', 'type': 'title', 'title': rich_text(name)},
+            'Count': {'id': 'a%3Bc', 'type': 'number', 'number': count},
+            'Done': {'id': 'd0ne', 'type': 'checkbox', 'checkbox': done},
+            'Status': {'id': 'st4t', 'type': 'select',
+                       'select': {'id': 's1', 'name': status, 'color': 'red'} if status else None},
+        },
+    }
+
+
+def query_json(pages: List[Dict[str, Any]], next_cursor: Any = None) -> Dict[str, Any]:
+    return {'object': 'list', 'results': pages, 'next_cursor': next_cursor, 'has_more': bool(next_cursor)}
+
+
+def make_response(status_code: int, body: Any, headers: Dict[str, str] = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body.encode('utf-8') if isinstance(body, str) else json.dumps(body).encode('utf-8')
+    response.headers.update(headers or {})
+    return response
+
+
+# titles of pages and the ids which the api returns for 'title' filters on them.
+# 'contains', 'does_not_contain', 'starts_with' and 'ends_with' of the api ignore case.
+TEXT_FILTER_TITLES = {'t-1': 'Apple pie', 't-2': 'apple', 't-3': 'PINEAPPLE', 't-4': 'Äpfel', 't-5': ''}
+TEXT_FILTER_RESULTS = [
+    ({'contains': 'apple'}, ['t-1', 't-2', 't-3']),
+    ({'contains': 'PIE'}, ['t-1']),
+    ({'contains': 'äPF'}, ['t-4']),
+    ({'does_not_contain': 'APPLE'}, ['t-4', 't-5']),
+    ({'starts_with': 'APP'}, ['t-1', 't-2']),
+    ({'ends_with': 'Apple'}, ['t-2', 't-3']),
+]
+
+
+def text_filter_pages() -> List[Dict[str, Any]]:
+    return [page_json(page_id, title) for page_id, title in TEXT_FILTER_TITLES.items()]
+
+
+def text(content: str, link: Optional[str] = None, **annotations: Any) -> Dict[str, Any]:
+    element: Dict[str, Any] = {'type': 'text', 'text': {'content': content}}
+    if link:
+        element['text']['link'] = {'url': link}
+    if annotations:
+        element['annotations'] = annotations
+    return element
+
+
+def block(block_type: str, *rich_text: Dict[str, Any], children: Optional[List[Dict[str, Any]]] = None,
+          **value: Any) -> Dict[str, Any]:
+    value['rich_text'] = list(rich_text)
+    if children:
+        value['children'] = children
+    return {'type': block_type, block_type: value}
+
+
+def table(*rows: List[str]) -> Dict[str, Any]:
+    cells = [{'type': 'table_row', 'table_row': {'cells': [[text(cell)] for cell in row]}} for row in rows]
+    return {'type': 'table', 'table': {'table_width': len(rows[0]), 'has_column_header': True, 'children': cells}}
+
+
+class FakeServerTestCase(TestCase):
+    """
+    runs a 'FakeNotionServer' with a database of 3 pages without blocks. 'pages' are sorted by 'Name'.
+    """
+
+    def setUp(self):
+        self.store = FakeNotionStore(rows=3, block_depth=0)
+        self.server = FakeNotionServer(self.store).start()
+        patcher = mock.patch.object(settings, 'BASE_URL', self.server.base_url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.server.stop)
+        self.notion = Notion('secret', scheduler=RequestScheduler(rate=1000, burst=100))
+        self.addCleanup(self.notion.close)
+        self.db = self.notion.get_database(self.store.database_ids[0])
+        self.pages = sorted(self.db.query('Name'), key=lambda page: page.get_properties(['Name'])['Name'])
@@ -0,0 +1,119 @@
+from notionizer.block_diff import BlockDiff, BlockOperation, build_tree, get_content_hash
+from notionizer.http_request import HttpRequestError
+
+from test.fixtures import FakeServerTestCase, block, text
+
+
+def paragraph(content):
+    return block('paragraph', text(content))
+
+
+def item(content, *children):
+    return block('bulleted_list_item', text(content), children=list(children))
+
+
+class TestBlockDiff(FakeServerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.page = self.pages[0]
+        self.key = self.page.id.replace('-', '')
+
+    def tree(self):
+        return [(depth, data['type'], ''.join(e['plain_text'] for e in data[data['type']].get('rich_text', [])))
+                for depth, data in self.page.walk_blocks(raw=True)]
+
+    @staticmethod
+    def flatten(blocks, depth=1):
+        for data in blocks:
+            value = data[data['type']]
+            yield depth, data['type'], ''.join(e['text']['content'] for e in value.get('rich_text', []))
+            yield from TestBlockDiff.flatten(value.get('children', []), depth + 1)
+
+    def update(self, blocks):
+        """update the page and return operations and requests"""
+        diff = BlockDiff(self.notion._request, concurrency=3)
+        operations = diff.diff(self.page.id, blocks)
+        diff.apply(operations)
+        self.assertEqual(self.tree(), list(self.flatten(blocks)))
+        self.assertEqual(diff.diff(self.page.id, blocks), [])
+        return [operation.kind for operation in operations], diff.requests
+
+    def test_content_hash_ignores_defaults_and_split(self):
+        fetched = {'object': 'block', 'id': 'x', 'type': 'paragraph', 'has_children': False, 'paragraph': {
+            'color': 'default', 'rich_text': [
+                {'type': 'text', 'text': {'content': 'hello ', 'link': None}, 'plain_text': 'hello ', 'href': None,
+                 'annotations': {'bold': False, 'italic': False, 'code': False, 'color': 'default'}},
+                {'type': 'text', 'text': {'content': 'world', 'link': None}, 'plain_text': 'world', 'href': None,
+                 'annotations': {'bold': False, 'italic': False, 'code': False, 'color': 'default'}},
+            ]}}
+        self.assertEqual(get_content_hash(fetched), get_content_hash(paragraph('hello world')))
+        self.assertNotEqual(get_content_hash(fetched), get_content_hash(block('paragraph', text('hello world',
+                                                                                                 bold=True))))
+        self.assertNotEqual(get_content_hash(fetched), get_content_hash(block('quote', text('hello world'))))
+        # subtree hash includes children
+        nodes = build_tree([item('a', item('b')), item('a', item('c'))])
+        self.assertEqual(nodes[0].content_hash, nodes[1].content_hash)
+        self.assertNotEqual(nodes[0].tree_hash, nodes[1].tree_hash)
+
+    def test_one_changed_block_of_large_page(self):
+        blocks = [paragraph(f'line {i}') for i in range(500)]
+        self.page.append_blocks(blocks)
+        blocks[250] = paragraph('changed')
+        requests = self.server.get_stats()['requests']
+        self.assertEqual(self.update(blocks), (['update'], 1))
+        self.assertEqual(self.store.blocks[self.store.children[self.key][250]]['paragraph']['rich_text'][0]
+                         ['plain_text'], 'changed')
+        # 1 update and 5 pages of children for each of the two diffs and the check of the tree
+        self.assertEqual(self.server.get_stats()['requests'] - requests, 1 + 5 * 2 + 5)
+
+    def test_insert_and_delete(self):
+        self.page.append_blocks([paragraph(c) for c in 'abcde'])
+        ids = list(self.store.children[self.key])
+
+        kinds, requests = self.update([paragraph(c) for c in 'abxcd'])
+        self.assertEqual(kinds, ['append', 'delete'])
+        self.assertEqual(requests, 2)
+        self.assertEqual(self.store.children[self.key][:2], ids[:2])
+        self.assertEqual(self.store.children[self.key][3:], ids[2:4])
+
+        # blocks inserted before the first child: the first kept block is created again.
+        kinds, requests = self.update([paragraph(c) for c in 'yzabxcd'])
+        self.assertEqual(kinds, ['delete', 'append'])
+        self.assertEqual(self.store.children[self.key][3:], ids[1:2] + self.store.children[self.key][4:5] + ids[2:4])
+
+        self.update([])
+        self.assertEqual(self.store.children[self.key], [])
+
+    def test_nested_changes(self):
+        self.page.append_blocks([item('a', item('a.1'), item('a.2')), item('b', item('b.1')), paragraph('c')])
+        blocks = [item('a', item('a.1'), item('a.3'), item('a.2')), item('B', item('b.1')),
+                  block('quote', text('c'))]
+        kinds, _ = self.update(blocks)
+        self.assertEqual(sorted(kinds), ['append', 'append', 'delete', 'update'])
+
+        blocks[0] = item('a', item('a.1', item('deep', item('deeper', item('deepest')))))
+        kinds, _ = self.update(blocks)
+        self.assertEqual(sorted(kinds), ['append', 'delete', 'delete'])
+
+    def test_child_pages_are_kept(self):
+        self.page.append_blocks([paragraph('a')])
+        child = {'object': 'block', 'id': 'c' * 32, 'type': 'child_page', 'has_children': False,
+                 'child_page': {'title': 'sub page'}}
+        with self.store._lock:
+            self.store._add_block(self.key, child)
+        operations = BlockDiff(self.notion._request).diff(self.page.id, [])
+        self.assertEqual([(operation.kind, operation.block_id.replace('-', '')) for operation in operations],
+                         [(BlockOperation.DELETE, self.store.children[self.key][0])])
+
+    def test_server_updates_and_deletes(self):
+        created = self.page.append_blocks([paragraph('a'), paragraph('b')])
+        request = self.notion._request
+        with self.assertRaises(HttpRequestError):
+            request.patch(f'v1/blocks/{created[0].id}', {'quote': {'rich_text': [text('x')]}})
+        request.patch(f'v1/blocks/{created[0].id}', {'paragraph': {'rich_text': [text('x')]}})
+        request.delete(f'v1/blocks/{created[1].id}')
+        self.assertEqual(self.tree(), [(1, 'paragraph', 'x')])
+        with self.assertRaises(HttpRequestError):
+            request.patch(f'v1/blocks/{self.page.id}/children', {'children': [paragraph('y')],
+                                                                 'after': created[1].id})
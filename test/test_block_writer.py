@@ -0,0 +1,82 @@
+from unittest import TestCase
+from unittest import mock
+
+from notionizer import settings
+from notionizer.block_writer import BlockAppender
+from notionizer.fake_server import FakeNotionServer, FakeNotionStore
+from notionizer.http_request import HttpRequestError, RequestScheduler
+from notionizer.notion import Notion
+from notionizer.object_block import Block
+
+from test.fixtures import rich_text
+
+
+def item(content, children=None):
+    block = {'type': 'bulleted_list_item', 'bulleted_list_item': {'rich_text': rich_text(content)}}
+    if children:
+        block['bulleted_list_item']['children'] = children
+    return block
+
+
+class TestBlockAppender(TestCase):
+
+    def setUp(self):
+        self.store = FakeNotionStore(rows=1, block_depth=0)
+        self.server = FakeNotionServer(self.store).start()
+        patcher = mock.patch.object(settings, 'BASE_URL', self.server.base_url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.server.stop)
+        self.notion = Notion('secret', scheduler=RequestScheduler(rate=1000, burst=100))
+        self.addCleanup(self.notion.close)
+        self.page = self.notion.get_page(next(iter(self.store.pages.values()))['id'])
+
+    def tree(self):
+        return [(depth, data['bulleted_list_item']['rich_text'][0]['plain_text'])
+                for depth, data in self.page.walk_blocks(raw=True)]
+
+    @staticmethod
+    def flatten(blocks, depth=1):
+        for block in blocks:
+            yield depth, block['bulleted_list_item']['rich_text'][0]['text']['content']
+            yield from TestBlockAppender.flatten(block['bulleted_list_item'].get('children', []), depth + 1)
+
+    def append(self, blocks):
+        appender = BlockAppender(self.notion._request, concurrency=3)
+        created = appender.append(self.page.id, blocks)
+        self.assertEqual(len(created), len(blocks))
+        self.assertEqual(self.tree(), list(self.flatten(blocks)))
+        return appender.requests
+
+    def test_long_list_is_chunked_in_order(self):
+        blocks = [item(f'item {i}') for i in range(250)]
+        self.assertEqual(self.append(blocks), 3)
+
+        created = self.page.append_blocks([item('last')])
+        self.assertTrue(isinstance(created[0], Block))
+        self.assertEqual(self.tree()[-1], (1, 'last'))
+
+    def test_nested_children_in_least_requests(self):
+        # two levels of nesting are sent inline.
+        blocks = [item(f'a{i}', [item(f'b{i}.{j}', [item(f'c{i}.{j}')]) for j in range(3)]) for i in range(5)]
+        self.assertEqual(self.append(blocks), 1)
+
+    def test_deep_and_wide_children_are_deferred(self):
+        blocks = [
+            item('deep', [item('d1', [item('d2', [item('d3', [item('d4')])])])]),
+            item('wide', [item(f'w{i}') for i in range(150)]),
+            item('plain'),
+        ]
+        # top level with the first 100 children of 'wide', d1 under 'deep', d2 ~ d4 under d1 and the rest of 'wide'
+        self.assertEqual(self.append(blocks), 4)
+
+    def test_block_budget_of_request(self):
+        blocks = [item(f'i{i}', [item(f'i{i}.{j}') for j in range(60)]) for i in range(20)]
+        # 61 blocks each: 16 items are sent in the first request.
+        self.assertEqual(self.append(blocks), 2)
+
+    def test_server_rejects_over_limits(self):
+        deep = [item('a', [item('b', [item('c', [item('d')])])])]
+        with self.assertRaises(HttpRequestError):
+            self.notion._request.patch(f'v1/blocks/{self.page.id}/children', {'children': deep})
+        self.assertEqual(self.tree(), [])
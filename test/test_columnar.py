@@ -0,0 +1,68 @@
+import importlib.util
+from unittest import TestCase
+from unittest import skipIf
+
+from notionizer.columnar import ColumnarStore
+from notionizer.evaluator import FilterEvaluator
+from notionizer.exception import NotionApiQueoryException
+from notionizer.fake_server import FakeNotionStore
+from notionizer.objects import Database
+from notionizer.query import filter, filter_checkbox, filter_date, filter_multi_select, filter_number, \
+    filter_select, filter_text
+
+from test.fixtures import TEXT_FILTER_RESULTS, database_json, text_filter_pages
+from test.test_objects import new_request
+
+
+@skipIf(importlib.util.find_spec('numpy') is None, 'numpy is not installed')
+class TestColumnarStore(TestCase):
+
+    def setUp(self):
+        self.store = FakeNotionStore(rows=300)
+        database_id = self.store.database_ids[0]
+        self.db = Database(new_request(), self.store.databases[database_id.replace('-', '')])
+        self.pages = [self.store.pages[k] for k in self.store.rows[database_id.replace('-', '')]]
+        self.columns = ColumnarStore.from_database(self.db, self.pages)
+
+    def test_masks_match_evaluator(self):
+        filters = [
+            filter().add(filter_number('Count').greater_than(100)),
+            filter().add(filter_number('Count').does_not_equal(3)),
+            filter(filter.AND).add(filter_select('Status').equals('Done')).add(filter_checkbox('Done').equals(False)),
+            filter().add(filter_select('Status').is_empty()).add(filter_multi_select('Tags').contains('red')),
+            filter().add(filter_multi_select('Tags').does_not_contain('blue')),
+            filter().add(filter_date(filter_date.TYPE_DATE, 'Due').on_or_before('2022-06-15')),
+            filter().add(filter_date(filter_date.TYPE_DATE, 'Due').equals('2022-03-01')),
+            filter().add(filter_text(filter_text.TYPE_TITLE, 'Name').ends_with('7')),
+            filter().add(filter_text(filter_text.TYPE_RICHTEXT, 'Note').contains('dolor sit')),
+            {'timestamp': 'created_time', 'created_time': {'on_or_after': '2000-01-01T00:00:00+09:00'}},
+            {'and': [{'property': 'c0nt', 'number': {'less_than': 500}},
+                     {'or': [{'property': 'Done', 'checkbox': {'equals': True}},
+                             {'property': 'Tags', 'multi_select': {'is_empty': True}}]}]},
+        ]
+        for notion_filter in filters:
+            mask = self.columns.mask(notion_filter)
+            expected = [FilterEvaluator(notion_filter).match(page) for page in self.pages]
+            self.assertEqual(mask.tolist(), expected, notion_filter)
+        self.assertEqual(len(self.columns.ids[self.columns.mask(None)]), 300)
+
+    def test_values_and_unsupported_filter(self):
+        self.assertEqual(self.columns.columns['Tags'].get_values(),
+                         [[e['name'] for e in page['properties']['Tags']['multi_select']] for page in self.pages])
+        self.assertEqual(self.columns.columns['Status'].get_values()[:3],
+                         [(page['properties']['Status']['select'] or {}).get('name') for page in self.pages[:3]])
+        self.assertRaises(NotionApiQueoryException, self.columns.mask,
+                          filter().add(filter_date(filter_date.TYPE_DATE, 'Due').past_week()))
+        self.assertRaises(NotionApiQueoryException, self.columns.mask, filter().add(filter_number('Nothing').equals(1)))
+
+    def test_database_get_as_columns(self):
+        columns = self.db.get_as_columns(self.pages, ['Name', 'Count'])
+        self.assertEqual(list(columns.columns), ['Name', 'Count'])
+        self.assertEqual(len(columns), 300)
+
+    def test_text_operators_match_api_results(self):
+        pages = text_filter_pages()
+        columns = ColumnarStore.from_database(Database(new_request(), database_json()), pages)
+        for condition, expected in TEXT_FILTER_RESULTS:
+            mask = columns.mask({'property': 'Name', 'title': condition})
+            self.assertEqual(columns.ids[mask].tolist(), expected, condition)
@@ -0,0 +1,133 @@
+from unittest import TestCase
+from unittest import mock
+
+from notionizer import settings
+from notionizer.evaluator import FilterEvaluator
+from notionizer.exception import NotionApiQueoryException
+from notionizer.fake_server import FakeNotionServer, FakeNotionStore
+from notionizer.http_request import RequestScheduler
+from notionizer.mirror import DatabaseMirror
+from notionizer.notion import Notion
+from notionizer.object_page import Page
+from notionizer.objects import Database
+from notionizer.query import filter, filter_checkbox, filter_date, filter_formula, filter_multi_select, \
+    filter_number, filter_rollup, filter_select, filter_text
+
+from test.fixtures import TEXT_FILTER_RESULTS, database_json, page_json, rich_text, text_filter_pages
+from test.test_objects import FakeApi, new_request
+
+
+def page(page_id, name, count, done, status, **properties):
+    data = page_json(page_id, name, count, done, status)
+    data['properties'].update(properties)
+    return data
+
+
+class TestFilterEvaluator(TestCase):
+
+    pages = [
+        page('p-1', 'apple pie', 3, True, 'Open',
+             Due={'id': 'du3d', 'type': 'date', 'date': {'start': '2021-10-15T12:00:00.000-07:00', 'end': None}},
+             Tags={'id': 't4gs', 'type': 'multi_select', 'multi_select': [{'id': 't1', 'name': 'red'}]}),
+        page('p-2', 'banana', None, False, None,
+             Due={'id': 'du3d', 'type': 'date', 'date': None},
+             Tags={'id': 't4gs', 'type': 'multi_select', 'multi_select': []}),
+        page('p-3', 'Apple', 10, False, 'Closed',
+             Due={'id': 'du3d', 'type': 'date', 'date': {'start': '2021-10-16', 'end': None}},
+             Tags={'id': 't4gs', 'type': 'multi_select',
+                   'multi_select': [{'id': 't1', 'name': 'red'}, {'id': 't2', 'name': 'blue'}]}),
+    ]
+
+    def ids(self, condition):
+        return [data['id'] for data in FilterEvaluator(condition).filter(self.pages)]
+
+    def test_operators(self):
+        title = filter_text(filter_text.TYPE_TITLE, 'Name')
+        self.assertEqual(self.ids(filter().add(title.contains('pple'))), ['p-1', 'p-3'])
+        self.assertEqual(self.ids(filter_text(filter_text.TYPE_TITLE, 'Name').starts_with('apple')), ['p-1', 'p-3'])
+        self.assertEqual(self.ids(filter_text(filter_text.TYPE_TITLE, 'Name').equals('apple')), [])
+        self.assertEqual(self.ids(filter_number('Count').greater_than(2)), ['p-1', 'p-3'])
+        self.assertEqual(self.ids(filter_number('Count').does_not_equal(3)), ['p-2', 'p-3'])
+        self.assertEqual(self.ids(filter_number('Count').is_empty()), ['p-2'])
+        self.assertEqual(self.ids(filter_checkbox('Done').equals(False)), ['p-2', 'p-3'])
+        self.assertEqual(self.ids(filter_select('Status').does_not_equal('Open')), ['p-2', 'p-3'])
+        self.assertEqual(self.ids(filter_multi_select('Tags').contains('blue')), ['p-3'])
+        self.assertEqual(self.ids(filter_multi_select('Tags').is_empty()), ['p-2'])
+
+    def test_dates_are_compared_in_utc(self):
+        # '2021-10-15T12:00:00-07:00' is '2021-10-15T19:00:00Z'
+        self.assertEqual(self.ids(filter_date(filter_date.TYPE_DATE, 'Due').after('2021-10-15T19:30:00+01:00')),
+                         ['p-1', 'p-3'])
+        self.assertEqual(self.ids(filter_date(filter_date.TYPE_DATE, 'Due').equals('2021-10-15')), ['p-1'])
+        self.assertEqual(self.ids(filter_date(filter_date.TYPE_DATE, 'Due').on_or_before('2021-10-16')),
+                         ['p-1', 'p-3'])
+        self.assertEqual(self.ids({'timestamp': 'created_time', 'created_time': {'on_or_after': '2022-01-01'}}),
+                         ['p-1', 'p-2', 'p-3'])
+
+    def test_nested_compound_and_property_id(self):
+        body = {'and': [{'property': 'd0ne', 'checkbox': {'equals': False}},
+                        {'or': [{'property': 'Count', 'number': {'is_empty': True}},
+                                {'property': 'Status', 'select': {'equals': 'Closed'}}]}]}
+        self.assertEqual(self.ids(body), ['p-2', 'p-3'])
+        self.assertEqual(self.ids({'or': []}), ['p-1', 'p-2', 'p-3'])
+        self.assertRaises(NotionApiQueoryException, FilterEvaluator(filter_number('Nothing').equals(1)),
+                          self.pages[0])
+
+    def test_formula_and_rollup(self):
+        data = page('p-4', 'x', 1, False, None,
+                    F={'id': 'f', 'type': 'formula', 'formula': {'type': 'string', 'string': 'abc'}},
+                    R={'id': 'r', 'type': 'rollup', 'rollup': {'type': 'array', 'function': 'show_original',
+                                                               'array': [{'type': 'rich_text',
+                                                                          'rich_text': rich_text('hello')}]}})
+        self.assertTrue(FilterEvaluator(filter_formula('string', 'F').contains('b'))(data))
+        rollup = filter_rollup('R')
+        self.assertTrue(FilterEvaluator(rollup.any(filter_text(filter_text.TYPE_RICHTEXT).contains('ell')))(data))
+        rollup = filter_rollup('R')
+        self.assertFalse(FilterEvaluator(rollup.none(filter_text(filter_text.TYPE_RICHTEXT).equals('hello')))(data))
+
+    def test_page_and_unsupported_operator(self):
+        pages = [Page(new_request(), data) for data in self.pages]
+        self.assertEqual([p.id for p in FilterEvaluator(filter_number('Count').less_than(5)).filter(pages)], ['p-1'])
+        self.assertRaises(NotionApiQueoryException, FilterEvaluator,
+                          filter_date(filter_date.TYPE_DATE, 'Due').past_week())
+
+
+class TestServerSemantics(TestCase):
+
+    def test_fake_server_and_mirror_agree(self):
+        store = FakeNotionStore(rows=80)
+        filters = [
+            filter().add(filter_number('Count').less_than_or_equal_to(100)),
+            filter(filter.AND).add(filter_select('Status').equals('Done')).add(filter_checkbox('Done').equals(True)),
+            filter().add(filter_multi_select('Tags').does_not_contain('red')),
+            filter().add(filter_date(filter_date.TYPE_DATE, 'Due').before('2022-06-15')),
+            filter().add(filter_text(filter_text.TYPE_RICHTEXT, 'Note').contains('lorem ipsum')),
+        ]
+        with FakeNotionServer(store) as server, mock.patch.object(settings, 'BASE_URL', server.base_url):
+            with Notion('secret', scheduler=RequestScheduler(rate=1000, burst=100)) as notion:
+                db = notion.get_database(store.database_ids[0])
+                with DatabaseMirror() as mirror:
+                    mirror.sync(db)
+                    for notion_filter in filters:
+                        served = sorted(data['id'] for data in db._filter_and_sort(notion_filter, raw=True))
+                        evaluated = sorted(data['id'] for data in FilterEvaluator(notion_filter).filter(
+                            store.pages[k] for k in store.rows[store.database_ids[0].replace('-', '')]))
+                        mirrored = sorted(data['id'] for data in mirror.query_filter(db, notion_filter, raw=True))
+                        self.assertEqual(served, evaluated)
+                        self.assertEqual(served, mirrored, notion_filter.get_body())
+                        self.assertLess(0, len(served))
+
+    def test_text_operators_match_api_results(self):
+        # the fake server filters with 'FilterEvaluator', so results are checked against the api instead.
+        pages = text_filter_pages()
+        api = FakeApi({'': pages})
+        with api.patch(), DatabaseMirror() as mirror:
+            db = Database(new_request(), database_json())
+            mirror.sync(db)
+            for condition, expected in TEXT_FILTER_RESULTS:
+                (operator, value), = condition.items()
+                notion_filter = filter().add(getattr(filter_text(filter_text.TYPE_TITLE, 'Name'), operator)(value))
+                self.assertEqual([data['id'] for data in FilterEvaluator(notion_filter).filter(pages)], expected,
+                                 condition)
+                self.assertEqual(sorted(data['id'] for data in mirror.query_filter(db, notion_filter, raw=True)),
+                                 expected, condition)
@@ -0,0 +1,71 @@
+from unittest import TestCase
+from unittest import mock
+
+from notionizer import settings
+from notionizer.fake_server import FakeNotionServer, FakeNotionStore
+from notionizer.http_request import HttpRequestError, RequestScheduler
+from notionizer.notion import Notion
+
+
+def new_notion(scheduler=None):
+    return Notion('secret', scheduler=scheduler or RequestScheduler(rate=1000, burst=100, backoff_base=0.01))
+
+
+class TestFakeNotionStore(TestCase):
+
+    def test_seeded_fixtures_are_deterministic(self):
+        a, b = FakeNotionStore(seed=3, rows=5), FakeNotionStore(seed=3, rows=5)
+        self.assertEqual(a.database_ids, b.database_ids)
+        self.assertEqual([p['properties']['Count'] for p in a.pages.values()],
+                         [p['properties']['Count'] for p in b.pages.values()])
+        self.assertNotEqual(a.database_ids, FakeNotionStore(seed=4, rows=5).database_ids)
+
+    def test_pagination_and_projection(self):
+        store = FakeNotionStore(rows=7)
+        path = f'v1/databases/{store.database_ids[0]}/query'
+        status, first = store.handle('POST', path, {'filter_properties': ['c0nt']}, {'page_size': 5})
+        self.assertEqual(status, 200)
+        self.assertEqual(len(first['results']), 5)
+        self.assertEqual(list(first['results'][0]['properties']), ['Count'])
+        status, second = store.handle('POST', path, {}, {'start_cursor': first['next_cursor']})
+        self.assertEqual(len(second['results']), 2)
+        self.assertFalse(second['has_more'])
+
+    def test_unknown_object(self):
+        status, error = FakeNotionStore(rows=0).handle('GET', 'v1/pages/nothing', {}, {})
+        self.assertEqual(status, 404)
+        self.assertEqual(error['code'], 'object_not_found')
+
+
+class TestFakeNotionServer(TestCase):
+
+    def test_notion_against_server(self):
+        store = FakeNotionStore(rows=120, block_depth=1, block_breadth=3)
+        with FakeNotionServer(store) as server, mock.patch.object(settings, 'BASE_URL', server.base_url):
+            with new_notion() as notion:
+                db = notion.get_database(store.database_ids[0])
+                self.assertEqual(len(list(db.query('Name'))), 120)
+
+                page = db.create_page({'Name': 'created', 'Count': 7})
+                self.assertEqual(notion.get_page(page.id).get_properties()['Count'], 7)
+                self.assertEqual(len(list(db.query('Name', raw=True))), 121)
+
+                self.assertEqual(notion.get_me().name, 'notionizer bot')
+                _, children = notion._request.get(f'v1/blocks/{store.root_block_id}/children')
+                self.assertEqual(len(children['results']), 3)
+                self.assertRaises(HttpRequestError, notion.get_page, 'nothing')
+
+    def test_rate_limit_and_retry_after(self):
+        with FakeNotionServer(FakeNotionStore(rows=1), rate_limit=50, burst=1) as server, \
+                mock.patch.object(settings, 'BASE_URL', server.base_url):
+            with new_notion() as notion:
+                for _ in range(4):
+                    notion.get_me()
+                stats = notion.get_request_stats()
+        self.assertLess(0, server.get_stats()['throttled'])
+        self.assertEqual(stats['retries'], server.get_stats()['throttled'])
+
+    def test_auth_is_required(self):
+        with FakeNotionServer(FakeNotionStore(rows=0)) as server:
+            status, error, _ = server.dispatch('GET', '/v1/users/me', {}, b'')
+        self.assertEqual(status, 401)
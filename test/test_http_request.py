@@ -0,0 +1,105 @@
+from unittest import TestCase
+from unittest import mock
+
+import requests
+
+from notionizer.http_request import HttpRequest, HttpRequestError, RequestScheduler, TokenBucket
+from notionizer.notion import Notion
+
+from test.fixtures import make_response
+
+
+class TestHttpRequestPool(TestCase):
+
+    def test_session_is_reused(self):
+        request = HttpRequest('secret', pool_connections=2, pool_maxsize=4, pool_block=True)
+        adapter = request.transport.session.get_adapter('https://api.notion.com/')
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertTrue(adapter._pool_block)
+
+        with mock.patch.object(requests.Session, 'request', autospec=True,
+                               return_value=make_response(200, {'object': 'user', 'id': '1'})) as sent:
+            request.get('v1/users/1')
+            request.get('v1/users/1')
+        self.assertEqual(sent.call_count, 2)
+        self.assertTrue(all(c.args[0] is request.transport.session for c in sent.call_args_list))
+
+    def test_error_object_raises(self):
+        request = HttpRequest('secret')
+        error = {'object': 'error', 'status': 400, 'code': 'validation_error', 'message': 'bad'}
+        with mock.patch.object(requests.Session, 'request', return_value=make_response(400, error)):
+            self.assertRaises(HttpRequestError, request.get, 'v1/users/1')
+
+    def test_notion_context_manager_closes_session(self):
+        with mock.patch.object(requests.Session, 'close') as closed:
+            with Notion('secret') as notion:
+                self.assertIsInstance(notion._request, HttpRequest)
+        closed.assert_called_once()
+
+
+class TestRequestScheduler(TestCase):
+
+    def test_token_bucket_paces_after_burst(self):
+        bucket = TokenBucket(rate=2, capacity=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5, places=2)
+        self.assertAlmostEqual(bucket.reserve(), 1.0, places=2)
+
+    def test_token_bucket_block(self):
+        bucket = TokenBucket(rate=10, capacity=10)
+        bucket.block(2)
+        self.assertAlmostEqual(bucket.reserve(), 2.1, places=1)
+
+    def test_retry_after_is_honoured(self):
+        scheduler = RequestScheduler(rate=1000, burst=10, backoff_base=0.01)
+        request = HttpRequest('secret', scheduler=scheduler)
+        responses = [
+            make_response(429, {'object': 'error', 'status': 429, 'code': 'rate_limited', 'message': ''},
+                          {'Retry-After': '3'}),
+            make_response(502, '<html>bad gateway</html>'),
+            make_response(200, {'object': 'user', 'id': '1'}),
+        ]
+        with mock.patch.object(requests.Session, 'request', side_effect=responses), \
+                mock.patch('notionizer.http_request.time.sleep') as sleep:
+            _, result = request.get('v1/users/1')
+
+        self.assertEqual(result['id'], '1')
+        self.assertGreaterEqual(sleep.call_args_list[0].args[0], 3)
+        stats = scheduler.get_stats()
+        self.assertEqual(stats['requests'], 3)
+        self.assertEqual(stats['retries'], 2)
+        self.assertGreaterEqual(stats['throttled_time'], 3)
+
+    def test_retries_are_bounded(self):
+        scheduler = RequestScheduler(rate=1000, burst=10, max_retries=2)
+        request = HttpRequest('secret', scheduler=scheduler)
+        with mock.patch.object(requests.Session, 'request', return_value=make_response(503, 'unavailable')) as sent, \
+                mock.patch('notionizer.http_request.time.sleep'):
+            self.assertRaises(HttpRequestError, request.get, 'v1/users/1')
+        self.assertEqual(sent.call_count, 3)
+
+    def test_writes_are_not_retried_on_gateway_errors(self):
+        scheduler = RequestScheduler(rate=1000, burst=10, max_retries=2)
+        request = HttpRequest('secret', scheduler=scheduler)
+        created = make_response(200, {'object': 'page', 'id': '1'})
+        with mock.patch('notionizer.http_request.time.sleep'):
+            with mock.patch.object(requests.Session, 'request', return_value=make_response(504, 'timeout')) as sent:
+                self.assertRaises(HttpRequestError, request.post, 'v1/pages', {'parent': {}})
+                self.assertRaises(HttpRequestError, request.patch, 'v1/blocks/1/children', {'children': []})
+            self.assertEqual(sent.call_count, 2)
+
+            throttled = make_response(429, {'object': 'error', 'status': 429, 'code': 'rate_limited', 'message': ''})
+            with mock.patch.object(requests.Session, 'request', side_effect=[throttled, created]) as sent:
+                self.assertEqual(request.post('v1/pages', {'parent': {}})[1]['id'], '1')
+            self.assertEqual(sent.call_count, 2)
+
+            # query has no side effect.
+            with mock.patch.object(requests.Session, 'request',
+                                   side_effect=[make_response(502, 'bad gateway'), created]) as sent:
+                request.post('v1/databases/1/query?filter_properties=title', {})
+            self.assertEqual(sent.call_count, 2)
+
+        scheduler.retry_writes = True
+        self.assertTrue(scheduler.should_retry(503, 0, 'PATCH', 'v1/pages/1'))
+        self.assertFalse(scheduler.should_retry(503, 2, 'GET', 'v1/pages/1'))
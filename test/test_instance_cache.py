@@ -0,0 +1,70 @@
+import gc
+from unittest import TestCase
+from unittest import mock
+
+import requests
+
+from notionizer import LRUInstanceCache, WeakInstanceCache, set_instance_cache, get_instance_cache_stats
+from notionizer.http_request import HttpRequest, RequestScheduler
+from notionizer.object_basic import NotionUpdateObject
+from notionizer.object_page import Page
+
+from test.fixtures import page_json, make_response
+
+
+class Item:
+    pass
+
+
+class TestInstanceCache(TestCase):
+
+    def test_weak_cache_evicts_collected_instance(self):
+        cache = WeakInstanceCache()
+        item = Item()
+        cache['a'] = item
+        self.assertIs(cache.get('a'), item)
+        del item
+        gc.collect()
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get_stats(), {'hits': 1, 'misses': 1, 'evictions': 1, 'live': 0})
+
+    def test_lru_cache_bounds(self):
+        cache = LRUInstanceCache(max_size=2)
+        a, b, c = Item(), Item(), Item()
+        cache['a'] = a
+        cache['b'] = b
+        cache.get('a')
+        cache['c'] = c
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_lru_cache_ttl(self):
+        cache = LRUInstanceCache(max_size=2, ttl=10)
+        cache['a'] = Item()
+        with mock.patch('notionizer.instance_cache.time.monotonic', return_value=10 ** 9):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+
+class TestIdentityMap(TestCase):
+
+    def setUp(self):
+        self.default_cache = NotionUpdateObject._instances
+
+    def tearDown(self):
+        set_instance_cache(self.default_cache)
+
+    def test_update_refreshes_evicted_instance(self):
+        set_instance_cache(LRUInstanceCache(max_size=1))
+        request = HttpRequest('secret', scheduler=RequestScheduler(1000, 100))
+        page = Page(request, page_json('p-1', count=1))
+        Page(request, page_json('p-2'))
+        self.assertNotIn('p-1', NotionUpdateObject._instances)
+
+        with mock.patch.object(requests.Session, 'request', return_value=make_response(200, page_json('p-1', count=7))):
+            page._update('properties', {'Count': {'number': 7}})
+
+        self.assertEqual(page.get_properties()['Count'], 7)
+        self.assertGreaterEqual(get_instance_cache_stats()['hits'], 1)
@@ -0,0 +1,138 @@
+import io
+
+from notionizer.functions import from_rich_text_array_to_markdown
+from notionizer.markdown import MarkdownExporter, markdown_to_blocks
+
+from test.fixtures import FakeServerTestCase, block, table, text
+
+
+CONTENT = [
+    block('heading_2', text('Intro')),
+    block('paragraph', text('Hello '), text('world', bold=True), text(' and '), text('site', 'https://example.com'),
+          text(' '), text('x = 1', code=True), text(' *not bold*')),
+    block('bulleted_list_item', text('a'), children=[
+        block('bulleted_list_item', text('a.1'), children=[block('numbered_list_item', text('deep'))]),
+    ]),
+    block('bulleted_list_item', text('b')),
+    block('numbered_list_item', text('one')),
+    block('numbered_list_item', text('two')),
+    block('to_do', text('done'), checked=True),
+    block('quote', text('first\nsecond')),
+    block('code', text('print(1)\nprint(2)'), language='python'),
+    table(['h1', 'h2'], ['a|b', 'c']),
+    {'type': 'divider', 'divider': {}},
+    block('paragraph', text('# not heading')),
+]
+
+EXPECTED = """# row 0
+
+## Intro
+
+Hello **world** and [site](https://example.com) `x = 1` \\*not bold\\*
+
+- a
+  - a.1
+    1. deep
+- b
+1. one
+2. two
+- [x] done
+
+> first
+> second
+
+```python
+print(1)
+print(2)
+```
+
+| h1 | h2 |
+| --- | --- |
+| a\\|b | c |
+
+---
+
+\\# not heading
+""".replace('> first\n', '> first  \n')  # line break in text is a hard break
+
+
+class TestMarkdown(FakeServerTestCase):
+
+    def test_rich_text(self):
+        array = [
+            {'type': 'text', 'plain_text': 'bold ', 'href': None, 'annotations': {'bold': True, 'italic': True}},
+            {'type': 'text', 'plain_text': 'a_b', 'href': 'https://example.com', 'annotations': {}},
+            {'type': 'equation', 'plain_text': 'x', 'equation': {'expression': 'x^2'}, 'annotations': {}},
+        ]
+        self.assertEqual(from_rich_text_array_to_markdown(array), '***bold*** [a\\_b](https://example.com)$x^2$')
+
+    def test_page_to_markdown(self):
+        page = self.pages[0]
+        page.append_blocks(CONTENT)
+        self.assertEqual(page.to_markdown(), EXPECTED)
+
+        stream = io.StringIO()
+        self.assertIsNone(page.to_markdown(stream, title=False))
+        self.assertEqual(stream.getvalue(), EXPECTED.split('\n', 2)[2])
+
+    def test_export_pages_concurrently(self):
+        for i, page in enumerate(self.pages):
+            page.append_blocks([block('paragraph', text(f'page {i}'))] * (i + 1))
+
+        outputs = dict()
+
+        class Output(io.StringIO):
+            def close(self):
+                outputs[self.page_id] = self.getvalue()
+                super().close()
+
+        def open_stream(page):
+            output = Output()
+            output.page_id = page if isinstance(page, str) else page.id
+            return output
+
+        exporter = MarkdownExporter(self.notion._request, concurrency=2)
+        pages = self.pages + ['00000000-0000-4000-8000-000000000000']
+        results = list(exporter.export(pages, open_stream))
+        self.assertEqual([(page, blocks) for page, blocks, _ in results], [(pages[0], 1), (pages[1], 2), (pages[2], 3),
+                                                                           (pages[3], 0)])
+        self.assertEqual([error is None for _, _, error in results], [True, True, True, False])
+        self.assertEqual(outputs[self.pages[2].id], '# row 2\n\npage 2\n\npage 2\n\npage 2\n')
+        self.assertEqual(outputs[pages[3]], '')
+
+
+class TestMarkdownImport(FakeServerTestCase):
+
+    def test_round_trip(self):
+        markdown = EXPECTED.split('\n', 2)[2]
+        created = self.pages[1].append_markdown(markdown)
+        self.assertEqual([block.type for block in created][:4], ['heading_2', 'paragraph', 'bulleted_list_item',
+                                                                 'bulleted_list_item'])
+        self.assertEqual(self.pages[1].to_markdown(title=False), markdown)
+
+    def test_adjacent_tables(self):
+        self.pages[1].append_blocks([table(['a', 'b'], ['1', '2']), table(['c'], ['3'])])
+        markdown = self.pages[1].to_markdown(title=False)
+        self.assertEqual(markdown, '| a | b |\n| --- | --- |\n| 1 | 2 |\n\n| c |\n| --- |\n| 3 |\n')
+        self.assertEqual([block['table']['table_width'] for block in markdown_to_blocks(markdown)], [2, 1])
+
+    def test_rich_text_limits(self):
+        blocks = markdown_to_blocks('x' * 4500 + '\n\n' + ' '.join(['**bold** plain'] * 60))
+        self.assertEqual([len(e['text']['content']) for e in blocks[0]['paragraph']['rich_text']], [2000, 2000, 500])
+        # 120 rich text objects are continued in the next paragraph.
+        self.assertEqual([len(block['paragraph']['rich_text']) for block in blocks[1:]], [100, 20])
+        self.assertEqual(blocks[1]['paragraph']['rich_text'][0], {'type': 'text', 'text': {'content': 'bold'},
+                                                                  'annotations': {'bold': True}})
+
+    def test_document_in_few_requests(self):
+        section = ['## heading', '', 'some *text*', 'continued', '', '- item', '  - nested', '- item', '',
+                   '```py', 'print(1)', '```', '', '| x | y |', '|---|---|', '| 1 | 2 |', '', '> quote', '', '---']
+        markdown = '\n'.join(section * 250)
+        self.assertEqual(len(markdown.splitlines()), 5000)
+        requests, blocks = self.server.get_stats()['requests'], len(self.store.blocks)
+        created = self.pages[2].append_markdown(markdown)
+        # 8 top level blocks of each section are sent 100 at a time with nested children inline.
+        self.assertEqual(len(created), 2000)
+        self.assertEqual(self.server.get_stats()['requests'] - requests, 20)
+        self.assertEqual(len(self.store.children[self.pages[2].id.replace('-', '')]), 2000)
+        self.assertEqual(len(self.store.blocks) - blocks, 2000 + 250 * 3)
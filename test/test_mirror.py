@@ -0,0 +1,84 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest import mock
+
+from notionizer import settings
+from notionizer.exception import NotionApiQueoryException
+from notionizer.fake_server import FakeNotionServer, FakeNotionStore
+from notionizer.http_request import RequestScheduler
+from notionizer.mirror import DatabaseMirror
+from notionizer.notion import Notion
+from notionizer.query import filter, filter_date, filter_multi_select, filter_number, filter_text
+
+
+class TestDatabaseMirror(TestCase):
+
+    def setUp(self):
+        self.store = FakeNotionStore(rows=60)
+        self.server = FakeNotionServer(self.store).start()
+        patcher = mock.patch.object(settings, 'BASE_URL', self.server.base_url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.server.stop)
+        self.notion = Notion('secret', scheduler=RequestScheduler(rate=1000, burst=100))
+        self.addCleanup(self.notion.close)
+        self.db = self.notion.get_database(self.store.database_ids[0])
+        self.expected = {values['Name']: values for values in self.db.query_values('Name')}
+
+    def names(self, pages):
+        return sorted(page['properties']['Name']['title'][0]['plain_text'] for page in pages)
+
+    def expected_names(self, condition):
+        return sorted(name for name, values in self.expected.items() if condition(values))
+
+    def test_expressions_match_api_values(self):
+        with DatabaseMirror() as mirror:
+            result = mirror.sync(self.db)
+            self.assertEqual(len(result.inserted), 60)
+            self.assertEqual(mirror.count(self.db), 60)
+            self.assertEqual(self.names(mirror.query(self.db, 'Name', raw=True)), sorted(self.expected))
+            self.assertEqual(self.names(mirror.query(self.db, 'not Status', raw=True)),
+                             self.expected_names(lambda values: values['Status'] is None))
+            values = {row['Name']: row for row in mirror.query_values(self.db, 'Name')}
+            self.assertEqual(values, self.expected)
+            page = next(mirror.query(self.db, 'Name', columns=['Count']))
+            self.assertEqual(list(page.get_properties()), ['Count'])
+
+    def test_filter_objects(self):
+        with DatabaseMirror() as mirror:
+            mirror.sync(self.db)
+            count = filter().add(filter_number('Count').greater_than(50))
+            self.assertEqual(self.names(mirror.query_filter(self.db, count, raw=True)),
+                             self.expected_names(lambda values: values['Count'] is not None and values['Count'] > 50))
+            tag = filter(filter.AND).add(filter_multi_select('Tags').contains('red')) \
+                .add(filter_text(filter_text.TYPE_TITLE, 'Name').starts_with('row 1'))
+            self.assertEqual(self.names(mirror.query_filter(self.db, tag, raw=True)),
+                             self.expected_names(lambda values: 'red' in values['Tags'] and
+                                                 values['Name'].startswith('row 1')))
+            due = filter().add(filter_date(filter_date.TYPE_DATE, 'Due').on_or_after('2022-07-01'))
+            self.assertEqual(self.names(mirror.query_filter(self.db, due, raw=True)),
+                             self.expected_names(lambda values: '2022-07-01' <= values['Due'][:10]))
+            relative = filter().add(filter_date(filter_date.TYPE_DATE, 'Due').past_week())
+            self.assertRaises(NotionApiQueoryException, list, mirror.query_filter(self.db, relative))
+
+    def test_incremental_sync_is_persisted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'mirror.sqlite3')
+            with DatabaseMirror(path) as mirror:
+                mirror.sync(self.db)
+                state = mirror.get_state(self.db)
+
+            page = next(iter(self.db.query('Name')))
+            page.update(Count=12345)
+
+            with DatabaseMirror(path) as mirror:
+                self.assertEqual(mirror.get_state(self.db), state)
+                result = mirror.sync(self.db)
+                # pages edited at the watermark are upserted again with the edited page.
+                self.assertEqual(len(result.inserted), 0)
+                self.assertEqual(sorted(data['id'] for data in result.updated),
+                                 sorted(state.boundary_ids | {page.id}))
+                self.assertEqual(mirror.count(self.db), 60)
+                count = filter().add(filter_number('Count').equals(12345))
+                self.assertEqual([p.id for p in mirror.query_filter(self.db, count)], [page.id])
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from unittest import TestCase
+from unittest import mock
+
+import requests
+
+from notionizer import AsyncNotion
+from notionizer.http_request import RequestScheduler
+from notionizer.object_page import Page
+
+from test.fixtures import database_json, page_json, query_json, make_response
+
+
+def route(session, method, url, data=None, timeout=None):
+    path = url.split('/v1/', 1)[1]
+    if method == 'GET' and path.startswith('databases/'):
+        return make_response(200, database_json())
+    if method == 'GET' and path.startswith('pages/'):
+        page_id = path.split('/')[1]
+        return make_response(200, page_json(page_id, name=page_id, count=len(page_id)))
+    if method == 'POST' and path.endswith('/query'):
+        if 'start_cursor' in (data or ''):
+            return make_response(200, query_json([page_json('p-3')]))
+        return make_response(200, query_json([page_json('p-1'), page_json('p-2')], next_cursor='p-3'))
+    raise AssertionError(f'unexpected request: {method} {url}')
+
+
+class TestAsyncNotion(TestCase):
+
+    def test_query_and_gather(self):
+
+        async def main():
+            async with AsyncNotion('secret', max_workers=4, scheduler=RequestScheduler(1000, 100)) as notion:
+                db = await notion.get_database('db-1')
+                ids = [page.id async for page in db.query('Name')]
+                pages = await notion.get_pages(['p-7', 'p-8', 'p-9'])
+                return str(db.title), ids, pages
+
+        with mock.patch.object(requests.Session, 'request', autospec=True, side_effect=route):
+            title, ids, pages = asyncio.run(main())
+
+        self.assertEqual(title, 'Test DB')
+        self.assertEqual(ids, ['p-1', 'p-2', 'p-3'])
+        self.assertEqual([p.id for p in pages], ['p-7', 'p-8', 'p-9'])
+        self.assertTrue(all(isinstance(p, Page) for p in pages))
+
+    def test_objects_are_built_on_event_loop(self):
+        threads = set()
+
+        def build_page(*args, **kwargs):
+            threads.add(threading.current_thread())
+            return Page(*args, **kwargs)
+
+        async def main():
+            async with AsyncNotion('secret', max_workers=8, scheduler=RequestScheduler(1000, 100)) as notion:
+                pages = await notion.get_pages([f'p-{i}' for i in range(40)])
+                return [page.get_properties(['Name', 'Count']) for page in pages]
+
+        with mock.patch.object(requests.Session, 'request', autospec=True, side_effect=route), \
+                mock.patch('notionizer.notion_async.Page', side_effect=build_page):
+            values = asyncio.run(main())
+
+        self.assertEqual(values, [{'Name': f'p-{i}', 'Count': len(f'p-{i}')} for i in range(40)])
+        self.assertEqual(threads, {threading.main_thread()})
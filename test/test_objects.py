@@ -0,0 +1,566 @@
+import json
+import sys
+import threading
+from unittest import TestCase
+from unittest import mock
+
+import requests
+
+from notionizer import WeakInstanceCache, set_instance_cache
+from notionizer.http_request import HttpRequest, HttpRequestError, RequestScheduler
+from notionizer.object_basic import NotionUpdateObject
+from notionizer.objects import Database
+from notionizer.object_page import Page
+from notionizer.sync import SyncState
+
+from test.fixtures import database_json, page_json, query_json, make_response
+
+
+class FakeApi:
+    """
+    route requests of 'requests.Session' to offline json fixtures.
+    """
+
+    def __init__(self, pages_per_cursor=None):
+        # {'': [pages of first response], 'cursor': [...]}. 'None' pages respond with an error.
+        self.pages_per_cursor = pages_per_cursor or {}
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __call__(self, session, method, url, data=None, timeout=None):
+        path = url.split('/v1/', 1)[1]
+        payload = json.loads(data) if data else {}
+        with self.lock:
+            self.requests.append((method, path, payload))
+        if method == 'GET' and path.startswith('databases/'):
+            return make_response(200, database_json(path.split('/')[1]))
+        if method == 'POST' and path.split('?')[0].endswith('/query'):
+            cursors = list(self.pages_per_cursor)
+            cursor = payload.get('start_cursor', '')
+            if self.pages_per_cursor.get(cursor) is None:
+                return make_response(400, {'object': 'error', 'status': 400, 'code': 'validation_error',
+                                           'message': 'bad cursor'})
+            index = cursors.index(cursor)
+            next_cursor = cursors[index + 1] if index + 1 < len(cursors) else None
+            return make_response(200, query_json(self.pages_per_cursor[cursor], next_cursor))
+        if method == 'POST' and path.rstrip('/') == 'pages':
+            name = payload['properties']['Name']['title'][0]['text']['content']
+            if name == 'fail':
+                return make_response(400, {'object': 'error', 'status': 400, 'code': 'validation_error',
+                                           'message': 'fail'})
+            return make_response(200, page_json('new-' + name, name))
+        if method == 'PATCH' and path.startswith('pages/'):
+            page = page_json(path.split('/')[1])
+            for name, value in payload.get('properties', {}).items():
+                page['properties'][name].update(value)
+            page['last_edited_time'] = self.edited_time()
+            return make_response(200, page)
+        if method == 'PATCH' and path.startswith('databases/'):
+            database = database_json(path.split('/')[1])
+            for name, value in payload.get('properties', {}).items():
+                database['properties'][name].update(value)
+            database['properties'] = {prop['name']: prop for prop in database['properties'].values()}
+            database['last_edited_time'] = self.edited_time()
+            return make_response(200, database)
+        raise AssertionError(f'unexpected request: {method} {url}')
+
+    def patch(self):
+        return mock.patch.object(requests.Session, 'request', autospec=True, side_effect=self)
+
+    def edited_time(self):
+        # every update has a later 'last_edited_time'.
+        with self.lock:
+            edits = len([r for r in self.requests if r[0] == 'PATCH'])
+        return '2022-02-01T00:%02d:00.000Z' % edits
+
+
+def new_request() -> HttpRequest:
+    return HttpRequest('secret', scheduler=RequestScheduler(rate=1000, burst=100))
+
+
+class TestQueriedPageIterator(TestCase):
+
+    pages = {
+        '': [page_json('p-1', 'a', 1), page_json('p-2', 'b', 2)],
+        'c-2': [page_json('p-3', 'c', 3)],
+        'c-3': [page_json('p-4', 'd', 4), page_json('p-5', 'e', 5)],
+    }
+
+    def test_prefetch_keeps_cursor_order(self):
+        api = FakeApi(self.pages)
+        with api.patch():
+            db = Database(new_request(), database_json())
+            ids = [page.id for page in db.query('Name', prefetch=2)]
+        self.assertEqual(ids, ['p-1', 'p-2', 'p-3', 'p-4', 'p-5'])
+        cursors = [payload.get('start_cursor') for method, path, payload in api.requests if method == 'POST']
+        self.assertEqual(cursors, [None, 'c-2', 'c-3'])
+
+    def test_prefetch_raises_worker_error(self):
+        api = FakeApi({'': [page_json('p-1')], 'c-2': None})
+        with api.patch():
+            db = Database(new_request(), database_json())
+            queried = db.query('Name', prefetch=1)
+            self.assertEqual(next(queried).id, 'p-1')
+            self.assertRaises(HttpRequestError, next, queried)
+
+
+class TestRawQuery(TestCase):
+
+    pages = {
+        '': [page_json('p-1', 'a', 1, True, 'Open'), page_json('p-2', 'b\xa0c', None, False, None)],
+        'c-2': [page_json('p-3', 'd', 2.5, False, 'Closed')],
+    }
+
+    def test_raw_results_are_dicts(self):
+        with FakeApi(self.pages).patch():
+            db = Database(new_request(), database_json())
+            results = list(db.query('Name', raw=True))
+        self.assertEqual([r['id'] for r in results], ['p-1', 'p-2', 'p-3'])
+        self.assertTrue(all(type(r) is dict for r in results))
+
+    def test_values_match_page_properties(self):
+        with FakeApi(self.pages).patch():
+            db = Database(new_request(), database_json())
+            expected = [page.get_properties() for page in db.query('Name')]
+            values = list(db.query_values('Name'))
+            selected = list(db.query_values('Name', ['Status']))
+        self.assertEqual(values, expected)
+        self.assertEqual(selected, [{'Status': 'Open'}, {'Status': None}, {'Status': 'Closed'}])
+
+
+class TestLazyPageProperties(TestCase):
+
+    def test_properties_are_decoded_on_access(self):
+        from notionizer.properties_basic import PagePropertyObject
+        from notionizer.object_page import Page
+
+        page = Page(new_request(), page_json('p-1', 'lazy', 3, True, 'Open'))
+        data = page.properties._data
+        self.assertTrue(all(type(v) is dict for v in data.values()))
+
+        self.assertEqual(page.get_properties(['Count']), {'Count': 3})
+        self.assertIsInstance(data['Count'], PagePropertyObject)
+        self.assertIs(type(data['Status']), dict)
+
+        self.assertEqual(page.properties['Status'].get_value(), 'Open')
+        self.assertEqual(page.get_properties(), {'Name': 'lazy', 'Count': 3, 'Done': True, 'Status': 'Open'})
+
+    def test_pages_are_decoded_concurrently(self):
+        from notionizer.object_page import Page
+
+        request = new_request()
+        errors = []
+        barrier = threading.Barrier(8)
+
+        def decode(thread):
+            barrier.wait()
+            for i in range(100):
+                page = Page(request, page_json(f'p-{thread}-{i}', f'page {thread}', i, bool(i % 2)))
+                expected = {'Name': f'page {thread}', 'Count': i, 'Done': bool(i % 2), 'Status': None}
+                if page.get_properties() != expected:
+                    errors.append((thread, i))
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=decode, args=(thread,)) for thread in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+
+
+class TestRefresh(TestCase):
+
+    def patches(self, api):
+        return [payload for method, path, payload in api.requests if method == 'PATCH']
+
+    def test_page_is_refreshed_in_place(self):
+        api = FakeApi()
+        with api.patch():
+            page = Page(new_request(), page_json('p-refresh', count=1))
+            count = page.properties['Count']
+            page.properties['Count'].number = 2
+            count.number = 3
+            page.properties['Done'].checkbox = True
+            self.assertEqual(page.last_edited_time, '2022-02-01T00:03:00.000Z')
+            self.assertIs(NotionUpdateObject._instances.get('p-refresh'), page)
+
+            with page.batch():
+                page.properties['Count'].number = 4
+                page.properties['Done'].checkbox = False
+        self.assertEqual(len(self.patches(api)), 4)
+        self.assertEqual(page.last_edited_time, '2022-02-01T00:04:00.000Z')
+        self.assertEqual(page.get_properties(['Count', 'Done']), {'Count': 4, 'Done': False})
+        self.assertIs(NotionUpdateObject._instances.get('p-refresh'), page)
+
+    def test_database_is_refreshed_in_place(self):
+        api = FakeApi()
+        with api.patch():
+            db = Database(new_request(), database_json('db-refresh'))
+            db.properties['Count'].name = 'Total'
+            self.assertIn('Total', db.properties.keys())
+            db.properties['Status'].name = 'State'
+            self.assertEqual(db.last_edited_time, '2022-02-01T00:02:00.000Z')
+            self.assertIs(NotionUpdateObject._instances.get('db-refresh'), db)
+
+            with db.batch():
+                db.properties['Done'].name = 'Finished'
+                db.properties['Count'].name = 'Sum'
+        self.assertEqual(self.patches(api)[-1], {'properties': {'Done': {'name': 'Finished'},
+                                                                'Count': {'name': 'Sum'}}})
+        self.assertEqual(len(self.patches(api)), 3)
+        self.assertEqual(db.last_edited_time, '2022-02-01T00:03:00.000Z')
+        self.assertEqual(sorted(db.properties.keys()), ['Finished', 'Name', 'Status', 'Sum'])
+        self.assertIs(NotionUpdateObject._instances.get('db-refresh'), db)
+
+class TestColumnProjection(TestCase):
+
+    pages = {'': [page_json('p-1', 'a', 1, True, 'Open'), page_json('p-2', 'b', 2, False, None)]}
+
+    def test_filter_properties_pushed_down(self):
+        api = FakeApi(self.pages)
+        with api.patch():
+            db = Database(new_request(), database_json())
+            rows = db.get_as_tuples(db.query('Name', columns=['Name', 'Count']))
+        method, path, payload = [r for r in api.requests if r[0] == 'POST'][0]
+        self.assertTrue(path.endswith('/query?filter_properties=title&filter_properties=a%3Bc'), path)
+        self.assertEqual(rows, (('Name', 'Count'), ('a', 1), ('b', 2)))
+
+    def test_only_selected_columns_are_decoded(self):
+        with FakeApi(self.pages).patch():
+            db = Database(new_request(), database_json())
+            pages = list(db.query('Name'))
+            rows = db.get_as_dictionaries(iter(pages), ['Done'])
+        self.assertEqual(rows, ({'Done': True}, {'Done': False}))
+        self.assertTrue(all(type(p.properties._data['Count']) is dict for p in pages))
+
+    def test_raw_iterator_export(self):
+        with FakeApi(self.pages).patch():
+            db = Database(new_request(), database_json())
+            rows = db.get_as_tuples(db.query('Name', raw=True), ['Status'], header=False)
+        self.assertEqual(rows, (('Open',), (None,)))
+
+
+class TestRowDecoder(TestCase):
+
+    def test_compiled_decoder_matches_pages(self):
+        data = [page_json('p-1', 'a', 1, True, 'Open'), page_json('p-2', 'b', None, False, None)]
+        db = Database(new_request(), database_json())
+        decoder = db.compile_decoder(['Status', 'Name', 'Count'])
+        self.assertIs(decoder, db.compile_decoder(['Status', 'Name', 'Count']))
+        self.assertEqual([decoder(d) for d in data], [('Open', 'a', 1), (None, 'b', None)])
+
+        from notionizer.object_page import Page
+        self.assertEqual(decoder.decode_dict(Page(new_request(), page_json('p-3', 'c', 3, True, 'Open'))),
+                         {'Status': 'Open', 'Name': 'c', 'Count': 3})
+
+    def test_decoder_falls_back_on_type_change(self):
+        db = Database(new_request(), database_json())
+        decoder = db.compile_decoder(['Count'])
+        data = page_json('p-1')
+        data['properties']['Count'] = {'id': 'a%3Bc', 'type': 'rich_text', 'rich_text': []}
+        self.assertEqual(decoder(data), ('',))
+
+
+class TestRelationReference(TestCase):
+
+    @staticmethod
+    def hub_json():
+        data = database_json('hub')
+        for index, db_id in enumerate(['db-a', 'db-b', 'db-c']):
+            name = 'Rel' + str(index)
+            data['properties'][name] = {'id': 'r' + str(index), 'name': name, 'type': 'relation',
+                                        'relation': {'database_id': db_id}}
+        return data
+
+    def test_related_databases_are_cached(self):
+        api = FakeApi()
+        request = new_request()
+        with api.patch():
+            hub = Database(request, self.hub_json())
+            Database(request, self.hub_json())
+        fetched = sorted(path for method, path, payload in api.requests)
+        self.assertEqual(fetched, ['databases/db-a', 'databases/db-b', 'databases/db-c'])
+        self.assertEqual(sorted(hub.get_relation_reference()), ['db-a', 'db-b', 'db-c'])
+        self.assertEqual(hub.get_relation_reference()['db-a']['a;c'], 'number')
+
+    def test_deferred_relation_reference(self):
+        api = FakeApi()
+        with api.patch():
+            hub = Database(new_request(), self.hub_json(), defer_relation=True)
+            self.assertEqual(api.requests, [])
+            self.assertEqual(len(hub.get_relation_reference()), 3)
+        self.assertEqual(len(api.requests), 3)
+
+
+    def test_relation_schemas_resolved_concurrently(self):
+        api = FakeApi()
+        request = new_request()
+        errors = []
+        barrier = threading.Barrier(6)
+
+        def resolve(thread):
+            data = self.hub_json()
+            for name, prop in list(data['properties'].items()):
+                if prop['type'] == 'relation':
+                    prop['relation']['database_id'] = f"{prop['relation']['database_id']}-{thread}"
+            barrier.wait()
+            try:
+                hub = Database(request, data, defer_relation=True)
+                reference = hub.get_relation_reference()
+                if sorted(reference) != [f'db-{c}-{thread}' for c in 'abc'] or \
+                        reference[f'db-a-{thread}']['a;c'] != 'number':
+                    errors.append(thread)
+            except Exception as e:
+                errors.append(e)
+
+        with api.patch(), mock.patch('notionizer.settings.RELATION_MAX_WORKERS', 3):
+            threads = [threading.Thread(target=resolve, args=(thread,)) for thread in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(api.requests), 18)
+
+class TestCreatePages(TestCase):
+
+    def test_results_in_order_with_failures(self):
+        api = FakeApi()
+        rows = [{'Name': str(i), 'Count': i} for i in range(20)]
+        rows[3] = {'Name': 'fail'}
+        rows[7] = {'Name': 'bad', 'Count': 'not a number'}
+        rows[9] = {'Unknown': 1}
+        with api.patch():
+            db = Database(new_request(), database_json())
+            operation = db.create_pages(rows, concurrency=4)
+            results = list(operation)
+        self.assertEqual([r.index for r in results], list(range(20)))
+        self.assertEqual(results[0].page.get_properties()['Name'], '0')
+        self.assertEqual([r.index for r in operation.report.failures], [3, 7, 9])
+        self.assertIsInstance(results[3].error, HttpRequestError)
+        self.assertIsInstance(results[7].error, AssertionError)
+        self.assertEqual(operation.report.failed_rows(), [rows[3], rows[7], rows[9]])
+        self.assertEqual(operation.report.failed_payloads()[1:], [None, None])
+        self.assertEqual(operation.report.succeeded, 17)
+        # invalid rows are not sent.
+        self.assertEqual(len([r for r in api.requests if r[0] == 'POST']), 18)
+
+    def test_operation_is_sent_when_consumed(self):
+        api = FakeApi()
+        with api.patch():
+            db = Database(new_request(), database_json())
+            with self.assertWarns(RuntimeWarning):
+                db.create_pages([{'Name': 'a'}, {'Name': 'b'}])
+            self.assertEqual(api.requests, [])
+
+            report = db.create_pages([{'Name': 'a'}, {'Name': 'b'}]).wait()
+        self.assertEqual(report.succeeded, 2)
+        self.assertEqual(len(api.requests), 2)
+
+    def test_create_page_uses_converter(self):
+        api = FakeApi()
+        with api.patch():
+            db = Database(new_request(), database_json())
+            self.assertEqual(db.create_page({'Name': 'one', 'Done': True}).id, 'new-one')
+            self.assertRaises(AssertionError, db.create_page, {'Done': 'yes'})
+        payload = api.requests[-1][2]
+        self.assertEqual(payload['parent'], {'database_id': 'db-1'})
+        self.assertEqual(payload['properties']['Done'], {'checkbox': True})
+
+
+class TestPageBatch(TestCase):
+
+    def patches(self, api):
+        return [payload for method, path, payload in api.requests if method == 'PATCH']
+
+    def test_assignments_are_sent_once(self):
+        api = FakeApi()
+        with api.patch():
+            page = Page(new_request(), page_json('p-batch', count=1))
+            with page.batch():
+                page.properties['Count'].number = 5
+                page.properties['Done'].checkbox = True
+                page.properties['Count'].number = 6
+                self.assertEqual(api.requests, [])
+        self.assertEqual(self.patches(api), [{'properties': {'Count': {'number': 6}, 'Done': {'checkbox': True}}}])
+        self.assertEqual(page.get_properties(['Count', 'Done']), {'Count': 6, 'Done': True})
+
+    def test_single_assignment_without_batch(self):
+        api = FakeApi()
+        with api.patch():
+            page = Page(new_request(), page_json('p-single'))
+            page.properties['Count'].number = 9
+        self.assertEqual(self.patches(api), [{'properties': {'Count': {'number': 9}}}])
+        self.assertEqual(page.get_properties()['Count'], 9)
+
+    def test_batch_after_single_assignments(self):
+        api = FakeApi()
+        with api.patch():
+            page = Page(new_request(), page_json('p-after-single'))
+            page.properties['Count'].number = 2
+            page.properties['Done'].checkbox = True
+            sent = len(self.patches(api))
+            with page.batch():
+                page.properties['Count'].number = 3
+                page.properties['Done'].checkbox = False
+        self.assertEqual(sent, 2)
+        self.assertEqual(self.patches(api)[sent:], [{'properties': {'Count': {'number': 3},
+                                                                     'Done': {'checkbox': False}}}])
+        self.assertEqual(page.get_properties(['Count', 'Done']), {'Count': 3, 'Done': False})
+        self.assertIs(NotionUpdateObject._instances.get('p-after-single'), page)
+
+    def test_update_fields(self):
+        api = FakeApi()
+        with api.patch():
+            page = Page(new_request(), page_json('p-update'))
+            self.assertIs(page.update({'Count': 2}, Done=True), page)
+            self.assertRaises(AssertionError, page.update, Count='two', Done=False)
+            self.assertRaises(AssertionError, page.update, Unknown=1)
+        self.assertEqual(self.patches(api), [{'properties': {'Count': {'number': 2}, 'Done': {'checkbox': True}}}])
+        self.assertEqual(page.get_properties()['Done'], True)
+        self.assertIsNone(page._pending_update)
+
+
+class TestUpdatePages(TestCase):
+
+    def setUp(self):
+        # decoded pages of other tests refer to themselves and could stay in the identity map until collected.
+        self.addCleanup(set_instance_cache, NotionUpdateObject._instances)
+        set_instance_cache(WeakInstanceCache())
+
+    def test_coalesce_dedupe_and_report(self):
+        api = FakeApi()
+        with api.patch():
+            request = new_request()
+            db = Database(request, database_json())
+            cached = Page(request, page_json('p-cached', count=1, status='Todo'))
+            operation = db.update_pages([
+                ('p-1', {'Count': 1}),
+                (cached, {'Count': 1, 'Status': {'name': 'Todo'}}),
+                ('p-1', {'Count': 2, 'Done': True}),
+                ('p-2', {'Count': 'bad'}),
+                ('p-cached', {'Done': True}),
+            ], concurrency=2)
+            results = list(operation)
+
+        patches = {path: payload for method, path, payload in api.requests if method == 'PATCH'}
+        self.assertEqual(patches, {
+            'pages/p-1': {'properties': {'Count': {'number': 2}, 'Done': {'checkbox': True}}},
+            'pages/p-cached': {'properties': {'Done': {'checkbox': True}}},
+        })
+        self.assertEqual([result.row[0] for result in results], ['p-1', 'p-cached', 'p-2'])
+        self.assertIs(results[1].page, cached)
+        self.assertTrue(cached.get_properties()['Done'])
+        self.assertIsInstance(results[2].error, AssertionError)
+        report = operation.report
+        self.assertEqual((report.succeeded, report.unchanged, report.failed), (2, 0, 1))
+
+    def test_unchanged_page_is_not_requested(self):
+        api = FakeApi()
+        with api.patch():
+            request = new_request()
+            db = Database(request, database_json())
+            cached = Page(request, page_json('p-same', name='same', count=3))
+            report = db.update_pages([(cached, {'Name': 'same', 'Count': 3})]).wait()
+        self.assertEqual([r for r in api.requests if r[0] == 'PATCH'], [])
+        self.assertEqual((report.total, report.unchanged), (1, 1))
+
+
+def timed_page(page_id, created, edited):
+    data = page_json(page_id)
+    data['created_time'] = '2022-01-01T00:%s:00.000Z' % created
+    data['last_edited_time'] = '2022-01-01T00:%s:00.000Z' % edited
+    return data
+
+
+class TestSync(TestCase):
+
+    def test_incremental_sync(self):
+        api = FakeApi({'': [timed_page('a', '01', '01'), timed_page('b', '01', '05')],
+                       'c-2': [timed_page('c', '02', '05')]})
+        with api.patch():
+            db = Database(new_request(), database_json())
+            first = db.sync()
+        self.assertEqual([page.id for page in first.inserted], ['a', 'b', 'c'])
+        self.assertEqual(first.state, SyncState('2022-01-01T00:05:00.000Z', ['b', 'c']))
+        first_payload = [payload for method, path, payload in api.requests if method == 'POST'][0]
+        self.assertEqual(first_payload['sorts'], [{'timestamp': 'last_edited_time', 'direction': 'ascending'}])
+
+        # 'b' and 'c' are returned again by 'on_or_after' and upserted again. 'a' is edited, 'd' is new on the
+        # boundary time.
+        api = FakeApi({'': [timed_page('b', '01', '05'), timed_page('c', '02', '05'), timed_page('d', '05', '05'),
+                            timed_page('a', '01', '07')]})
+        state = SyncState.from_dict(first.state.to_dict())
+        with api.patch():
+            second = db.sync(state, raw=True)
+        payload = [payload for method, path, payload in api.requests if method == 'POST'][0]
+        self.assertEqual(payload['filter'], {'or': [{'timestamp': 'last_edited_time',
+                                                     'last_edited_time': {'on_or_after': state.watermark}}]})
+        self.assertEqual([data['id'] for data in second.inserted], ['d'])
+        self.assertEqual([data['id'] for data in second.updated], ['b', 'c', 'a'])
+        self.assertEqual(second.scanned, 4)
+        self.assertEqual(second.state, SyncState('2022-01-01T00:07:00.000Z', ['a']))
+        self.assertEqual(state, first.state)
+
+
+    def test_boundary_page_edited_in_same_minute(self):
+        api = FakeApi({'': [timed_page('a', '01', '05'), timed_page('b', '01', '05')]})
+        with api.patch():
+            db = Database(new_request(), database_json())
+            first = db.sync(raw=True)
+        self.assertEqual(first.state, SyncState('2022-01-01T00:05:00.000Z', ['a', 'b']))
+
+        # 'a' is edited again after the sync, but 'last_edited_time' is rounded to the same minute.
+        edited = timed_page('a', '01', '05')
+        edited['properties']['Count']['number'] = 42
+        api = FakeApi({'': [edited, timed_page('b', '01', '05')]})
+        with api.patch():
+            second = db.sync(first.state, raw=True)
+        self.assertEqual(second.inserted, [])
+        self.assertEqual([data['id'] for data in second.updated], ['a', 'b'])
+        self.assertEqual(second.updated[0]['properties']['Count']['number'], 42)
+        self.assertEqual(second.state, first.state)
+
+class TestExpressionCache(TestCase):
+
+    def setUp(self):
+        from notionizer import query
+        self.cache = query.ExpressionCache(max_size=4)
+        previous = query.get_expression_cache()
+        query.set_expression_cache(self.cache)
+        self.addCleanup(query.set_expression_cache, previous)
+
+    def test_expression_is_parsed_once(self):
+        from notionizer import query
+        with FakeApi({}).patch():
+            db = Database(new_request(), database_json())
+        with mock.patch.object(query.ast, 'parse', wraps=query.ast.parse) as parse, \
+                mock.patch.object(query, 'display_ast_tree') as display:
+            first = db._query_helper.query_by_expression('not Count')
+            second = db._query_helper.query_by_expression('not Count')
+            spaced = db._query_helper.query_by_expression('not  (Count)')
+        self.assertEqual(parse.call_count, 2)
+        display.assert_not_called()
+        self.assertEqual(first.get_body(), second.get_body())
+        self.assertEqual(first.get_body(), spaced.get_body())
+        self.assertIsNot(first, second)
+        # one lookup per call: a new expression is a single miss.
+        self.assertEqual(self.cache.get_stats(), {'size': 3, 'hits': 1, 'misses': 2})
+
+    def test_schema_change_uses_new_version(self):
+        with FakeApi({}).patch():
+            db = Database(new_request(), database_json())
+            db._query_helper.query_by_expression('Name')
+            changed = database_json('db-2')
+            changed['properties']['Name']['name'] = 'Title'
+            changed['properties'] = {'Title': changed['properties'].pop('Name'), **changed['properties']}
+            other = Database(new_request(), changed, update_relation=False)
+        self.assertNotEqual(db._query_helper.schema_version, other._query_helper.schema_version)
+        # the expression and its normalized form
+        self.assertEqual(db.invalidate_query_cache(), 2)
+        self.assertEqual(self.cache.get_stats()['size'], 0)
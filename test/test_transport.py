@@ -0,0 +1,87 @@
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from notionizer.http_request import HttpRequestError, RequestScheduler
+from notionizer.notion import Notion
+from notionizer.transport import RecordingTransport, ReplayTransport, Transport, TransportResponse, load_records
+
+from test.fixtures import database_json, page_json
+
+
+class FixedTransport(Transport):
+
+    def __init__(self, body):
+        self.body = body
+        self.sent = []
+
+    def send(self, method, url, data, timeout):
+        self.sent.append((method, url, data))
+        return TransportResponse(200, json.dumps(self.body), {'Retry-After': '1', 'Set-Cookie': 'x'})
+
+
+def new_notion(transport):
+    return Notion('secret', scheduler=RequestScheduler(rate=1000, burst=100), transport=transport)
+
+
+class TestReplayTransport(TestCase):
+
+    def test_replay_serves_objects(self):
+        transport = ReplayTransport([
+            {'method': 'GET', 'url': 'v1/databases/db1', 'payload': None, 'status_code': 200,
+             'body': database_json('db1')},
+            {'method': 'GET', 'url': 'v1/pages/p1', 'payload': None, 'status_code': 200,
+             'body': page_json('p1', 'first')},
+        ])
+        with new_notion(transport) as notion:
+            self.assertEqual(notion.get_database('db1').id, 'db1')
+            self.assertEqual(notion.get_page('p1').get_properties()['Name'], 'first')
+        self.assertEqual([key[:2] for key in transport.requests], [('GET', 'v1/databases/db1'),
+                                                                   ('GET', 'v1/pages/p1')])
+
+    def test_payload_matching_and_order(self):
+        payload = {'filter': {'b': 1, 'a': 2}}
+        transport = ReplayTransport([
+            {'method': 'POST', 'url': 'v1/x', 'payload': payload, 'status_code': 200,
+             'body': {'object': 'list', 'n': 1}},
+            {'method': 'POST', 'url': 'v1/x', 'payload': payload, 'status_code': 200,
+             'body': {'object': 'list', 'n': 2}},
+        ])
+        request = new_notion(transport)._request
+        self.assertEqual(request.post('v1/x', {'filter': {'a': 2, 'b': 1}})[1]['n'], 1)
+        self.assertEqual(request.post('v1/x', payload)[1]['n'], 2)
+        # the last record is repeated.
+        self.assertEqual(request.post('v1/x', payload)[1]['n'], 2)
+        self.assertRaises(HttpRequestError, request.post, 'v1/x', {'filter': {}})
+
+    def test_record_then_replay(self):
+        path = os.path.join(tempfile.mkdtemp(), 'cassette.jsonl')
+        inner = FixedTransport(page_json('p1', 'recorded'))
+        with new_notion(RecordingTransport(inner, path)) as notion:
+            notion.get_page('p1')
+        self.assertEqual(len(inner.sent), 1)
+
+        records = load_records(path)
+        self.assertEqual(records[0]['url'], 'v1/pages/p1')
+        self.assertEqual(records[0]['headers'], {'Retry-After': '1'})
+        with open(path) as f:
+            self.assertNotIn('secret', f.read())
+
+        with new_notion(ReplayTransport(path)) as notion:
+            self.assertEqual(notion.get_page('p1').get_properties()['Name'], 'recorded')
+
+
+class TestBenchmarks(TestCase):
+
+    def test_benchmarks_run_offline(self):
+        from benchmarks import run
+        output = io.StringIO()
+        results = run.main(['--rows', '30', '--batch', '3', '--depth', '2', '--breadth', '2'], output=output)
+        self.assertEqual(len(output.getvalue().splitlines()), len(results))
+        counts = {result.name: len(result.latencies) for result in results}
+        self.assertEqual(counts['query_scan'], 30)
+        self.assertEqual(counts['row_decoder'], 30)
+        self.assertEqual(counts['create_page'], 3)
+        self.assertEqual(counts['block_walk'], 6)
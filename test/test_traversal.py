@@ -0,0 +1,70 @@
+from unittest import TestCase
+from unittest import mock
+
+from notionizer import settings
+from notionizer.fake_server import FakeNotionServer, FakeNotionStore
+from notionizer.http_request import RequestScheduler
+from notionizer.notion import Notion
+from notionizer.object_block import Block
+from notionizer.traversal import BlockWalker, get_children
+
+
+class TestBlockWalker(TestCase):
+
+    def setUp(self):
+        self.store = FakeNotionStore(rows=0, block_depth=3, block_breadth=3)
+        self.server = FakeNotionServer(self.store).start()
+        patcher = mock.patch.object(settings, 'BASE_URL', self.server.base_url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.server.stop)
+        self.notion = Notion('secret', scheduler=RequestScheduler(rate=1000, burst=100))
+        self.addCleanup(self.notion.close)
+        self.root = self.notion.get_block(self.store.root_block_id)
+
+    def expected(self, key, depth=1, max_depth=None):
+        for child in self.store.children.get(key, []):
+            yield depth, self.store.blocks[child]['id']
+            if max_depth is None or depth < max_depth:
+                yield from self.expected(child, depth + 1, max_depth)
+
+    def test_depth_first_is_document_order(self):
+        self.assertTrue(self.root.has_children)
+        blocks = list(self.root.walk_blocks(concurrency=3))
+        self.assertTrue(all(isinstance(block, Block) for _, block in blocks))
+        expected = list(self.expected(self.store.root_block_id.replace('-', '')))
+        self.assertEqual(len(expected), 3 + 9 + 27)
+        self.assertEqual([(depth, block.id) for depth, block in blocks], expected)
+
+    def test_breadth_first_and_max_depth(self):
+        blocks = list(self.root.walk_blocks(order=BlockWalker.BREADTH_FIRST, raw=True))
+        self.assertEqual([depth for depth, _ in blocks], [1] * 3 + [2] * 9 + [3] * 27)
+        self.assertEqual(sorted(data['id'] for _, data in blocks),
+                         sorted(block_id for _, block_id in self.expected(self.store.root_block_id.replace('-', ''))))
+
+        blocks = list(self.root.walk_blocks(max_depth=2, raw=True))
+        expected = list(self.expected(self.store.root_block_id.replace('-', ''), max_depth=2))
+        self.assertEqual([(depth, data['id']) for depth, data in blocks], expected)
+        self.assertEqual(len(blocks), 12)
+
+    def test_pagination_child_pages_and_early_stop(self):
+        children = get_children(self.notion._request, self.store.root_block_id, page_size=2)
+        self.assertEqual([data['id'] for data in children],
+                         [block_id for depth, block_id in self.expected(self.store.root_block_id.replace('-', ''))
+                          if depth == 1])
+
+        child_page = dict(self.store.blocks[self.store.children[self.store.root_block_id.replace('-', '')][0]],
+                          id='c41dc41d-0000-4000-8000-000000000000', type='child_page',
+                          child_page={'title': 'Sub Page'})
+        self.store._add_block(self.store.root_block_id, child_page)
+        self.store._add_block(child_page['id'], self.store._block_object('c41dc41d-0000-4000-8000-000000000001',
+                                                                         'inside', False))
+        ids = [data['id'] for _, data in self.root.walk_blocks(raw=True)]
+        self.assertIn(child_page['id'], ids)
+        self.assertNotIn('c41dc41d-0000-4000-8000-000000000001', ids)
+        ids = [data['id'] for _, data in self.root.walk_blocks(raw=True, follow_child_pages=True)]
+        self.assertIn('c41dc41d-0000-4000-8000-000000000001', ids)
+
+        walk = self.root.walk_blocks(raw=True, concurrency=1)
+        self.assertEqual(next(walk)[0], 1)
+        walk.close()